@@ -0,0 +1,95 @@
+# benchmarks/bench_daily_rollup.py
+# 날짜별 영양소 집계 테이블(daily_nutrition) 효과 측정 (임시 SQLite 파일)
+# - 읽기: 오늘 합계 (meals SUM vs 집계 행 1개), 최근 30일 날짜별 합계 (meals GROUP BY vs 집계 범위 조회)
+# - 쓰기: 식사 1개 INSERT + commit 에 집계 UPSERT 가 더하는 비용
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_daily_rollup --rows 200000 --days 730
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from backend.benchmarks.bench_db_concurrency import NUTRIENTS, meal_row
+from backend.database.db import Base, make_engine
+from backend.models.models import DEFAULT_USER_ID, Meal as DBMeal
+from backend.services import daily_rollup
+
+
+def per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜별 영양소 집계 테이블 읽기/쓰기 벤치마크")
+    parser.add_argument("--rows", type=int, default=200000, help="미리 채울 식사 행 수")
+    parser.add_argument("--days", type=int, default=730, help="식사가 분포할 날짜 수")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'rollup.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        session = Session()
+        rng = random.Random(0)
+        today = date.today()
+        session.bulk_insert_mappings(
+            DBMeal, [meal_row(rng, today - timedelta(days=rng.randrange(args.days))) for _ in range(args.rows)]
+        )
+        start = time.perf_counter()
+        days = daily_rollup.rebuild(session)
+        session.commit()
+        print(f"식사 {args.rows}행 / {args.days}일, 집계 재계산 {days}일 {time.perf_counter() - start:.2f}s")
+
+        sums = [func.sum(getattr(DBMeal, n)) for n in NUTRIENTS]
+        month_ago = today - timedelta(days=29)
+
+        def today_sum():
+            session.query(*sums).filter(DBMeal.date == today).group_by(DBMeal.date).first()
+
+        def today_rollup():
+            session.expire_all()  # 식별 맵 캐시가 아닌 실제 조회를 측정
+            daily_rollup.totals_for(session, DEFAULT_USER_ID, today)
+
+        def month_sum():
+            (session.query(DBMeal.date, *sums).filter(DBMeal.date >= month_ago, DBMeal.date <= today)
+             .group_by(DBMeal.date).all())
+
+        def month_rollup():
+            daily_rollup.daily_range(session, DEFAULT_USER_ID, month_ago, today)
+
+        print(f"오늘 합계   : meals SUM {per_call(today_sum, args.repeat):8.1f} µs → "
+              f"집계 {per_call(today_rollup, args.repeat):8.1f} µs")
+        print(f"30일 날짜별 : meals GROUP BY {per_call(month_sum, args.repeat):8.1f} µs → "
+              f"집계 {per_call(month_rollup, args.repeat):8.1f} µs")
+
+        def write(with_rollup):
+            meal = DBMeal(**meal_row(rng, today))
+            session.add(meal)
+            if with_rollup:
+                daily_rollup.record_meals(session, [meal])
+            session.commit()
+
+        write_plain = per_call(lambda: write(False), args.repeat)
+        write_rollup = per_call(lambda: write(True), args.repeat)
+        print(f"식사 저장   : INSERT {write_plain:8.1f} µs → INSERT + 집계 UPSERT {write_rollup:8.1f} µs")
+        # 집계 없이 쓴 행이 있으므로 재계산 후 일관성 확인
+        daily_rollup.rebuild(session)
+        session.commit()
+        assert not daily_rollup.check(session)
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/bench_db_concurrency.py
+# 읽기/쓰기 혼합 부하에서 DB 설정 비교: 기본 engine (rollback 저널, PRAGMA 없음) vs make_engine (WAL + PRAGMA + 풀)
+# 쓰기 스레드는 POST /meal 처럼 식사 1개 INSERT + commit + refresh,
+# 읽기 스레드는 GET /summary?include_history=false 처럼 오늘 합계(SUM) + 오늘 식사 목록을 조회한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_db_concurrency --writers 4 --readers 8 --seconds 5 --rows 50000
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from backend.database.db import Base, make_engine
+from backend.models.models import Meal as DBMeal
+
+NUTRIENTS = ["kcal", "protein", "fat", "carbs", "sodium", "potassium", "phosphorus"]
+
+
+def meal_row(rng, day):
+    return {
+        "date": day, "type": rng.choice(["breakfast", "lunch", "dinner", "snack"]),
+        "items": '["현미밥 1공기", "닭가슴살 100g"]', "matched_items": "[]",
+        **{n: rng.uniform(0, 500) for n in NUTRIENTS},
+    }
+
+
+def seed(Session, rows):
+    rng = random.Random(0)
+    today = date.today()
+    session = Session()
+    session.bulk_insert_mappings(
+        DBMeal, [meal_row(rng, today - timedelta(days=rng.randint(0, 365))) for _ in range(rows)]
+    )
+    session.commit()
+    session.close()
+
+
+def run_mixed(Session, writers, readers, seconds):
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {"write": [], "read": [], "errors": 0}
+
+    def writer(seed_value):
+        rng = random.Random(seed_value)
+        local = []
+        while not stop.is_set():
+            start = time.perf_counter()
+            session = Session()
+            try:
+                meal = DBMeal(**meal_row(rng, date.today()))
+                session.add(meal)
+                session.commit()
+                session.refresh(meal)
+                local.append(time.perf_counter() - start)
+            except Exception:
+                session.rollback()
+                with lock:
+                    stats["errors"] += 1
+            finally:
+                session.close()
+        with lock:
+            stats["write"].extend(local)
+
+    def reader():
+        local = []
+        today = date.today()
+        while not stop.is_set():
+            start = time.perf_counter()
+            session = Session()
+            try:
+                session.query(*[func.sum(getattr(DBMeal, n)) for n in NUTRIENTS]).filter(DBMeal.date == today).one()
+                session.query(DBMeal).filter(DBMeal.date == today).order_by(DBMeal.id).limit(50).all()
+                local.append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    stats["errors"] += 1
+            finally:
+                session.close()
+        with lock:
+            stats["read"].extend(local)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return stats
+
+
+def describe(label, latencies, seconds):
+    if not latencies:
+        return f"{label}: 0 ops"
+    ms = np.array(latencies) * 1000
+    return (f"{label}: {len(ms) / seconds:8.1f} ops/s, p50 {np.percentile(ms, 50):7.2f}ms, "
+            f"p99 {np.percentile(ms, 99):7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 읽기/쓰기 혼합 동시성 벤치마크")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=50000, help="미리 채울 식사 행 수")
+    parser.add_argument("--url", help="지정하면 이 DB(예: Postgres)에 대해 현재 설정만 측정")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            configs = [("configured", args.url, True)]
+        else:
+            configs = [
+                ("default", f"sqlite:///{os.path.join(tmp, 'default.db')}", False),
+                ("tuned", f"sqlite:///{os.path.join(tmp, 'tuned.db')}", True),
+            ]
+        print(f"writers={args.writers}, readers={args.readers}, {args.seconds:g}s, 시드 {args.rows}행")
+        for label, url, tuned in configs:
+            engine = make_engine(url, tuned=tuned)
+            Base.metadata.create_all(bind=engine)
+            Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            seed(Session, args.rows)
+            stats = run_mixed(Session, args.writers, args.readers, args.seconds)
+            print(f"[{label}] 오류 {stats['errors']}건")
+            print("  " + describe("write", stats["write"], args.seconds))
+            print("  " + describe("read ", stats["read"], args.seconds))
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# benchmarks/bench_e2e.py
+# 오프라인 종단 간(E2E) 벤치마크 / 부하 테스트 — 모델 다운로드와 Git LFS 데이터 없이 실행 (CI 용)
+#
+#   1) --data-dir 에 합성 food_db.json + hash encoder(ENCODER_BACKEND=hash) 로 만든 FAISS 인덱스/메타 +
+#      바이너리 카탈로그 생성 (같은 설정으로 이미 만들어져 있으면 재사용)
+#   2) 새 SQLite 파일에 식사 N개(하루 3끼) + 날짜별 집계 + 목표 시드
+#   3) FOOD_DATA_DIR / ENCODER_BACKEND / DATABASE_URL 을 설정한 뒤 backend.main 을 import 하고
+#      TestClient 로 startup + 워밍업 (/readyz 200) 까지 진행
+#   4) 엔드포인트마다 동시 클라이언트 --clients 개가 요청 --requests 개를 보내고
+#      처리량 / 지연 시간 p50·p95·p99 / 상태 코드 / 단계별(metrics) 평균 시간을 JSON 으로 출력
+#
+# hash encoder 는 의미 유사도가 없으므로 encode 비용과 매칭 품질은 실제 모델과 다르다.
+# (실제 모델 비용은 bench_encoder_backends 로 따로 측정) 실행 간 회귀 비교용으로 사용한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_e2e --foods 100000 --meals 20000 --clients 8 --requests 2000 --output e2e.json
+#   python -m backend.benchmarks.bench_e2e --foods 1000000 --index-type ivf_flat --endpoints meal foods_search
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+# 경로 / DB URL 을 import 시점에 읽는 backend 모듈(food_store, vector_search, database, main)은
+# configure_environment 이후 함수 안에서 import 한다
+from backend.services.index_factory import DEFAULT_INDEX_TYPE, INDEX_TYPES
+
+SCENARIOS = ("meal", "summary", "summary_history", "foods_search", "recommend_snacks")
+_QUANTITIES = ["", " 1공기", " 100g", " 200g", " 1개", " 2개", " 1컵", " 1그릇", " 1/2공기"]
+_MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+_STAGES = ("parse", "match_local", "encode", "faiss_search", "db_query", "serialize")
+DATA_MANIFEST = "bench_e2e.json"
+
+
+def configure_environment(args):
+    """backend 모듈은 import 시점에 경로 / DB URL 을 읽으므로 import 전에 환경 변수를 설정"""
+    os.environ["FOOD_DATA_DIR"] = args.data_dir
+    os.environ["ENCODER_BACKEND"] = "hash"
+    os.environ["ENCODER_HASH_DIM"] = str(args.dim)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(args.data_dir, 'bench_e2e.db')}"
+    os.environ.pop("QUERY_CACHE_PATH", None)  # 이전 실행의 쿼리 캐시를 불러오지 않도록
+
+
+def synthetic_catalog(n, seed=0):
+    from backend.benchmarks.bench_estimate_kcal import synthetic_names
+    from backend.benchmarks.bench_snack_recommendation import synthetic_records
+    records = synthetic_records(n, seed)
+    for record, name in zip(records, synthetic_names(n, seed)):
+        record["식품명"] = name
+    return records
+
+
+def prepare_data(args):
+    """합성 카탈로그 / 인덱스 / 바이너리 카탈로그 생성 → (소요 시간, 식품명 리스트)"""
+    from backend.scripts import build_faiss_index
+    from backend.scripts.build_catalog import build_food_catalog
+    from backend.services.food_store import FOOD_CATALOG_DIR, FOOD_DB_JSON_PATH
+    from backend.services.vector_search import (
+        PREBUILT_FAISS_INDEX_PATH, PREBUILT_FAISS_META_PATH, SENTENCE_TRANSFORMER_MODEL,
+    )
+
+    start = time.perf_counter()
+    config = {"foods": args.foods, "dim": args.dim, "index_type": args.index_type, "seed": args.seed}
+    manifest_path = os.path.join(args.data_dir, DATA_MANIFEST)
+    records = synthetic_catalog(args.foods, args.seed)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            reuse = json.load(f) == config
+    except (FileNotFoundError, json.JSONDecodeError):
+        reuse = False
+    if reuse:
+        print(f"기존 합성 데이터 재사용: {args.data_dir}")
+    else:
+        os.makedirs(args.data_dir, exist_ok=True)
+        with open(FOOD_DB_JSON_PATH, "w", encoding="utf-8") as f:
+            json.dump({"records": records}, f, ensure_ascii=False)
+        build_faiss_index.cmd_build(argparse.Namespace(
+            model=SENTENCE_TRANSFORMER_MODEL, threads=0, backend="hash", food_db=FOOD_DB_JSON_PATH,
+            batch_size=1024, type=args.index_type, nlist=None, nprobe=None, hnsw_m=None, ef_construction=None,
+            ef_search=None, pq_m=None, pq_nbits=None, out_index=PREBUILT_FAISS_INDEX_PATH,
+            out_meta=PREBUILT_FAISS_META_PATH, compile_catalog=True,
+        ))
+        build_food_catalog(FOOD_DB_JSON_PATH, FOOD_CATALOG_DIR)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+    return time.perf_counter() - start, [record["식품명"] for record in records]
+
+
+def seed_database(args):
+    """새 SQLite 파일에 식사 args.meals 개 (오늘부터 과거로 하루 3끼) + 날짜별 집계 + 목표"""
+    from backend.benchmarks.bench_db_concurrency import meal_row
+    from backend.database.db import Base, SessionLocal, engine
+    from backend.models.models import Goal as DBGoal, Meal as DBMeal
+    from backend.services import daily_rollup
+
+    start = time.perf_counter()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        path = os.path.join(args.data_dir, "bench_e2e.db" + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+    today = date.today()
+    session = SessionLocal()
+    try:
+        for chunk_start in range(0, args.meals, 10000):
+            rows = [meal_row(rng, today - timedelta(days=i // 3))
+                    for i in range(chunk_start, min(args.meals, chunk_start + 10000))]
+            session.bulk_insert_mappings(DBMeal, rows)
+        daily_rollup.rebuild(session)
+        session.add(DBGoal(current_weight=70.0, target_weight=65.0, period_days=60, activity_level="medium"))
+        session.commit()
+    finally:
+        session.close()
+    return time.perf_counter() - start
+
+
+def query_pool(names, size, seed=0):
+    """요청에 쓸 음식명 풀: 카탈로그 이름 그대로 / 공백 제거 / 글자 하나 바꾼 오타 (로컬 매칭과 벡터 검색이 섞이도록)"""
+    rng = random.Random(seed)
+    pool = []
+    for name in rng.sample(names, min(size, len(names))):
+        variant = rng.random()
+        if variant < 0.5:
+            pool.append(name)
+        elif variant < 0.7:
+            pool.append(name.replace(" ", ""))
+        else:
+            position = rng.randrange(len(name))
+            pool.append(name[:position] + rng.choice("가나다라마바사") + name[position + 1:])
+    return pool
+
+
+def request_factory(scenario, pool, items_per_meal):
+    """scenario → (rng → (method, url, 요청 kwargs))"""
+    if scenario == "meal":
+        return lambda rng: ("POST", "/meal", {"json": {
+            "date": date.today().isoformat(), "type": rng.choice(_MEAL_TYPES),
+            "items": [rng.choice(pool) + rng.choice(_QUANTITIES) for _ in range(rng.randint(1, items_per_meal))],
+        }})
+    if scenario == "summary":
+        return lambda rng: ("GET", "/summary", {"params": {"include_history": "false"}})
+    if scenario == "summary_history":
+        return lambda rng: ("GET", "/summary", {})
+    if scenario == "foods_search":
+        return lambda rng: ("GET", "/foods/search", {"params": {"query": rng.choice(pool)}})
+    if scenario == "recommend_snacks":
+        return lambda rng: ("GET", "/recommend/snacks", {})
+    raise ValueError(f"알 수 없는 시나리오: {scenario}")
+
+
+def stage_snapshot():
+    from backend.services import metrics
+    return {stage: metrics.STAGE_SECONDS.snapshot(stage)[1:] for stage in _STAGES}
+
+
+def run_scenario(client, make_request, clients, requests, warmup, seed):
+    """동시 클라이언트 clients 개가 공유 카운터에서 요청 번호를 받아 requests 개를 보낼 때까지 반복"""
+    for i in range(warmup):
+        method, url, kwargs = make_request(random.Random(seed - 1 - i))
+        client.request(method, url, **kwargs)
+
+    ticket = itertools.count()
+    latencies = np.zeros(requests)
+    statuses = [0] * requests
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        while True:
+            i = next(ticket)
+            if i >= requests:
+                return
+            method, url, kwargs = make_request(rng)
+            start = time.perf_counter()
+            try:
+                statuses[i] = client.request(method, url, **kwargs).status_code
+            except Exception:
+                statuses[i] = -1  # 연결 / 앱 예외
+            latencies[i] = time.perf_counter() - start
+
+    before = stage_snapshot()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    after = stage_snapshot()
+
+    status_counts = {}
+    for status in statuses:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    stages = {}
+    for stage in _STAGES:
+        total, count = after[stage][0] - before[stage][0], after[stage][1] - before[stage][1]
+        if count:
+            stages[stage] = {"count": count, "mean_ms": total / count * 1000, "per_request": count / requests}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": requests,
+        "clients": clients,
+        "wall_s": wall,
+        "throughput_rps": requests / wall,
+        "latency_ms": {"p50": p50, "p95": p95, "p99": p99, "mean": latencies.mean() * 1000,
+                       "max": latencies.max() * 1000},
+        "status": status_counts,
+        "error_rate": sum(1 for status in statuses if not 200 <= status < 300) / requests,
+        "stages": stages,
+    }
+
+
+def wait_ready(client, timeout):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        response = client.get("/readyz")
+        if response.status_code == 200:
+            return response.json()
+        time.sleep(0.1)
+    raise RuntimeError(f"{timeout}s 안에 워밍업이 끝나지 않았습니다: {client.get('/readyz').json()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 E2E 벤치마크 / 부하 테스트 (hash encoder + 합성 데이터)")
+    parser.add_argument("--foods", type=int, default=100000, help="합성 카탈로그 / 인덱스 크기 (1만 ~ 100만)")
+    parser.add_argument("--meals", type=int, default=20000, help="DB 에 미리 넣을 식사 수")
+    parser.add_argument("--dim", type=int, default=256, help="hash encoder 벡터 차원")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default=DEFAULT_INDEX_TYPE)
+    parser.add_argument("--endpoints", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--clients", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=1000, help="엔드포인트당 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="엔드포인트당 측정 전 요청 수")
+    parser.add_argument("--items-per-meal", type=int, default=5, help="POST /meal 항목 수 상한")
+    parser.add_argument("--distinct-queries", type=int, default=5000, help="요청에 쓸 서로 다른 음식명 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "diet_bench_e2e"),
+                        help="합성 데이터 / SQLite 디렉토리 (같은 설정이면 다음 실행에서 재사용)")
+    parser.add_argument("--ready-timeout", type=float, default=600)
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 stdout)")
+    args = parser.parse_args()
+    args.data_dir = os.path.abspath(args.data_dir)
+    configure_environment(args)
+
+    data_seconds, names = prepare_data(args)
+    seed_seconds = seed_database(args)
+    print(f"데이터 준비 {data_seconds:.1f}s, DB 시드 {seed_seconds:.1f}s (식사 {args.meals}개)")
+
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    pool = query_pool(names, args.distinct_queries, args.seed)
+    result = {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpu_count": os.cpu_count()},
+        "setup": {"data_s": data_seconds, "seed_db_s": seed_seconds},
+        "endpoints": {},
+    }
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        result["setup"]["readyz"] = wait_ready(client, args.ready_timeout)
+        result["setup"]["ready_s"] = time.perf_counter() - start
+        for scenario in args.endpoints:
+            stats = run_scenario(client, request_factory(scenario, pool, args.items_per_meal), args.clients,
+                                 args.requests, args.warmup, args.seed)
+            result["endpoints"][scenario] = stats
+            latency = stats["latency_ms"]
+            print(f"{scenario:<17}: {stats['throughput_rps']:8.1f} req/s | p50 {latency['p50']:7.2f} ms | "
+                  f"p95 {latency['p95']:7.2f} ms | p99 {latency['p99']:7.2f} ms | 오류율 {stats['error_rate'] * 100:.1f}%")
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ 결과 저장: {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_encode_batching.py
+# encode 마이크로 배칭 부하 테스트: 동시 클라이언트 수별 처리량과 p50/p99 지연 시간
+# 서버와 같이 요청을 추론 풀(InferenceExecutor)에 넣어 실행하므로 풀 크기 제한이 그대로 적용된다.
+# 풀 크기(기본 INFERENCE_WORKERS / 배치 크기만큼 늘린 값)별로 배칭 끔 / 켬(max-wait, max-batch 조합)을 비교한다.
+# 쿼리 캐시 효과를 빼기 위해 매 요청 다른 문자열을 사용한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_encode_batching --clients 1 4 16 32 --requests 40 --workers 2 32 --max-batch 32
+#   (--max-wait-ms 를 주지 않으면 서버 기본값: 풀이 배치 크기보다 작으면 0ms, 아니면 2ms)
+
+import argparse
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from backend.services.batching import DEFAULT_MAX_BATCH, MicroBatcher, default_max_wait_ms
+from backend.services.inference import DEFAULT_INFERENCE_WORKERS, InferenceExecutor
+from backend.services.vector_search import get_vector_db
+
+_BASE_NAMES = ["현미밥", "닭가슴살", "계란", "김치찌개", "된장국", "고등어구이", "바나나", "초코파이"]
+
+
+def run_load(vector_db, executor, clients, requests_per_client):
+    counter = itertools.count()
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        local = []
+        for _ in range(requests_per_client):
+            n = next(counter)
+            query = f"{_BASE_NAMES[n % len(_BASE_NAMES)]} 변형{n}"  # 캐시 미스 유도
+            start = time.perf_counter()
+            executor.submit(vector_db.find_best_matches, [query]).result()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat_ms = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(lat_ms, 50), np.percentile(lat_ms, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="encode 마이크로 배칭 부하 테스트")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--requests", type=int, default=40, help="클라이언트당 요청 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[DEFAULT_INFERENCE_WORKERS, DEFAULT_MAX_BATCH],
+                        help="추론 풀 크기")
+    parser.add_argument("--max-wait-ms", type=float, nargs="+", help="배치 대기 시간 (기본: 서버 기본값)")
+    parser.add_argument("--max-batch", type=int, nargs="+", default=[DEFAULT_MAX_BATCH])
+    args = parser.parse_args()
+
+    vector_db = get_vector_db()
+    vector_db.find_best_matches(["워밍업"])
+
+    print(f"{'config':<34} | {'clients':>7} | {'req/s':>8} | {'p50(ms)':>8} | {'p99(ms)':>8}")
+    print("-" * 78)
+    for workers in args.workers:
+        # 모든 클라이언트 요청이 대기열에 들어갈 수 있도록 대기열은 최대 클라이언트 수만큼
+        executor = InferenceExecutor(max_workers=workers, max_queue=max(args.clients))
+        configs = [(f"workers={workers} off", None)]
+        for max_batch in args.max_batch:
+            for wait_ms in args.max_wait_ms or [default_max_wait_ms(workers, max_batch)]:
+                configs.append((f"workers={workers} wait={wait_ms:g}ms batch={max_batch}", (wait_ms, max_batch)))
+        for label, knobs in configs:
+            if knobs is None:
+                vector_db.batcher = None
+            else:
+                wait_ms, max_batch = knobs
+                vector_db.batcher = MicroBatcher(
+                    vector_db._process_encode_batch, max_batch=max_batch, max_wait_ms=wait_ms,
+                    size_of=lambda request: len(request[0]),
+                )
+            for clients in args.clients:
+                vector_db.query_cache.clear()
+                qps, p50, p99 = run_load(vector_db, executor, clients, args.requests)
+                print(f"{label:<34} | {clients:>7} | {qps:>8.1f} | {p50:>8.2f} | {p99:>8.2f}")
+        executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
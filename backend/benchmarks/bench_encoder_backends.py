@@ -0,0 +1,117 @@
+# benchmarks/bench_encoder_backends.py
+# encoder 백엔드(torch / onnx / onnx-int8) 비교: 로드 시간, 단건 encode 지연 시간, 배치 처리량, 메모리(RSS)
+# 백엔드마다 새 프로세스에서 측정한다 (torch import 여부가 메모리에 그대로 드러나도록).
+#
+# 실행 (프로젝트 루트에서, ONNX 백엔드는 먼저 scripts/export_onnx_encoder export 필요):
+#   python -m backend.benchmarks.bench_encoder_backends --texts 2000 --batch-size 32
+#   python -m backend.benchmarks.bench_encoder_backends --backends onnx onnx-int8 --threads 4
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backend.services.encoders import DEFAULT_ENCODE_BATCH_SIZE, ENCODER_BACKENDS, load_encoder
+from backend.services.vector_search import PREBUILT_FAISS_META_PATH, SENTENCE_TRANSFORMER_MODEL
+
+_FOODS = ["현미밥", "닭가슴살", "계란", "김치", "된장찌개", "고등어구이", "우유", "바나나", "두부", "식빵",
+          "사과", "아메리카노", "시금치나물", "불고기", "비빔밥", "라면", "떡볶이", "김밥", "삼겹살", "요거트"]
+_SUFFIXES = ["", " 구이", " 볶음", " 무침", " 샐러드", " 덮밥", " 정식"]
+
+
+def benchmark_texts(meta_path, count, seed=0):
+    """FAISS 메타의 식품명 표본 (없으면 합성 이름)"""
+    rng = np.random.default_rng(seed)
+    try:
+        from backend.scripts.export_onnx_encoder import sample_names
+        names = sample_names(meta_path, count, seed)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        names = []
+    if not names:
+        names = [f"{_FOODS[i % len(_FOODS)]}{_SUFFIXES[i % len(_SUFFIXES)]} {i}" for i in range(count)]
+    return [names[i] for i in rng.permutation(len(names))[:count]]
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def probe(args):
+    """(하위 프로세스) 한 백엔드를 로드하고 측정 결과를 JSON 한 줄로 출력"""
+    with open(args.texts_file, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+    rss_start = rss_bytes()
+    start = time.perf_counter()
+    encoder = load_encoder(args.model, backend=args.probe, threads=args.threads or None)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = rss_bytes()
+
+    encoder.encode(texts[:args.batch_size], args.batch_size)  # 워밍업
+    single = []
+    for text in texts[:args.single]:
+        start = time.perf_counter()
+        encoder.encode([text], 1)
+        single.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    encoder.encode(texts, args.batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "backend": args.probe,
+        "load_s": load_seconds,
+        "single_p50_ms": float(np.percentile(single, 50) * 1000),
+        "single_p99_ms": float(np.percentile(single, 99) * 1000),
+        "throughput": len(texts) / batch_seconds,
+        "rss_loaded_mb": (rss_loaded - rss_start) / 2**20,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="encoder 백엔드 지연 시간 / 처리량 / 메모리 비교")
+    parser.add_argument("--backends", nargs="+", choices=ENCODER_BACKENDS, default=list(ENCODER_BACKENDS))
+    parser.add_argument("--model", default=SENTENCE_TRANSFORMER_MODEL)
+    parser.add_argument("--meta", default=PREBUILT_FAISS_META_PATH, help="식품명 표본을 가져올 FAISS 메타")
+    parser.add_argument("--texts", type=int, default=2000, help="배치 처리량 측정에 쓸 이름 수")
+    parser.add_argument("--single", type=int, default=200, help="단건 encode 반복 횟수")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_ENCODE_BATCH_SIZE)
+    parser.add_argument("--threads", type=int, default=0, help="encoder 스레드 수 (0 이면 라이브러리 기본값)")
+    parser.add_argument("--probe", choices=ENCODER_BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--texts-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(args)
+        return
+
+    texts = benchmark_texts(args.meta, args.texts)
+    print(f"이름 {len(texts)}개, batch_size={args.batch_size}, threads={args.threads or '기본'}")
+    print(f"{'backend':<10} | {'load(s)':>7} | {'단건 p50(ms)':>12} | {'단건 p99(ms)':>12} | "
+          f"{'처리량(/s)':>10} | {'RSS(MB)':>8} | {'peak(MB)':>8}")
+    with tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8", delete=False) as f:
+        json.dump(texts, f, ensure_ascii=False)
+    try:
+        for backend in args.backends:
+            command = [sys.executable, "-m", "backend.benchmarks.bench_encoder_backends", "--probe", backend,
+                       "--texts-file", f.name, "--model", args.model, "--batch-size", str(args.batch_size),
+                       "--single", str(args.single), "--threads", str(args.threads)]
+            out = subprocess.run(command, capture_output=True, text=True)
+            if out.returncode != 0:
+                print(f"{backend:<10} | 실패: {out.stderr.strip().splitlines()[-1] if out.stderr.strip() else out.returncode}")
+                continue
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{backend:<10} | {r['load_s']:>7.2f} | {r['single_p50_ms']:>12.2f} | {r['single_p99_ms']:>12.2f} | "
+                  f"{r['throughput']:>10.1f} | {r['rss_loaded_mb']:>8.1f} | {r['peak_rss_mb']:>8.1f}")
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
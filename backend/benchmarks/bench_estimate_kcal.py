@@ -0,0 +1,76 @@
+# benchmarks/bench_estimate_kcal.py
+# estimate_kcal 의 식품명 부분 문자열 매칭: 전체 카탈로그 선형 탐색 vs n-gram 역색인
+# 두 방식이 같은 "첫 번째 일치 행" 을 돌려주는지도 함께 확인한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_estimate_kcal --catalog 100000 --queries 500
+
+import argparse
+import random
+import time
+
+from backend.services.name_index import SubstringIndex, normalize
+
+_SYLLABLES = list("가나다라마바사아자차카타파하김치밥국떡빵면죽탕볶음구이찜전과자우유두부닭고기")
+_WORDS = ["현미밥", "닭가슴살", "계란", "김치찌개", "된장국", "고등어", "바나나", "초코파이", "감자칩", "두부조림"]
+
+
+def synthetic_names(n, seed=0):
+    rng = random.Random(seed)
+    names = []
+    for i in range(n):
+        parts = [rng.choice(_WORDS)] if rng.random() < 0.3 else []
+        parts.append("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 8))))
+        rng.shuffle(parts)
+        names.append(" ".join(parts) + f" {i % 97}")
+    return names
+
+
+def linear_find_first(norm_query, names):
+    # 기존 estimate_kcal 과 같은 방식: 매 호출마다 모든 이름을 정규화하며 순회
+    for row, name in enumerate(names):
+        if norm_query in normalize(name):
+            return row
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="estimate_kcal 식품명 매칭 벤치마크")
+    parser.add_argument("--catalog", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    names = synthetic_names(args.catalog)
+    # 자주 쓰는 음식명 / 임의 음절 조합 / 카탈로그에 없는 이름(기본값 300kcal 경로)을 섞는다
+    third = max(1, args.queries // 3)
+    queries = [rng.choice(_WORDS) for _ in range(third)]
+    queries += ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(third)]
+    queries += [f"없는음식{i}호" for i in range(third)]
+    rng.shuffle(queries)
+
+    start = time.perf_counter()
+    index = SubstringIndex(names, normalize)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.find_first(q) for q in queries]
+    indexed_s = time.perf_counter() - start
+
+    # 선형 탐색은 느리므로 일부 쿼리만 측정 후 쿼리당 시간으로 비교
+    sample = queries[: max(1, min(len(queries), 50))]
+    start = time.perf_counter()
+    linear = [linear_find_first(normalize(q), names) for q in sample]
+    linear_s = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(linear, indexed) if a != b)
+    linear_us = linear_s / len(sample) * 1e6
+    indexed_us = indexed_s / len(queries) * 1e6
+    print(f"카탈로그 {args.catalog}개, 색인 생성 {build_s:.2f}s")
+    print(f"선형 탐색 : {linear_us:>10.1f} us/query ({len(sample)} queries)")
+    print(f"n-gram 색인: {indexed_us:>10.1f} us/query ({len(queries)} queries)")
+    print(f"속도 향상 : {linear_us / indexed_us:.1f}x, 결과 불일치 {mismatches}건 / {len(sample)}")
+
+
+if __name__ == "__main__":
+    main()
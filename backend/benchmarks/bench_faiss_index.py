@@ -0,0 +1,139 @@
+# benchmarks/bench_faiss_index.py
+# FAISS 인덱스 종류별 정확도/속도/메모리 비교
+# 정확 검색(IndexFlatIP) 결과를 기준으로 recall@1, recall@5, 단건 검색 QPS, 인덱스 크기와 RSS 증가량을 출력한다.
+#
+# 쿼리는 카탈로그 벡터에 잡음을 더한 뒤 정규화한 것 (실제 쿼리가 음식 이름 근처에 위치하는 상황을 흉내).
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_faiss_index                       # food_faiss.index 의 벡터 사용
+#   python -m backend.benchmarks.bench_faiss_index --synthetic 100000    # 합성 벡터 (768 차원)
+#   python -m backend.benchmarks.bench_faiss_index --nprobe 8 16 64 --ef-search 32 64 128
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+from backend.services.index_factory import INDEX_TYPES, build_index, configure_search, export_vectors
+from backend.services.vector_search import PREBUILT_FAISS_INDEX_PATH
+
+
+# 새 프로세스에서 인덱스를 읽기 전후 RSS 차이 (학습용 임시 메모리나 할당자 재사용의 영향을 받지 않도록)
+_RSS_PROBE = """
+import os, sys, faiss
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+before = rss()
+index = faiss.read_index(sys.argv[1])
+print(rss() - before)
+"""
+
+
+def synthetic_vectors(n, dim, seed=0, clusters=256):
+    # 음식 이름 임베딩처럼 군집된 분포 (완전 균등 분포는 ANN 에 지나치게 불리함)
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype("float32")
+    vectors = centers[rng.integers(0, clusters, n)] + 0.5 * rng.standard_normal((n, dim)).astype("float32")
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def catalog_vectors(path):
+    _, vectors = export_vectors(faiss.read_index(path))
+    return np.ascontiguousarray(vectors, dtype="float32")
+
+
+def make_queries(vectors, count, noise, seed=1):
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.integers(0, len(vectors), count)].copy()
+    queries += noise * rng.standard_normal(queries.shape).astype("float32") / np.sqrt(vectors.shape[1])
+    faiss.normalize_L2(queries)
+    return queries
+
+
+def recall(truth, found, k):
+    # recall@k: 정확 검색 top-k 중 근사 검색 top-k 에 포함된 비율
+    hits = sum(len(set(t[:k]) & set(f[:k])) for t, f in zip(truth, found))
+    return hits / (len(truth) * k)
+
+
+def measure_qps(index, queries, k):
+    start = time.perf_counter()
+    for i in range(len(queries)):
+        index.search(queries[i:i + 1], k)  # 서버와 같은 단건 검색
+    return len(queries) / (time.perf_counter() - start)
+
+
+def resident_memory(index):
+    """(파일 크기, 새 프로세스에서 로드했을 때의 RSS 증가량) 바이트"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.index")
+        faiss.write_index(index, path)
+        out = subprocess.run([sys.executable, "-c", _RSS_PROBE, path], capture_output=True, text=True, check=True)
+        return os.path.getsize(path), int(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 종류별 recall / QPS / 메모리 비교")
+    parser.add_argument("--index", default=PREBUILT_FAISS_INDEX_PATH)
+    parser.add_argument("--synthetic", type=int, help="지정하면 food_faiss.index 대신 합성 벡터 N개 사용")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--types", nargs="+", choices=INDEX_TYPES, default=list(INDEX_TYPES))
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=1.0)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 64])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--threads", type=int, default=1, help="faiss OpenMP 스레드 수")
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(args.threads)
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic, args.dim)
+        source = f"합성 {args.synthetic}개"
+    else:
+        vectors = catalog_vectors(args.index)
+        source = args.index
+    queries = make_queries(vectors, args.queries, args.noise)
+    k = 5
+    print(f"벡터: {source} (n={len(vectors)}, d={vectors.shape[1]}), 쿼리 {len(queries)}개, threads={args.threads}")
+
+    exact = faiss.IndexFlatIP(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    del exact
+
+    print(f"{'index':<10} | {'params':<14} | {'build(s)':>8} | {'R@1':>6} | {'R@5':>6} | "
+          f"{'QPS':>8} | {'size(MB)':>8} | {'RSS(MB)':>8}")
+    print("-" * 90)
+    for index_type in args.types:
+        start = time.perf_counter()
+        index, _ = build_index(vectors, index_type)
+        build_seconds = time.perf_counter() - start
+        size, rss_delta = resident_memory(index)
+        if index_type.startswith("ivf"):
+            sweep = [("nprobe", v) for v in args.nprobe]
+        elif index_type == "hnsw_flat":
+            sweep = [("ef_search", v) for v in args.ef_search]
+        else:
+            sweep = [(None, None)]
+        for name, value in sweep:
+            if name:
+                configure_search(index, {name: value})
+            _, found = index.search(queries, k)
+            label = f"{name}={value}" if name else "-"
+            print(f"{index_type:<10} | {label:<14} | {build_seconds:>8.1f} | {recall(truth, found, 1):>6.3f} | "
+                  f"{recall(truth, found, 5):>6.3f} | {measure_qps(index, queries, k):>8.0f} | "
+                  f"{size / 2**20:>8.1f} | {rss_delta / 2**20:>8.1f}")
+        del index
+        gc.collect()
+
+
+if __name__ == "__main__":
+    main()
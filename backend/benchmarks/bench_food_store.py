@@ -0,0 +1,122 @@
+# benchmarks/bench_food_store.py
+# 음식 데이터 로딩 방식별 로드 시간 / 메모리 비교
+#   - legacy: calorie.py(food_items + food_dict) 와 recommender.py(food_data) 가 각각 json.load
+#   - store : food_store.FoodStore 한 번 로드 (NumPy 컬럼)
+#   - mmap  : build_catalog 로 컴파일한 바이너리 카탈로그를 메모리 맵으로 로드
+# 각 방식은 별도 프로세스에서 측정하여 서로의 메모리에 영향을 주지 않는다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_food_store                      # backend/data/food_db.json 사용
+#   python -m backend.benchmarks.bench_food_store --synthetic 100000   # 합성 데이터 사용
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from backend.scripts.build_catalog import build_food_catalog
+from backend.services.food_store import FOOD_DB_JSON_PATH
+
+_MEASURE_SNIPPET = r"""
+import json, resource, sys, time, tracemalloc
+mode, path = sys.argv[1], sys.argv[2]
+tracemalloc.start()
+start = time.perf_counter()
+if mode == "legacy":
+    from backend.services.food_store import safe_float
+    def _load():
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data["records"] if isinstance(data, dict) else data
+    food_items = _load()
+    food_dict = {
+        item["식품명"]: {
+            "kcal": safe_float(item.get("에너지(kcal)", 0)),
+            "protein": safe_float(item.get("단백질(g)", 0)),
+            "fat": safe_float(item.get("지방(g)", 0)),
+            "carbs": safe_float(item.get("탄수화물(g)", 0)),
+            "sodium": safe_float(item.get("나트륨(mg)", 0)),
+            "potassium": safe_float(item.get("칼륨(mg)", 0)),
+            "phosphorus": safe_float(item.get("인(mg)", 0)),
+        }
+        for item in food_items
+    }
+    food_data = _load()
+    n = len(food_data)
+elif mode == "store":
+    from backend.services.food_store import FoodStore, load_food_records
+    store = FoodStore.from_records(load_food_records(path))
+    n = len(store)
+else:
+    from backend.services.food_store import FoodStore
+    store = FoodStore.load(sys.argv[3])
+    n = len(store)
+elapsed = time.perf_counter() - start
+current, peak = tracemalloc.get_traced_memory()
+maxrss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"mode": mode, "rows": n, "load_s": elapsed,
+                  "retained_mb": current / 2**20, "peak_mb": peak / 2**20, "maxrss_mb": maxrss_kb / 1024}))
+"""
+
+
+def write_synthetic_db(path, n):
+    rng = random.Random(0)
+    records = []
+    for i in range(n):
+        records.append({
+            "식품명": f"합성식품_{i}_{rng.choice(['과자', '빵', '음료', '밥', '국'])}",
+            "에너지(kcal)": f"{rng.uniform(0, 800):.2f}",
+            "단백질(g)": f"{rng.uniform(0, 40):.2f}",
+            "지방(g)": f"{rng.uniform(0, 40):.2f}",
+            "탄수화물(g)": f"{rng.uniform(0, 100):.2f}",
+            "나트륨(mg)": f"{rng.uniform(0, 1500):.2f}",
+            "칼륨(mg)": f"{rng.uniform(0, 800):.2f}",
+            "인(mg)": f"{rng.uniform(0, 500):.2f}",
+            "데이터구분코드": rng.choice(["P", "D", "R"]),
+            "식품코드": f"F{i:08d}",
+            "식품대분류명": "합성",
+            "영양성분함량기준량": "100g",
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"records": records}, f, ensure_ascii=False)
+
+
+def measure(mode, path, catalog_dir):
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE_SNIPPET, mode, path, catalog_dir],
+        cwd=repo_root, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 데이터 로딩 시간/메모리 벤치마크")
+    parser.add_argument("--food-db", default=FOOD_DB_JSON_PATH)
+    parser.add_argument("--synthetic", type=int, default=0, help="N개 합성 레코드로 측정")
+    args = parser.parse_args()
+
+    path = args.food_db
+    tmp_dir = tempfile.TemporaryDirectory()
+    if args.synthetic:
+        path = os.path.join(tmp_dir.name, "food_db.json")
+        write_synthetic_db(path, args.synthetic)
+    print(f"데이터 파일: {path} ({os.path.getsize(path) / 2**20:.1f} MB)")
+    catalog_dir = os.path.join(tmp_dir.name, "food_catalog")
+    build_food_catalog(path, catalog_dir)
+
+    print(f"{'mode':>7} | {'rows':>8} | {'load(s)':>8} | {'retained(MB)':>12} | {'peak(MB)':>9} | {'maxrss(MB)':>10}")
+    print("-" * 70)
+    for mode in ("legacy", "store", "mmap"):
+        r = measure(mode, path, catalog_dir)
+        print(f"{r['mode']:>7} | {r['rows']:>8} | {r['load_s']:>8.2f} | {r['retained_mb']:>12.1f} | "
+              f"{r['peak_mb']:>9.1f} | {r['maxrss_mb']:>10.1f}")
+
+    tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_meal_import.py
+# 식사 기록 가져오기: POST /meal 반복 (식사마다 calculate_nutrition + commit/refresh) vs 일괄 가져오기
+# (항목 중복 제거 + 배치 매칭 + bulk_insert_mappings 1회 트랜잭션). 임시 SQLite 파일을 사용한다.
+#
+# 실행 (프로젝트 루트에서, 임베딩 모델과 FAISS 인덱스가 필요):
+#   python -m backend.benchmarks.bench_meal_import --meals 2000 --distinct-items 300
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database.db import Base
+from backend.main import Meal, save_meal
+from backend.models.models import DEFAULT_USER_ID, Meal as DBMeal
+from backend.services.calorie import calculate_nutrition
+from backend.services.meal_import import build_meal_rows
+from backend.services.vector_search import get_vector_db
+
+_FOODS = ["현미밥", "닭가슴살", "계란", "김치", "된장찌개", "고등어구이", "우유", "바나나", "두부", "식빵",
+          "사과", "아메리카노", "시금치나물", "불고기", "비빔밥", "라면", "떡볶이", "김밥", "삼겹살", "요거트"]
+_QUANTITIES = ["", " 1공기", " 100g", " 200g", " 1개", " 2개", " 1컵", " 1그릇", " 1접시", " 1/2공기"]
+
+
+def synthetic_meals(n, distinct_items, seed=0):
+    rng = random.Random(seed)
+    # 사용자 기록처럼 자주 먹는 음식이 반복되는 항목 풀 (일부는 카탈로그에 없는 변형 이름)
+    pool = [rng.choice(_FOODS) + (f" 변형{i}" if i % 3 == 0 else "") + rng.choice(_QUANTITIES)
+            for i in range(distinct_items)]
+    start = date.today() - timedelta(days=n // 3)
+    return [{
+        "date": start + timedelta(days=i // 3),
+        "type": ["breakfast", "lunch", "dinner"][i % 3],
+        "items": rng.sample(pool, rng.randint(1, 5)),
+    } for i in range(n)]
+
+
+def fresh_session(directory, name):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="식사 기록 일괄 가져오기 벤치마크")
+    parser.add_argument("--meals", type=int, default=2000)
+    parser.add_argument("--distinct-items", type=int, default=300)
+    parser.add_argument("--skip-legacy", action="store_true", help="식사별 업로드 경로 측정 생략")
+    args = parser.parse_args()
+
+    meals = synthetic_meals(args.meals, args.distinct_items)
+    get_vector_db().find_best_matches(["워밍업"])
+    print(f"식사 {len(meals)}개, 항목 {sum(len(m['items']) for m in meals)}개 "
+          f"(서로 다른 항목 {len({i for m in meals for i in m['items']})}개)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.skip_legacy:
+            session = fresh_session(tmp, "legacy.db")
+            get_vector_db().query_cache.clear()
+            start = time.perf_counter()
+            for meal in meals:
+                save_meal(session, DEFAULT_USER_ID, Meal(**meal), calculate_nutrition(meal["items"]))
+            legacy_seconds = time.perf_counter() - start
+            session.close()
+            print(f"POST /meal 반복 : {legacy_seconds:8.2f}s ({len(meals) / legacy_seconds:8.1f} 식사/s)")
+
+        session = fresh_session(tmp, "bulk.db")
+        get_vector_db().query_cache.clear()
+        start = time.perf_counter()
+        rows, summary = build_meal_rows(meals)
+        matched = time.perf_counter()
+        session.bulk_insert_mappings(DBMeal, rows)
+        session.commit()
+        inserted = time.perf_counter()
+        bulk_seconds = inserted - start
+        assert session.query(DBMeal).count() == len(meals)
+        session.close()
+        print(f"일괄 가져오기   : {bulk_seconds:8.2f}s ({len(meals) / bulk_seconds:8.1f} 식사/s, "
+              f"매칭 {matched - start:.2f}s / 삽입 {inserted - matched:.2f}s)")
+        print(f"매칭 단계별 항목 수: {json.dumps(summary['tiers'], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_meal_nutrition.py
+# 식사 항목 수에 따른 calculate_nutrition 지연 시간 측정
+# 항목별 find_best_match 반복 (기존 방식) 과 find_best_matches 배치 검색을 비교한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_meal_nutrition --max-items 10 --repeat 20
+
+import argparse
+import statistics
+import time
+
+from backend.services.calorie import calculate_nutrition, parse_food_item
+from backend.services.vector_search import get_vector_db
+
+SAMPLE_ITEMS = [
+    "현미밥 1공기",
+    "닭가슴살 100g",
+    "계란 2개",
+    "김치 1접시",
+    "된장찌개 1그릇",
+    "고등어구이 1조각",
+    "시금치나물 1접시",
+    "두부 반모",
+    "우유 200ml",
+    "바나나 1개",
+    "사과 1개",
+    "아메리카노 1컵",
+]
+
+
+def _time_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="식사당 영양소 계산 지연 시간 벤치마크")
+    parser.add_argument("--max-items", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    vector_db = get_vector_db()
+    # 모델 워밍업 (첫 encode 비용 제외)
+    vector_db.find_best_matches(["현미밥"])
+
+    print(f"{'items':>5} | {'loop p50(ms)':>12} | {'batch p50(ms)':>13} | {'meal p50(ms)':>12} | {'speedup':>7}")
+    print("-" * 62)
+    for n in range(1, args.max_items + 1):
+        items = [SAMPLE_ITEMS[i % len(SAMPLE_ITEMS)] for i in range(n)]
+        names = [parse_food_item(item) for item in items]
+
+        loop_p50, _ = _time_ms(lambda: [vector_db.find_best_match(name) for name in names], args.repeat)
+        batch_p50, _ = _time_ms(lambda: vector_db.find_best_matches(names), args.repeat)
+        meal_p50, _ = _time_ms(lambda: calculate_nutrition(items), args.repeat)
+
+        print(f"{n:>5} | {loop_p50:>12.2f} | {batch_p50:>13.2f} | {meal_p50:>12.2f} | {loop_p50 / batch_p50:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
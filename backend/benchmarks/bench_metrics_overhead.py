@@ -0,0 +1,111 @@
+# benchmarks/bench_metrics_overhead.py
+# 계측(metrics) 오버헤드: 지표 연산 1회 비용과 핫 패스에서 켰을 때 / 껐을 때(METRICS_ENABLED=0 과 같은 no-op) 비교
+#   - match_items: 합성 카탈로그에서 로컬 단계로 끝나는 식사 항목 매칭 (parse / match_local 타이머 + 매칭 카운터)
+#   - GET /summary?include_history=false: 임시 SQLite 에 대한 요청 전체 (HTTP / SQL / 직렬화 계측 포함)
+#
+# 실행 (프로젝트 루트에서, 모델 / FAISS 인덱스 불필요):
+#   python -m backend.benchmarks.bench_metrics_overhead --catalog 50000 --requests 2000
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from backend.benchmarks.bench_estimate_kcal import synthetic_names
+from backend.services import metrics
+
+
+def per_op_ns(fn, repeat=200000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e9
+
+
+def interleaved(fn, rounds, repeat):
+    """계측 on/off 를 번갈아 측정해 CPU 주파수 변화 등의 영향을 줄임 → (on 중앙값, off 중앙값) 초"""
+    timings = {True: [], False: []}
+    for _ in range(rounds):
+        for state in (True, False):
+            metrics.set_enabled(state)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            timings[state].append((time.perf_counter() - start) / repeat)
+    metrics.set_enabled(True)
+    return float(np.median(timings[True])), float(np.median(timings[False]))
+
+
+def report(label, on, off):
+    print(f"{label:<28}: on {on * 1e6:9.1f} µs / off {off * 1e6:9.1f} µs → 오버헤드 {(on - off) / off * 100:+.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계측 오버헤드 벤치마크")
+    parser.add_argument("--catalog", type=int, default=50000)
+    parser.add_argument("--items", type=int, default=5, help="식사 1개의 항목 수")
+    parser.add_argument("--requests", type=int, default=2000, help="라운드당 /summary 요청 수")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    counter = metrics.Counter("bench_counter_total", "벤치마크용", ("tier",), registry=metrics.Registry())
+    histogram = metrics.Histogram("bench_seconds", "벤치마크용", ("stage",), registry=metrics.Registry())
+
+    def timed_block():
+        with histogram.time("parse"):
+            pass
+
+    print(f"Counter.inc          : {per_op_ns(lambda: counter.inc('exact')):7.0f} ns")
+    print(f"Histogram.observe    : {per_op_ns(lambda: histogram.observe(0.003, 'parse')):7.0f} ns")
+    print(f"with histogram.time(): {per_op_ns(timed_block):7.0f} ns")
+    metrics.set_enabled(False)
+    print(f"(비활성) with time() : {per_op_ns(timed_block):7.0f} ns")
+    metrics.set_enabled(True)
+
+    # 1) 식사 항목 매칭 (합성 카탈로그를 공용 음식 저장소로 사용)
+    from backend.services import food_store
+    from backend.services.calorie import match_items
+    names = synthetic_names(args.catalog)
+    food_store._food_store = food_store.FoodStore.from_records(
+        [{"식품명": name, "에너지(kcal)": str(100 + i % 400)} for i, name in enumerate(names)]
+    )
+    rng = random.Random(0)
+    meals = [[rng.choice(names) + rng.choice(["", " 1개", " 200g"]) for _ in range(args.items)] for _ in range(500)]
+    no_vector = lambda pending: [None] * len(pending)
+    match_items(meals[0], vector_search=no_vector)  # 색인 생성 / 워밍업
+    meal_iter = iter(meals * (args.rounds * 4))
+    on, off = interleaved(lambda: match_items(next(meal_iter), vector_search=no_vector), args.rounds, 100)
+    report(f"match_items ({args.items}항목)", on, off)
+
+    # 2) 요청 전체: 임시 DB 로 main 을 import 하고 /summary 를 반복 호출 (startup 워밍업은 실행하지 않음)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'metrics.db')}"
+        # backend.database.db 는 import 시점의 DATABASE_URL 로 engine 을 만들므로 DB 관련 모듈은 여기서 import
+        from fastapi.testclient import TestClient
+        from backend.benchmarks.bench_db_concurrency import meal_row
+        from backend.database.db import Base, SessionLocal, engine
+        from backend.main import app
+        from backend.models.models import Meal as DBMeal
+        from backend.services import daily_rollup
+        Base.metadata.create_all(bind=engine)
+        session = SessionLocal()
+        rows = [meal_row(rng, datetime.date.today()) for _ in range(20)]
+        session.bulk_insert_mappings(DBMeal, rows)
+        daily_rollup.record_meals(session, rows)
+        session.commit()
+        session.close()
+
+        client = TestClient(app)
+        client.get("/summary?include_history=false")
+        on, off = interleaved(lambda: client.get("/summary?include_history=false"), args.rounds,
+                              max(1, args.requests // args.rounds))
+        report("GET /summary", on, off)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
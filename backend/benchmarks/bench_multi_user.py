@@ -0,0 +1,127 @@
+# benchmarks/bench_multi_user.py
+# 사용자 수가 늘어날 때 요청 1개의 비용이 한 사용자의 데이터 양에만 비례하는지 측정 (임시 SQLite 파일)
+# 사용자당 식사 수를 고정하고 사용자를 단계적으로 추가하면서, 임의 사용자 1명에 대한 핸들러를 직접 호출한다.
+#   - /summary (오늘 식사만 / 전체 기록), /meals 첫 페이지, /nutrition/daily 30일
+#   - POST /goal (사용자 행 UPSERT), POST /meal 저장 (INSERT + 집계 UPSERT + 버전 증가 + commit)
+# 마지막에 사용자 범위 조회의 EXPLAIN QUERY PLAN 으로 ix_meals_user_date 사용 여부를 출력한다.
+#
+# 실행 (프로젝트 루트에서, 모델 / FAISS 인덱스 불필요):
+#   python -m backend.benchmarks.bench_multi_user --users 10 100 1000 10000 --meals-per-user 100
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from backend.benchmarks.bench_db_concurrency import meal_row
+from backend.database.db import Base, make_engine
+from backend.main import Meal, build_summary, meals_history_query, nutrition_periods, save_meal
+from backend.models.models import Meal as DBMeal
+from backend.services import daily_rollup, goals, response_cache
+
+GOAL = {"current_weight": 70.0, "target_weight": 65.0, "period_days": 60, "activity_level": "medium"}
+NUTRITION = {"kcal": 500.0, "protein": 20.0, "fat": 10.0, "carbs": 60.0, "sodium": 300.0,
+             "potassium": 200.0, "phosphorus": 100.0, "matched_info": []}
+
+
+def user_name(i):
+    return f"user{i:06d}"
+
+
+def seed_users(Session, first, last, meals_per_user, days, rng):
+    """user{first}..user{last - 1} 사용자의 목표 / 식사 / 집계 / 데이터 버전 생성 (사용자 1000명씩 commit)"""
+    today = date.today()
+    session = Session()
+    try:
+        for start in range(first, last, 1000):
+            rows = []
+            for i in range(start, min(start + 1000, last)):
+                user_id = user_name(i)
+                goals.upsert_goal(session, user_id, GOAL)
+                response_cache.bump_version(session, user_id)
+                rows.extend({**meal_row(rng, today - timedelta(days=rng.randrange(days))), "user_id": user_id}
+                            for _ in range(meals_per_user))
+            session.bulk_insert_mappings(DBMeal, rows)
+            daily_rollup.record_meals(session, rows)
+            session.commit()
+    finally:
+        session.close()
+
+
+def p50_ms(Session, fn, users, repeat, rng):
+    """매번 임의 사용자를 골라 새 세션으로 fn(session, user_id) 실행 → 중앙값(ms)"""
+    samples = []
+    for _ in range(repeat):
+        user_id = user_name(rng.randrange(users))
+        session = Session()
+        try:
+            start = time.perf_counter()
+            fn(session, user_id)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            session.close()
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 수 증가에 따른 사용자별 요청 비용 벤치마크")
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="측정할 누적 사용자 수 (오름차순)")
+    parser.add_argument("--meals-per-user", type=int, default=100)
+    parser.add_argument("--days", type=int, default=180, help="사용자별 식사가 분포할 날짜 수")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    today = date.today()
+    month_ago = today - timedelta(days=29)
+    meal = Meal(date=today, type="snack", items=["사과 1개"])
+    cases = [
+        ("summary (오늘)", lambda db, user_id: build_summary(db, user_id, today, False)),
+        ("summary (전체 기록)", lambda db, user_id: build_summary(db, user_id, today, True)),
+        ("meals 첫 페이지", lambda db, user_id: meals_history_query(db, user_id, None, None, None).limit(51).all()),
+        ("nutrition/daily 30일", lambda db, user_id: nutrition_periods(db, user_id, "day", month_ago, today)),
+        ("POST /goal", lambda db, user_id: (goals.upsert_goal(db, user_id, GOAL),
+                                           response_cache.bump_version(db, user_id), db.commit())),
+        ("POST /meal 저장", lambda db, user_id: save_meal(db, user_id, meal, NUTRITION)),
+    ]
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'multi_user.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        print(f"{'사용자 수':>10} {'식사 행':>10} " + " ".join(f"{label:>22}" for label, _ in cases) + "  (p50 ms)")
+        seeded = 0
+        for users in sorted(args.users):
+            start = time.perf_counter()
+            seed_users(Session, seeded, users, args.meals_per_user, args.days, rng)
+            seeded = users
+            seed_seconds = time.perf_counter() - start
+            with engine.connect() as conn:
+                conn.execute(text("ANALYZE"))
+                total = conn.execute(text("SELECT COUNT(*) FROM meals")).scalar()
+            timings = [p50_ms(Session, fn, users, args.repeat, rng) for _, fn in cases]
+            print(f"{users:>10} {total:>10} " + " ".join(f"{value:>22.3f}" for value in timings)
+                  + f"  (시드 {seed_seconds:.1f}s)")
+
+        print("\n사용자 범위 조회 실행 계획:")
+        with engine.connect() as conn:
+            for label, sql in [
+                ("오늘 식사", "SELECT * FROM meals WHERE user_id = 'user000000' AND date = DATE('now') ORDER BY id"),
+                ("식사 페이지", "SELECT * FROM meals WHERE user_id = 'user000000' ORDER BY date, id LIMIT 51"),
+                ("목표", "SELECT * FROM goals WHERE user_id = 'user000000'"),
+            ]:
+                plan = "; ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+                print(f"  {label:<8}: {plan}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_snack_recommendation.py
+# 카탈로그 크기별 간식 후보 선정 시간 비교
+#   - legacy: 요청마다 food_data(dict 리스트) 전체를 훑는 기존 list comprehension
+#   - index : kcal 정렬 SnackIndex + searchsorted + 후보 창 벡터 점수화
+# 측정 전에 index 결과가 남은 칼로리 이하 후보 전체를 점수화한 결과와 같은지 확인한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_snack_recommendation --sizes 1000 10000 100000 1000000
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from backend.services.food_store import FoodStore
+from backend.services.recommender import SnackIndex
+
+
+def synthetic_records(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "식품명": f"합성식품_{i}",
+            "에너지(kcal)": f"{rng.uniform(0, 800):.1f}",
+            "단백질(g)": f"{rng.uniform(0, 30):.1f}",
+            "지방(g)": f"{rng.uniform(0, 30):.1f}",
+            "탄수화물(g)": f"{rng.uniform(0, 80):.1f}",
+            "나트륨(mg)": f"{rng.uniform(0, 1200):.1f}",
+            "칼륨(mg)": f"{rng.uniform(0, 600):.1f}",
+            "인(mg)": f"{rng.uniform(0, 500):.1f}",
+            "데이터구분코드": rng.choice(["P", "D", "R"]),
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_candidates(food_data, remain_kcal, top_k):
+    snack_candidates = [
+        {
+            "식품명": food["식품명"],
+            "에너지(kcal)": float(food.get("에너지(kcal)", 0)),
+            "단백질(g)": float(food.get("단백질(g)", 0)),
+            "지방(g)": float(food.get("지방(g)", 0)),
+            "탄수화물(g)": float(food.get("탄수화물(g)", 0))
+        }
+        for food in food_data
+        if food.get("데이터구분코드") == "P" and
+           food.get("에너지(kcal)", "").strip() and
+           float(food.get("에너지(kcal)", 0)) > 0 and
+           float(food.get("에너지(kcal)", 0)) <= remain_kcal
+    ]
+    return snack_candidates[:top_k]
+
+
+def full_scan_top(index, remain_kcal, top_k):
+    """남은 칼로리 이하 후보 전체를 점수화한 상위 top_k 행 번호 (SnackIndex.top_snacks 검증용)"""
+    hi = int(np.searchsorted(index.kcal, remain_kcal, side="right"))
+    scores = index.score(0, hi, remain_kcal)
+    return [int(index.rows[i]) for i in np.argsort(-scores, kind="stable")[:top_k]]
+
+
+def _median_us(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="간식 추천 후보 선정 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    remain_values = np.linspace(50, 2000, 8)
+    print(f"{'catalog':>9} | {'build(ms)':>9} | {'legacy p50(us)':>14} | {'index p50(us)':>13} | {'speedup':>8}")
+    print("-" * 66)
+    for n in args.sizes:
+        records = synthetic_records(n)
+        store = FoodStore.from_records(records)
+        start = time.perf_counter()
+        index = SnackIndex(store)
+        build_ms = (time.perf_counter() - start) * 1000
+        for r in remain_values:
+            assert [row for row, _ in index.top_snacks(r, args.top_k)] == full_scan_top(index, r, args.top_k)
+
+        legacy_us = statistics.median(
+            _median_us(lambda r=r: legacy_candidates(records, r, args.top_k), max(1, args.repeat // 4))
+            for r in remain_values
+        )
+        index_us = statistics.median(
+            _median_us(lambda r=r: index.top_snacks(r, args.top_k), args.repeat)
+            for r in remain_values
+        )
+        print(f"{n:>9} | {build_ms:>9.1f} | {legacy_us:>14.1f} | {index_us:>13.1f} | {legacy_us / index_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
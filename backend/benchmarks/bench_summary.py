@@ -0,0 +1,133 @@
+# benchmarks/bench_summary.py
+# GET /summary 처리 시간: 기존 구현(전체 로드 + Python 필터/합산) vs 현재 구현(날짜별 집계 + date 인덱스)
+# 현재 구현은 응답 캐시 미스(조회 + JSON 직렬화) / 같은 데이터 버전 재조회(캐시 적중) / If-None-Match 일치(304) 로 나눠 측정
+# 임시 SQLite 파일에 N개 식사 행을 시드하고 핸들러 함수를 직접 호출한다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.benchmarks.bench_summary --rows 100000
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from backend.database.db import Base
+from backend.main import get_summary, nutrition_total_for
+from backend.models.models import DEFAULT_USER_ID, Goal as DBGoal, Meal as DBMeal
+from backend.services import daily_rollup, response_cache
+
+
+def seed(session, rows, today_rows):
+    rng = random.Random(0)
+    today = date.today()
+    items = json.dumps(["현미밥 1공기", "닭가슴살 100g", "계란 2개"], ensure_ascii=False)
+    mappings = []
+    for i in range(rows):
+        day = today if i < today_rows else today - timedelta(days=rng.randint(1, 3650))
+        mappings.append({
+            "date": day, "type": rng.choice(["breakfast", "lunch", "dinner", "snack"]), "items": items,
+            "kcal": rng.uniform(100, 900), "protein": rng.uniform(0, 50), "fat": rng.uniform(0, 40),
+            "carbs": rng.uniform(0, 120), "sodium": rng.uniform(0, 2000), "potassium": rng.uniform(0, 800),
+            "phosphorus": rng.uniform(0, 500), "matched_items": "[]",
+        })
+    session.bulk_insert_mappings(DBMeal, mappings)
+    daily_rollup.rebuild(session)
+    session.add(DBGoal(current_weight=70, target_weight=60, period_days=60, activity_level="medium"))
+    response_cache.bump_version(session, DEFAULT_USER_ID)
+    session.commit()
+
+
+def make_request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/summary", "headers": headers})
+
+
+def legacy_summary(db):
+    # 변경 전 get_summary 의 핵심 경로
+    goal = db.query(DBGoal).first()
+    all_meals = db.query(DBMeal).all()
+    today_meals = [m for m in all_meals if m.date == date.today()]
+
+    def convert(meals):
+        out = []
+        for meal in meals:
+            items = json.loads(meal.items) if meal.items else []
+            out.append({"date": str(meal.date), "type": meal.type, "items": items, "nutrition": {
+                "kcal": meal.kcal, "protein": meal.protein, "fat": meal.fat, "carbs": meal.carbs,
+                "sodium": meal.sodium, "potassium": meal.potassium, "phosphorus": meal.phosphorus}})
+        return out
+
+    meals_data, today_data = convert(all_meals), convert(today_meals)
+    total = {field: sum(getattr(m, field) for m in today_meals)
+             for field in ["kcal", "protein", "fat", "carbs", "sodium", "potassium", "phosphorus"]}
+    return goal, meals_data, today_data, total
+
+
+def _time_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /summary 벤치마크 (시드된 SQLite)")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--today-rows", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as session:
+            start = time.perf_counter()
+            seed(session, args.rows, args.today_rows)
+            print(f"시드 완료: {args.rows}행 ({time.perf_counter() - start:.1f}s)")
+
+        def run(fn):
+            def _call():
+                with Session() as session:
+                    fn(session)
+            return _time_ms(_call, args.repeat)
+
+        def legacy_total(db):
+            today_meals = [m for m in db.query(DBMeal).all() if m.date == date.today()]
+            return {field: sum(getattr(m, field) for m in today_meals)
+                    for field in ["kcal", "protein", "fat", "carbs", "sodium", "potassium", "phosphorus"]}
+
+        cache = response_cache.get_response_cache()
+
+        def uncached(include_history):
+            def _summary(db):
+                cache.clear()
+                return get_summary(make_request(), include_history=include_history, db=db, user_id=DEFAULT_USER_ID)
+            return _summary
+
+        with Session() as session:
+            etag = get_summary(make_request(), db=session, user_id=DEFAULT_USER_ID).headers["etag"]
+
+        print(f"{'':<30} {'p50(ms)':>9}")
+        print(f"{'nutrition_total (legacy)':<30} {run(legacy_total):>9.2f}")
+        print(f"{'nutrition_total (집계 테이블)':<30} {run(lambda s: nutrition_total_for(s, DEFAULT_USER_ID, date.today())):>9.2f}")
+        print(f"{'/summary (legacy)':<30} {run(legacy_summary):>9.2f}")
+        print(f"{'/summary (캐시 미스)':<30} {run(uncached(True)):>9.2f}")
+        print(f"{'/summary (캐시 적중)':<30} {run(lambda s: get_summary(make_request(), db=s, user_id=DEFAULT_USER_ID)):>9.2f}")
+        print(f"{'/summary (If-None-Match → 304)':<30} {run(lambda s: get_summary(make_request(etag), db=s, user_id=DEFAULT_USER_ID)):>9.2f}")
+        print(f"{'/summary?include_history=0 미스':<30} {run(uncached(False)):>9.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# 다중 사용자 스키마로의 이전 (기존 단일 사용자 DB 파일 / Postgres 에 한 번 적용, 이미 적용된 DB 에서는 아무것도 하지 않음)
+#
+#   1. goals / meals 에 user_id 컬럼 추가 (기존 행은 user_id 인자의 사용자 소유)
+#   2. 사용자별 목표가 1개가 되도록 중복 목표 정리 (가장 최근 id 만 유지) → 이후 ux_goals_user_id 고유 인덱스 생성
+#   3. 단일 사용자용 ix_meals_date 인덱스 삭제 (ix_meals_user_date 가 대신함)
+#   4. 기본 키가 바뀐 daily_nutrition / data_version 은 삭제 후 다시 생성 (집계는 meals 에서 다시 계산)
+#
+# 서버 시작 시 create_all 전에 자동으로 실행되며, scripts/migrate_multi_user.py 로 따로 실행할 수도 있다.
+
+from sqlalchemy import inspect, text
+
+from backend.database.db import Base, engine as default_engine, ensure_indexes
+from backend.models.models import DEFAULT_USER_ID, USER_ID_MAX_LENGTH
+
+_OWNED_TABLES = ("goals", "meals")
+_REKEYED_TABLES = ("daily_nutrition", "data_version")
+_LEGACY_INDEXES = {"meals": "ix_meals_date"}
+
+
+def pending_steps(engine=None):
+    """아직 적용되지 않은 이전 단계 목록 (문자열 설명)"""
+    inspector = inspect(engine or default_engine)
+    tables = set(inspector.get_table_names())
+    steps = []
+    for table in _OWNED_TABLES:
+        if table in tables and "user_id" not in {column["name"] for column in inspector.get_columns(table)}:
+            steps.append(f"{table}.user_id 컬럼 추가")
+    for table, index in _LEGACY_INDEXES.items():
+        if table in tables and index in {item["name"] for item in inspector.get_indexes(table)}:
+            steps.append(f"{index} 인덱스 삭제")
+    for table in _REKEYED_TABLES:
+        if table in tables and "user_id" not in {column["name"] for column in inspector.get_columns(table)}:
+            steps.append(f"{table} 다시 생성")
+    return steps
+
+
+def migrate_multi_user(engine=None, user_id=DEFAULT_USER_ID):
+    """단일 사용자 스키마를 다중 사용자 스키마로 이전 → 적용한 단계 목록 (없으면 빈 리스트)
+
+    한 트랜잭션에서 실행하고 (SQLite / Postgres 모두 DDL 트랜잭션 지원), 새 테이블 / 인덱스는 create_all 로 만든다.
+    집계(daily_nutrition)는 비워 두므로 호출한 쪽에서 daily_rollup.ensure_backfilled 로 다시 채워야 한다.
+    """
+    engine = engine or default_engine
+    steps = pending_steps(engine)
+    if not steps:
+        return []
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in _OWNED_TABLES:
+            if table in tables and "user_id" not in {column["name"] for column in inspector.get_columns(table)}:
+                # 상수 기본값이 있는 NOT NULL 컬럼 추가는 SQLite 에서도 테이블을 다시 쓰지 않는다
+                conn.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN user_id VARCHAR({USER_ID_MAX_LENGTH}) "
+                    f"NOT NULL DEFAULT '{DEFAULT_USER_ID}'"
+                ))
+                if user_id != DEFAULT_USER_ID:
+                    conn.execute(text(f"UPDATE {table} SET user_id = :user_id"), {"user_id": user_id})
+        if "goals" in tables:
+            conn.execute(text(
+                "DELETE FROM goals WHERE id NOT IN (SELECT MAX(id) FROM goals GROUP BY user_id)"
+            ))
+        for table, index in _LEGACY_INDEXES.items():
+            if table in tables:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        for table in _REKEYED_TABLES:
+            if table in tables and "user_id" not in {column["name"] for column in inspector.get_columns(table)}:
+                conn.execute(text(f"DROP TABLE {table}"))
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
+    return steps
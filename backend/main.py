@@ -1,16 +1,30 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import date
+import asyncio
+import base64
+import hmac
 import json
+import logging
 import re
-from backend.services.calorie import calculate_nutrition
-from backend.services.recommender import recommend_snacks
+from backend.services import daily_rollup, goals, metrics, response_cache
+from backend.services.calorie import calculate_nutrition, parse_food_item
+from backend.services.food_matcher import get_food_matcher
+from backend.services.food_store import get_food_store
+from backend.services.recommender import get_snack_index, recommend_snacks
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from backend.database.db import SessionLocal, engine, Base
-from backend.models.models import Goal as DBGoal, Meal as DBMeal
-from backend.services.vector_search import get_vector_db
+from backend.database.db import SessionLocal, engine, Base, ensure_indexes
+from backend.database.migrations import migrate_multi_user
+from backend.models.models import DEFAULT_USER_ID, USER_ID_MAX_LENGTH, Meal as DBMeal
+from backend.services.vector_search import get_vector_db, faiss_db_instance_loaded
+from backend.services.inference import InferenceQueueFull, get_inference_executor
+from backend.services.meal_import import IMPORT_FORMATS, MealImportError, build_meal_rows, detect_format, parse_meals
+from backend.services.warmup import READY, Warmup
 from dotenv import load_dotenv
 import os
 
@@ -19,11 +33,23 @@ print("✅ FastAPI main.py 로드 성공")
 # .env 파일 로드 (main.py에서도 로드하여 다른 환경변수 사용 가능)
 load_dotenv()
 
+# 로그 레벨 (LOG_LEVEL=DEBUG 이면 항목별 매칭 / 추천 계산 과정까지 출력). 외부 라이브러리는 WARNING 이상만
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logging.getLogger("backend").setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger("backend.main")
+
 # 데이터베이스 테이블 생성 및 연결 테스트
 # 서버 시작 시 한 번 호출되도록 수정
 # Base.metadata.create_all(bind=engine) # <- 이 줄은 init_db() 내부로 이동 또는 삭제
 
-app = FastAPI()
+class TimedJSONResponse(JSONResponse):
+    """JSON 직렬화 시간을 stage="serialize" 로 기록"""
+
+    def render(self, content) -> bytes:
+        with metrics.stage_timer("serialize"):
+            return super().render(content)
+
+app = FastAPI(default_response_class=TimedJSONResponse)
 PORT = int(os.environ.get("PORT", 4000))
 
 app.add_middleware(
@@ -32,6 +58,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 요청별 처리 시간 (라우트 템플릿 기준) 과 SQL 실행 시간 계측
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
 
 # 데이터베이스 세션 의존성
 def get_db():
@@ -41,20 +70,119 @@ def get_db():
     finally:
         db.close()
 
+USER_ID_PATTERN = re.compile(rf"[A-Za-z0-9._@-]{{1,{USER_ID_MAX_LENGTH}}}")
+# X-User-Id 는 인증이 아니라 앞단(인증 프록시 / API 게이트웨이)이 확인한 사용자를 전달받는 식별 헤더다.
+# 값을 그대로 믿으므로 클라이언트가 직접 접근할 수 있으면 누구나 다른 사용자의 데이터를 읽고 바꿀 수 있다.
+# USER_ID_PROXY_SECRET 을 설정하면 같은 값의 X-Proxy-Secret 헤더가 있는 요청(= 프록시를 거친 요청)만 받는다.
+USER_ID_PROXY_SECRET = os.environ.get("USER_ID_PROXY_SECRET") or None
+
+def get_user_id(x_user_id: Optional[str] = Header(None), x_proxy_secret: Optional[str] = Header(None)) -> str:
+    """요청의 사용자 (신뢰하는 프록시가 넣은 X-User-Id 헤더). 목표 / 식사 조회와 쓰기의 범위를 정할 뿐 접근 제어는 아님
+
+    USER_ID_PROXY_SECRET 이 없으면(로컬 / 단일 사용자) 헤더가 없을 때 기본 사용자로 처리하고,
+    있으면 X-Proxy-Secret 이 맞지 않을 때 401, X-User-Id 가 없을 때 400.
+    """
+    if USER_ID_PROXY_SECRET is not None:
+        if x_proxy_secret is None or not hmac.compare_digest(x_proxy_secret, USER_ID_PROXY_SECRET):
+            raise HTTPException(status_code=401, detail="신뢰하는 프록시를 거친 요청이 아닙니다.")
+        if x_user_id is None:
+            raise HTTPException(status_code=400, detail="X-User-Id 헤더가 필요합니다.")
+    if x_user_id is None:
+        return DEFAULT_USER_ID
+    if not USER_ID_PATTERN.fullmatch(x_user_id):
+        raise HTTPException(
+            status_code=400,
+            detail=f"X-User-Id 는 영문/숫자/._@- 로 된 {USER_ID_MAX_LENGTH}자 이하 문자열이어야 합니다.",
+        )
+    return x_user_id
+
 @app.get("/")
 def root():
     return {"message": "FastAPI is running"}
 
+# ===== 백그라운드 워밍업 (모델/인덱스/카탈로그) =====
+def load_food_catalog():
+    store = get_food_store()
+    snack_index = get_snack_index()
+    matcher = get_food_matcher()
+    return {"foods": len(store), "snack_candidates": len(snack_index), "matcher_names": len(matcher.normalized_rows)}
+
+def load_vector_db():
+    vector_db = get_vector_db()
+    return {**vector_db.load_timings, "vectors": vector_db.index.ntotal, "index_type": vector_db.index_info["type"], "encoder": vector_db.model.backend}
+
+warmup = Warmup()
+warmup.register("food_catalog", load_food_catalog)
+warmup.register("vector_db", load_vector_db)
+
+def require_ready(*components):
+    """지정한 구성 요소가 로드되기 전에는 503 을 반환하는 의존성"""
+    def dependency():
+        for component in components:
+            state = warmup.state(component)
+            if state.status != READY:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"{component} 준비 중입니다 (상태: {state.status}). 잠시 후 다시 시도해주세요.",
+                    headers={"Retry-After": "5"},
+                )
+    return dependency
+
 @app.on_event("startup")
 def on_startup():
     print("🚀 애플리케이션 시작 중...")
     try:
+        # 단일 사용자 시절의 DB 면 user_id 컬럼 / 인덱스를 먼저 추가 (이미 이전된 DB 는 검사만 함)
+        migrated = migrate_multi_user(engine)
+        if migrated:
+            print(f"✅ 다중 사용자 스키마로 이전: {', '.join(migrated)}")
         Base.metadata.create_all(bind=engine)
+        ensure_indexes()
         print("✅ DB 테이블 생성 완료")
-        get_vector_db()
-        print("✅ 벡터 DB 초기화 완료")
+        backfill_daily_nutrition()
     except Exception as e:
         print(f"❌ Startup 중 오류 발생: {e}")
+    # 모델/인덱스/카탈로그는 백그라운드에서 로드하고 서버는 바로 요청을 받는다 (/readyz 로 확인)
+    warmup.start()
+
+def backfill_daily_nutrition():
+    """기존 DB 에 사용자 / 날짜별 집계가 비어 있으면 meals 에서 한 번 채움"""
+    db = SessionLocal()
+    try:
+        rows = daily_rollup.ensure_backfilled(db)
+        if rows:
+            print(f"✅ 사용자 / 날짜별 영양소 집계 {rows}행 생성")
+    finally:
+        db.close()
+
+@app.get("/healthz")
+def healthz():
+    """프로세스 생존 확인 (모델 로드 여부와 무관)"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    """구성 요소별 로드 상태 및 소요 시간. 모두 준비되면 200, 아니면 503"""
+    report = warmup.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@app.exception_handler(InferenceQueueFull)
+async def inference_queue_full_handler(request: Request, exc: InferenceQueueFull):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "요청이 많아 잠시 후 다시 시도해주세요."},
+        headers={"Retry-After": "1"},
+    )
+
+@app.on_event("shutdown")
+def on_shutdown():
+    get_inference_executor().shutdown()
+    # QUERY_CACHE_PATH 가 설정된 경우 쿼리 캐시를 디스크에 저장하여 재시작 시 재사용
+    if faiss_db_instance_loaded():
+        try:
+            get_vector_db().query_cache.save()
+        except Exception as e:
+            print(f"❌ 쿼리 캐시 저장 중 오류 발생: {e}")
 
 # ===== 데이터 모델 =====
 class Goal(BaseModel):
@@ -71,21 +199,16 @@ class Meal(BaseModel):
 # ===== API 엔드포인트 =====
 
 @app.post("/goal")
-def set_goal(goal: Goal, db: Session = Depends(get_db)):
-    # 기존 목표 삭제 후 새로 저장
-    db.query(DBGoal).delete()
-    db_goal = DBGoal(**goal.dict())
-    db.add(db_goal)
+def set_goal(goal: Goal, db: Session = Depends(get_db), user_id: str = Depends(get_user_id)):
+    # 사용자의 목표 행을 UPSERT (다른 사용자의 목표는 건드리지 않음)
+    goals.upsert_goal(db, user_id, goal.dict())
+    response_cache.bump_version(db, user_id)
     db.commit()
-    db.refresh(db_goal)
     return {"message": "목표가 저장되었습니다.", "goal": goal.dict()}
 
-@app.post("/meal")
-def upload_meal(meal: Meal, db: Session = Depends(get_db)):
-    # 벡터 검색을 통한 영양소 계산
-    nutrition_result = calculate_nutrition(meal.items)
-    
+def save_meal(db: Session, user_id: str, meal: Meal, nutrition_result: dict) -> DBMeal:
     db_meal = DBMeal(
+        user_id=user_id,
         date=meal.date,
         type=meal.type,
         items=json.dumps(meal.items, ensure_ascii=False),
@@ -101,8 +224,19 @@ def upload_meal(meal: Meal, db: Session = Depends(get_db)):
         matched_items=json.dumps(nutrition_result.get("matched_info", []), ensure_ascii=False)
     )
     db.add(db_meal)
+    # 날짜별 집계도 같은 트랜잭션에서 갱신
+    daily_rollup.record_meals(db, [db_meal])
+    response_cache.bump_version(db, user_id)
     db.commit()
     db.refresh(db_meal)
+    return db_meal
+
+@app.post("/meal", dependencies=[Depends(require_ready("food_catalog", "vector_db"))])
+async def upload_meal(meal: Meal, db: Session = Depends(get_db), user_id: str = Depends(get_user_id)):
+    # 벡터 검색을 통한 영양소 계산 (추론 전용 풀에서 실행, 대기열이 가득 차면 429)
+    nutrition_result = await get_inference_executor().run(calculate_nutrition, meal.items)
+    # DB 쓰기는 이벤트 루프를 막지 않도록 기본 스레드 풀에서 실행
+    await run_in_threadpool(save_meal, db, user_id, meal, nutrition_result)
     
     return {
         "message": f"{meal.type} 등록 완료", 
@@ -110,86 +244,237 @@ def upload_meal(meal: Meal, db: Session = Depends(get_db)):
         "nutrition": nutrition_result
     }
 
+def insert_meal_rows(rows, user_id: str, db: Optional[Session] = None):
+    """식사 행 목록을 user_id 사용자의 식사로 한 트랜잭션에서 executemany 로 일괄 삽입"""
+    for row in rows:
+        row["user_id"] = user_id
+    session = db or SessionLocal()
+    try:
+        session.bulk_insert_mappings(DBMeal, rows)
+        daily_rollup.record_meals(session, rows)
+        response_cache.bump_version(session, user_id)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        if db is None:
+            session.close()
+
+def log_import_progress(stage, done, total):
+    logger.info("[IMPORT] %s: %d/%d", stage, done, total)
+
+async def stream_meal_import(meals, user_id: str):
+    """가져오기 진행 상황을 NDJSON 한 줄씩 전송하고 마지막에 요약(stage=done 또는 error)을 보냄"""
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def report(stage, done, total):
+        log_import_progress(stage, done, total)
+        loop.call_soon_threadsafe(events.put_nowait, {"stage": stage, "done": done, "total": total})
+
+    # 스트리밍 시작 전에 제출하여 대기열이 가득 차면 429 로 응답
+    job = asyncio.wrap_future(get_inference_executor().submit(build_meal_rows, meals, progress=report))
+
+    async def generate():
+        while not (job.done() and events.empty()):
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({next_event, job}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield json.dumps(next_event.result(), ensure_ascii=False) + "\n"
+            else:
+                next_event.cancel()
+        try:
+            rows, summary = job.result()
+            yield json.dumps({"stage": "inserting", "done": 0, "total": len(rows)}) + "\n"
+            await run_in_threadpool(insert_meal_rows, rows, user_id)
+        except Exception as e:
+            yield json.dumps({"stage": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+            return
+        yield json.dumps({"stage": "done", "message": f"식사 {len(rows)}개를 가져왔습니다.", **summary},
+                         ensure_ascii=False) + "\n"
+
+    return generate()
+
+@app.post("/meals/import", dependencies=[Depends(require_ready("food_catalog", "vector_db"))])
+async def import_meals(request: Request, format: Optional[str] = None, progress: bool = False,
+                       db: Session = Depends(get_db), user_id: str = Depends(get_user_id)):
+    """식사 기록 일괄 가져오기 (JSON 배열 / NDJSON / CSV(date,type,items))
+
+    - 형식은 format 쿼리 또는 Content-Type 으로 결정 (기본 JSON)
+    - 전체 항목 문자열을 중복 제거해 배치로 매칭하고, 모든 행을 한 트랜잭션으로 삽입
+    - 하나라도 잘못된 식사가 있으면 422 와 함께 줄 번호별 오류를 반환하고 아무것도 저장하지 않음
+    - progress=true 이면 진행 상황을 NDJSON 으로 스트리밍
+    """
+    if format is not None and format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format 은 {', '.join(IMPORT_FORMATS)} 중 하나여야 합니다.")
+    body = await request.body()
+    try:
+        meals = parse_meals(body, detect_format(request.headers.get("content-type"), format))
+    except MealImportError as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "errors": e.errors})
+
+    if progress:
+        return StreamingResponse(await stream_meal_import(meals, user_id), media_type="application/x-ndjson")
+    rows, summary = await get_inference_executor().run(build_meal_rows, meals, progress=log_import_progress)
+    await run_in_threadpool(insert_meal_rows, rows, user_id, db)
+    return {"message": f"식사 {len(rows)}개를 가져왔습니다.", **summary}
+
 @app.delete("/meal/{idx}")
-def delete_meal(idx: int, db: Session = Depends(get_db)):
-    # 모든 식사를 가져와서 인덱스로 삭제
-    meals = db.query(DBMeal).all()
-    if idx >= len(meals) or idx < 0:
+def delete_meal(idx: int, db: Session = Depends(get_db), user_id: str = Depends(get_user_id)):
+    """(호환용) 사용자의 식사 중 저장 순서 기준 idx 번째 식사 삭제. 새 코드는 DELETE /meals/{meal_id} 를 사용"""
+    if idx < 0:
+        raise HTTPException(status_code=404, detail="해당 인덱스의 식사가 없습니다.")
+    # 전체 테이블을 읽지 않고 OFFSET/LIMIT 으로 위치를 해석
+    meal_to_delete = (db.query(DBMeal).filter(DBMeal.user_id == user_id)
+                      .order_by(DBMeal.id).offset(idx).limit(1).first())
+    if meal_to_delete is None:
         raise HTTPException(status_code=404, detail="해당 인덱스의 식사가 없습니다.")
     
-    meal_to_delete = meals[idx]
     db.delete(meal_to_delete)
+    daily_rollup.apply_deltas(db, daily_rollup.meal_deltas([meal_to_delete], sign=-1))
+    response_cache.bump_version(db, user_id)
     db.commit()
     return {"message": f"{meal_to_delete.type} 식사를 삭제했습니다."}
 
+@app.delete("/meals/{meal_id}")
+def delete_meal_by_id(meal_id: int, db: Session = Depends(get_db), user_id: str = Depends(get_user_id)):
+    """기본 키로 식사 삭제 (DELETE ... WHERE id = ? AND user_id = ?, 다른 사용자의 식사는 404)"""
+    deleted = daily_rollup.delete_meals(
+        db, db.query(DBMeal).filter(DBMeal.id == meal_id, DBMeal.user_id == user_id)
+    )
+    if deleted:
+        response_cache.bump_version(db, user_id)
+    db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="해당 ID의 식사가 없습니다.")
+    return {"message": f"식사(id={meal_id})를 삭제했습니다.", "deleted": deleted}
+
+@app.delete("/meals")
+def delete_meals(
+    ids: Optional[List[int]] = Query(None),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    """사용자의 식사 중 ID 목록(?ids=1&ids=2) 및/또는 날짜 범위(start~end)에 해당하는 식사를 한 번의 DELETE 로 삭제 (날짜별 집계도 함께 차감)"""
+    if not ids and start is None and end is None:
+        raise HTTPException(status_code=400, detail="ids 또는 start/end 중 하나 이상을 지정해주세요.")
+    query = db.query(DBMeal).filter(DBMeal.user_id == user_id)
+    if ids:
+        query = query.filter(DBMeal.id.in_(ids))
+    if start is not None:
+        query = query.filter(DBMeal.date >= start)
+    if end is not None:
+        query = query.filter(DBMeal.date <= end)
+    deleted = daily_rollup.delete_meals(db, query)
+    if deleted:
+        response_cache.bump_version(db, user_id)
+    db.commit()
+    return {"message": f"식사 {deleted}개를 삭제했습니다.", "deleted": deleted}
+
+NUTRIENT_FIELDS = ["kcal", "protein", "fat", "carbs", "sodium", "potassium", "phosphorus"]
+
+def meal_to_dict(meal):
+    """DB 식사 행 → 응답용 딕셔너리 (items JSON 은 여기서 한 번만 디코딩)"""
+    try:
+        items = json.loads(meal.items) if meal.items else []
+    except:
+        items = meal.items if isinstance(meal.items, list) else []
+    return {
+        "id": meal.id,
+        "date": str(meal.date),
+        "type": meal.type,
+        "items": items,
+        "nutrition": {field: getattr(meal, field) for field in NUTRIENT_FIELDS}
+    }
+
+def nutrition_total_for(db: Session, user_id: str, day: date) -> dict:
+    """사용자의 해당 날짜 영양소 합계 (daily_nutrition 집계 테이블의 (user_id, date) 행 1개를 읽음)"""
+    return daily_rollup.totals_for(db, user_id, day)
+
+def nutrition_periods(db: Session, user_id: str, period: str, start: Optional[date], end: Optional[date]):
+    default_start, default_end = daily_rollup.default_range(period, end)
+    start = start or default_start
+    end = end or default_end
+    if start > end:
+        raise HTTPException(status_code=400, detail="start 는 end 보다 이후일 수 없습니다.")
+    days = daily_rollup.daily_range(db, user_id, daily_rollup.period_start(start, period), end)
+    return {"period": period, "start": str(start), "end": str(end),
+            "items": daily_rollup.period_totals(days, period)}
+
+@app.get("/nutrition/daily")
+def get_daily_nutrition(start: Optional[date] = None, end: Optional[date] = None, db: Session = Depends(get_db),
+                         user_id: str = Depends(get_user_id)):
+    """날짜별 영양소 합계 (기본 최근 30일, 기록이 있는 날짜만)"""
+    return nutrition_periods(db, user_id, "day", start, end)
+
+@app.get("/nutrition/weekly")
+def get_weekly_nutrition(start: Optional[date] = None, end: Optional[date] = None, db: Session = Depends(get_db),
+                         user_id: str = Depends(get_user_id)):
+    """주(월요일 시작)별 영양소 합계와 기록한 날 기준 일평균 (기본 최근 12주)"""
+    return nutrition_periods(db, user_id, "week", start, end)
+
+@app.get("/nutrition/monthly")
+def get_monthly_nutrition(start: Optional[date] = None, end: Optional[date] = None, db: Session = Depends(get_db),
+                         user_id: str = Depends(get_user_id)):
+    """월별 영양소 합계와 기록한 날 기준 일평균 (기본 최근 12개월)"""
+    return nutrition_periods(db, user_id, "month", start, end)
+
+def cached_json_response(request: Request, db: Session, user_id: str, key: str, build):
+    """사용자별 데이터 버전 기반 응답 캐시: If-None-Match 가 현재 ETag 와 같으면 304, 같은 버전 본문이 있으면 그대로 반환"""
+    key = f"{user_id}:{key}"
+    epoch, version = response_cache.current_version(db, user_id)  # 본문을 만들기 전에 버전을 먼저 읽음
+    etag = response_cache.make_etag(epoch, version, key)
+    # no-cache: 브라우저가 저장은 하되 매번 ETag 로 재검증 (변경이 없으면 304 로 본문 전송 생략)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    cache = response_cache.get_response_cache()
+    if response_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    body = cache.get(key, etag)
+    if body is None:
+        # build() 는 JSON 기본 타입(dict / list / str / float)만 반환하므로 jsonable_encoder 변환 없이 바로 직렬화
+        response = TimedJSONResponse(build(), headers=headers)
+        cache.put(key, etag, response.body)
+        return response
+    return Response(body, media_type="application/json", headers=headers)
+
 @app.get("/summary")
-def get_summary(db: Session = Depends(get_db)):
-    # 목표 가져오기
-    goal = db.query(DBGoal).first()
-    
-    # 모든 식사 가져오기
-    all_meals = db.query(DBMeal).all()
-    
-    # 오늘의 식사 필터링
-    today_meals = [m for m in all_meals if m.date == date.today()]
+def get_summary(request: Request, include_history: bool = True, db: Session = Depends(get_db),
+                user_id: str = Depends(get_user_id)):
+    """사용자의 목표 / 식사 요약. include_history=false 이면 전체 기록(meals)을 생략하고 오늘 식사만 조회 (ETag / 304 지원)"""
+    today = date.today()
+    # 오늘 날짜가 바뀌면 today_meals / 합계가 달라지므로 키에 포함
+    key = f"summary:{today.isoformat()}:{int(include_history)}"
+    return cached_json_response(request, db, user_id, key,
+                                lambda: build_summary(db, user_id, today, include_history))
+
+def build_summary(db: Session, user_id: str, today: date, include_history: bool) -> dict:
+    # 목표 가져오기 (ux_goals_user_id 로 행 1개)
+    goal = goals.get_goal(db, user_id)
     
-    # 응답용 식사 데이터 변환
     meals_data = []
-    for meal in all_meals:
-        try:
-            items = json.loads(meal.items) if meal.items else []
-        except:
-            items = meal.items if isinstance(meal.items, list) else []
-        meals_data.append({
-            "date": str(meal.date),
-            "type": meal.type,
-            "items": items,
-            "nutrition": {
-                "kcal": meal.kcal,
-                "protein": meal.protein,
-                "fat": meal.fat,
-                "carbs": meal.carbs,
-                "sodium": meal.sodium,
-                "potassium": meal.potassium,
-                "phosphorus": meal.phosphorus
-            }
-        })
-    
     today_meals_data = []
-    for meal in today_meals:
-        try:
-            items = json.loads(meal.items) if meal.items else []
-        except:
-            items = meal.items if isinstance(meal.items, list) else []
-        today_meals_data.append({
-            "date": str(meal.date),
-            "type": meal.type,
-            "items": items,
-            "nutrition": {
-                "kcal": meal.kcal,
-                "protein": meal.protein,
-                "fat": meal.fat,
-                "carbs": meal.carbs,
-                "sodium": meal.sodium,
-                "potassium": meal.potassium,
-                "phosphorus": meal.phosphorus
-            }
-        })
+    if include_history:
+        # 사용자의 모든 식사 가져오기 (행마다 한 번만 변환하여 meals / today_meals 에서 함께 사용)
+        for meal in db.query(DBMeal).filter(DBMeal.user_id == user_id).all():
+            meal_data = meal_to_dict(meal)
+            meals_data.append(meal_data)
+            if meal.date == today:
+                today_meals_data.append(meal_data)
+    else:
+        today_meals = (db.query(DBMeal).filter(DBMeal.user_id == user_id, DBMeal.date == today)
+                       .order_by(DBMeal.id).all())
+        today_meals_data = [meal_to_dict(meal) for meal in today_meals]
     
-    # 오늘의 총 영양소 계산 (저장된 값 사용)
-    total_nutrition = {
-        "kcal": sum(m.kcal for m in today_meals),
-        "protein": sum(m.protein for m in today_meals),
-        "fat": sum(m.fat for m in today_meals),
-        "carbs": sum(m.carbs for m in today_meals),
-        "sodium": sum(m.sodium for m in today_meals),
-        "potassium": sum(m.potassium for m in today_meals),
-        "phosphorus": sum(m.phosphorus for m in today_meals)
-    }
+    # 오늘의 총 영양소 계산 (사용자 / 날짜별 집계 행 1개)
+    total_nutrition = nutrition_total_for(db, user_id, today)
     
     # 목표가 설정되지 않은 경우에도 기본 응답 제공
     if not goal:
-        return {
+        response = {
             "goal": None,
             "nutrition_total": total_nutrition,
             "remaining_kcal": 0,
@@ -197,10 +482,13 @@ def get_summary(db: Session = Depends(get_db)):
             "today_meals": today_meals_data,
             "message": "목표를 설정하면 더 정확한 영양 정보를 확인할 수 있습니다."
         }
+        if not include_history:
+            response.pop("meals")
+        return response
     
     remaining_kcal = goal.current_weight * 30 - total_nutrition["kcal"]  # 단순 계산식 예시
 
-    return {
+    response = {
         "goal": {
             "current_weight": goal.current_weight,
             "target_weight": goal.target_weight,
@@ -212,45 +500,197 @@ def get_summary(db: Session = Depends(get_db)):
         "meals": meals_data,
         "today_meals": today_meals_data
     }
+    if not include_history:
+        response.pop("meals")
+    return response
+
+# ===== 식사 기록 페이지네이션 =====
+MEALS_PAGE_DEFAULT = 50
+MEALS_PAGE_MAX = 500
+MEALS_STREAM_CHUNK = 500
+
+def encode_meal_cursor(meal) -> str:
+    """(date, id) 키셋 커서를 불투명 문자열로 인코딩"""
+    return base64.urlsafe_b64encode(f"{meal.date.isoformat()}|{meal.id}".encode()).decode()
+
+def decode_meal_cursor(cursor: str):
+    try:
+        day, meal_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(day), int(meal_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+def meals_history_query(db: Session, user_id: str, start: Optional[date], end: Optional[date],
+                        cursor: Optional[str]):
+    """사용자의 식사 중 날짜 범위 + (date, id) 키셋 조건을 적용한 쿼리 (ix_meals_user_date 순서 = date, id 오름차순)"""
+    query = db.query(DBMeal).filter(DBMeal.user_id == user_id)
+    if start:
+        query = query.filter(DBMeal.date >= start)
+    if end:
+        query = query.filter(DBMeal.date <= end)
+    if cursor:
+        cursor_date, cursor_id = decode_meal_cursor(cursor)
+        query = query.filter(or_(
+            DBMeal.date > cursor_date,
+            and_(DBMeal.date == cursor_date, DBMeal.id > cursor_id),
+        ))
+    return query.order_by(DBMeal.date, DBMeal.id)
+
+def stream_meals_ndjson(user_id: str, start: Optional[date], end: Optional[date], cursor: Optional[str],
+                        limit: Optional[int]):
+    # 응답 스트리밍 동안 쓸 세션을 직접 연다 (의존성 세션은 응답 전송 전에 닫힐 수 있음)
+    db = SessionLocal()
+    try:
+        query = meals_history_query(db, user_id, start, end, cursor)
+        if limit:
+            query = query.limit(limit)
+        for meal in query.yield_per(MEALS_STREAM_CHUNK):
+            yield json.dumps(meal_to_dict(meal), ensure_ascii=False) + "\n"
+    finally:
+        db.close()
+
+@app.get("/meals")
+def list_meals(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    format: str = "json",
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_user_id),
+):
+    """사용자의 식사 기록을 (date, id) 키셋 페이지네이션으로 조회
+
+    - format=json: 최대 limit 개(기본 50, 최대 500)와 다음 페이지용 next_cursor 반환
+    - format=ndjson: 조건에 맞는 행을 한 줄씩 스트리밍 (limit 이 없으면 전체 내보내기)
+    """
+    if limit is not None and limit <= 0:
+        raise HTTPException(status_code=400, detail="limit 은 1 이상이어야 합니다.")
+    if format == "ndjson":
+        if cursor:
+            decode_meal_cursor(cursor)  # 스트리밍 시작 전에 잘못된 커서를 400 으로 거절
+        return StreamingResponse(stream_meals_ndjson(user_id, start, end, cursor, limit), media_type="application/x-ndjson")
+    if format != "json":
+        raise HTTPException(status_code=400, detail="format 은 json 또는 ndjson 이어야 합니다.")
+
+    page_size = min(limit or MEALS_PAGE_DEFAULT, MEALS_PAGE_MAX)
+    # 한 행을 더 가져와 다음 페이지 존재 여부 판단
+    rows = meals_history_query(db, user_id, start, end, cursor).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    return {
+        "meals": [meal_to_dict(meal) for meal in rows],
+        "next_cursor": encode_meal_cursor(rows[-1]) if has_more else None
+    }
 
-@app.get("/foods/search")
-def search_foods_api(query: str, db_session: Session = Depends(get_db)):
+def search_foods(query: str):
+    vector_db_instance = get_vector_db() # 벡터DB 인스턴스 가져오기
+    # 캐시 키를 calculate_nutrition 과 맞추기 위해 수량/단위를 제거한 음식명으로 검색
+    # top_k=5로 상위 5개 결과, threshold=0.3으로 최소 유사도 설정 (조정 가능)
+    return vector_db_instance.search_similar_foods(parse_food_item(query), top_k=5, threshold=0.3)
+
+@app.get("/foods/search", dependencies=[Depends(require_ready("vector_db"))])
+async def search_foods_api(query: str):
     """음식 이름으로 벡터 DB에서 유사 음식 검색"""
     if not query.strip():
         raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
     
-    vector_db_instance = get_vector_db() # 벡터DB 인스턴스 가져오기
     try:
-        # top_k=5로 상위 5개 결과, threshold=0.3으로 최소 유사도 설정 (조정 가능)
-        similar_foods = vector_db_instance.search_similar_foods(query, top_k=5, threshold=0.3)
+        similar_foods = await get_inference_executor().run(search_foods, query)
         return {"query": query, "results": similar_foods}
+    except InferenceQueueFull:
+        raise
     except Exception as e:
-        print(f"Error during food search: {e}")
+        logger.exception("음식 검색 중 오류: %s", e)
         raise HTTPException(status_code=500, detail="음식 검색 중 오류가 발생했습니다.")
 
+@app.get("/inference/stats")
+def get_inference_stats():
+    """추론 풀 사용 현황 (실행 중/완료/거절 수) 및 encode 마이크로 배칭 통계"""
+    stats = get_inference_executor().stats()
+    if faiss_db_instance_loaded():
+        stats["index"] = get_vector_db().index_info
+        stats["encoder"] = get_vector_db().model.backend
+        if get_vector_db().batcher is not None:
+            stats["batching"] = get_vector_db().batcher.stats()
+    return stats
+
+def collect_service_metrics():
+    """/metrics 수집 시점에 각 구성 요소의 stats() 를 읽어 지표로 변환 (핫 패스 추가 비용 없음)"""
+    inference = get_inference_executor().stats()
+    families = [
+        (f"{metrics.NAMESPACE}_inference_in_flight", "gauge", "추론 풀에서 실행 중이거나 대기 중인 작업 수",
+         [({}, inference["in_flight"])]),
+        (f"{metrics.NAMESPACE}_inference_completed_total", "counter", "완료된 추론 작업 수",
+         [({}, inference["completed"])]),
+        (f"{metrics.NAMESPACE}_inference_rejected_total", "counter", "대기열이 가득 차 거절(429)된 추론 작업 수",
+         [({}, inference["rejected"])]),
+    ]
+    if faiss_db_instance_loaded():
+        vector_db = get_vector_db()
+        cache = vector_db.query_cache.stats()
+        families += [
+            (f"{metrics.NAMESPACE}_query_cache_hits_total", "counter", "음식명 쿼리 캐시 적중 수", [({}, cache["hits"])]),
+            (f"{metrics.NAMESPACE}_query_cache_misses_total", "counter", "음식명 쿼리 캐시 미스 수", [({}, cache["misses"])]),
+            (f"{metrics.NAMESPACE}_query_cache_evictions_total", "counter", "쿼리 캐시 LRU 축출 수",
+             [({}, cache["evictions"])]),
+            (f"{metrics.NAMESPACE}_query_cache_bytes", "gauge", "쿼리 캐시 사용 메모리", [({}, cache["bytes"])]),
+        ]
+        if vector_db.batcher is not None:
+            batching = vector_db.batcher.stats()
+            families += [
+                (f"{metrics.NAMESPACE}_encode_batches_total", "counter", "마이크로 배칭으로 실행한 encode 횟수",
+                 [({}, batching["batches"])]),
+                (f"{metrics.NAMESPACE}_encode_batch_items_total", "counter", "마이크로 배칭으로 encode 한 쿼리 수",
+                 [({}, batching["items"])]),
+            ]
+    responses = response_cache.get_response_cache().stats()
+    families += [
+        (f"{metrics.NAMESPACE}_response_cache_requests_total", "counter",
+         "응답 캐시 조회 결과 (hit / miss / not_modified = If-None-Match 일치로 304)",
+         [({"result": result}, responses[field])
+          for result, field in (("hit", "hits"), ("miss", "misses"), ("not_modified", "not_modified"))]),
+        (f"{metrics.NAMESPACE}_response_cache_entries", "gauge", "응답 캐시 항목 수", [({}, responses["entries"])]),
+    ]
+    return families
+
+metrics.REGISTRY.register_collector(collect_service_metrics)
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus 텍스트 형식 지표 (단계별 지연 시간 히스토그램, 매칭 단계 / 캐시 / 추론 풀 카운터)"""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/foods/cache/stats")
+def get_query_cache_stats():
+    """쿼리 캐시 적중/미스/축출 통계"""
+    if not faiss_db_instance_loaded():
+        return {"loaded": False}
+    return {"loaded": True, **get_vector_db().query_cache.stats()}
+
+@app.get("/foods/match/stats", dependencies=[Depends(require_ready("food_catalog"))])
+def get_food_match_stats():
+    """식사 기록 음식명 매칭의 단계별(exact/normalized/lexical/vector/not_found) 건수와 비율"""
+    return get_food_matcher().stats()
+
 # with open("data/food_db.json", "r", encoding="utf-8") as f: # 주석 처리 또는 삭제 권장
 #     food_data = json.load(f)["records"]                   # 이 데이터는 calorie.py 또는 vector_search.py 에서 관리
     
-@app.get("/recommend/snacks")
-def get_snacks(db: Session = Depends(get_db)):
-    goal = db.query(DBGoal).first()
+@app.get("/recommend/snacks", dependencies=[Depends(require_ready("food_catalog"))])
+def get_snacks(request: Request, db: Session = Depends(get_db), user_id: str = Depends(get_user_id)):
+    """사용자의 오늘 남은 칼로리 기준 간식 추천 (ETag / 304 지원, 그 사용자의 목표 / 식사가 바뀔 때만 다시 계산)"""
+    today = date.today()
+    return cached_json_response(request, db, user_id, f"snacks:{today.isoformat()}",
+                                lambda: build_snacks(db, user_id, today))
+
+def build_snacks(db: Session, user_id: str, today: date) -> dict:
+    goal = goals.get_goal(db, user_id)
     if not goal:
         raise HTTPException(status_code=400, detail="목표가 설정되지 않았습니다.")
     
-    # 데이터베이스에서 식사 목록 가져오기
-    all_meals = db.query(DBMeal).all()
-    meal_log = []
-    for meal in all_meals:
-        try:
-            items = json.loads(meal.items) if meal.items else []
-        except:
-            items = meal.items if isinstance(meal.items, list) else []
-        meal_log.append(Meal(
-            date=meal.date,
-            type=meal.type,
-            items=items
-        ))
-    
+    # 오늘 섭취한 칼로리: POST /meal 에서 저장한 값을 DB 에서 바로 합산 (기록 전체를 다시 추정하지 않음)
+    consumed_kcal = nutrition_total_for(db, user_id, today)["kcal"]
+
     goal_dict = {
         "current_weight": goal.current_weight,
         "target_weight": goal.target_weight,
@@ -258,6 +698,6 @@ def get_snacks(db: Session = Depends(get_db)):
         "activity_level": goal.activity_level
     }
     
-    return recommend_snacks(goal_dict, meal_log)
+    return recommend_snacks(goal_dict, consumed_kcal=consumed_kcal)
 
 
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text
+from sqlalchemy import Column, Integer, String, Float, Date, Text, Index
 from backend.database.db import Base
 
+# X-User-Id 헤더가 없는 요청과 다중 사용자 이전(migration) 전의 기존 데이터가 속하는 사용자
+DEFAULT_USER_ID = "default"
+USER_ID_MAX_LENGTH = 64
+
 class Goal(Base):
     __tablename__ = "goals"
+    # 사용자당 목표 1개 (POST /goal 은 이 키로 UPSERT)
+    __table_args__ = (Index("ux_goals_user_id", "user_id", unique=True),)
     
     id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String(USER_ID_MAX_LENGTH), nullable=False, default=DEFAULT_USER_ID,
+                     server_default=DEFAULT_USER_ID)
     current_weight = Column(Float)
     target_weight = Column(Float)
     period_days = Column(Integer)
@@ -12,8 +20,13 @@ class Goal(Base):
 
 class Meal(Base):
     __tablename__ = "meals"
+    # 모든 조회는 한 사용자 범위 안에서 날짜 조건 / (date, id) 순서로 이루어지므로 (user_id, date) 복합 인덱스 사용
+    # (SQLite 에서는 인덱스 항목에 rowid = id 가 포함되어 (user_id, date, id) 순서로 읽힘)
+    __table_args__ = (Index("ix_meals_user_date", "user_id", "date"),)
     
     id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String(USER_ID_MAX_LENGTH), nullable=False, default=DEFAULT_USER_ID,
+                     server_default=DEFAULT_USER_ID)
     date = Column(Date)
     type = Column(String)  # breakfast, lunch, dinner, snack
     items = Column(Text)  # 식품 목록을 JSON 문자열로 저장
@@ -28,4 +41,29 @@ class Meal(Base):
     phosphorus = Column(Float, default=0.0)
     
     # 매칭 정보
-    matched_items = Column(Text)  # 벡터 검색으로 매칭된 음식들의 정보 
\ No newline at end of file
+    matched_items = Column(Text)  # 벡터 검색으로 매칭된 음식들의 정보 
+
+class DailyNutrition(Base):
+    """사용자 / 날짜별 영양소 합계 집계 테이블 (meals 를 쓰거나 지울 때 같은 트랜잭션에서 증분 갱신)"""
+    __tablename__ = "daily_nutrition"
+
+    user_id = Column(String(USER_ID_MAX_LENGTH), primary_key=True)
+    date = Column(Date, primary_key=True)
+    meal_count = Column(Integer, nullable=False, default=0)
+
+    kcal = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    carbs = Column(Float, nullable=False, default=0.0)
+    sodium = Column(Float, nullable=False, default=0.0)
+    potassium = Column(Float, nullable=False, default=0.0)
+    phosphorus = Column(Float, nullable=False, default=0.0)
+
+class DataVersion(Base):
+    """응답 캐시 무효화용 사용자별 데이터 버전. 그 사용자의 목표 / 식사를 쓰거나 지울 때 같은 트랜잭션에서 1 증가"""
+    __tablename__ = "data_version"
+
+    user_id = Column(String(USER_ID_MAX_LENGTH), primary_key=True)
+    # DB 를 새로 만들면 버전이 다시 0 부터 시작하므로, 이전 DB 의 ETag 와 겹치지 않도록 생성 시 임의 값 기록
+    epoch = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,66 @@
+# scripts/build_catalog.py
+# food_db.json / food_faiss.meta 를 메모리 맵 가능한 바이너리 컬럼 포맷으로 컴파일
+#
+# 실행 (프로젝트 루트에서, Docker 빌드 단계에서도 실행):
+#   python -m backend.scripts.build_catalog
+#   python -m backend.scripts.build_catalog --food-db path/to/food_db.json --out-dir path/to/food_catalog
+
+import argparse
+import json
+import os
+import time
+
+from backend.services.catalog_format import FaissMetaTable, split_faiss_meta
+from backend.services.food_store import (
+    FOOD_CATALOG_DIR, FOOD_DATA_DIR, FOOD_DB_JSON_PATH, FoodStore, load_food_records,
+)
+
+# vector_search 와 같은 경로 (모델/faiss 를 import 하지 않기 위해 직접 계산)
+FAISS_META_PATH = os.path.join(FOOD_DATA_DIR, "food_faiss.meta")
+FAISS_META_CATALOG_DIR = os.path.join(FOOD_DATA_DIR, "food_faiss_meta")
+
+
+def build_food_catalog(food_db_path, out_dir):
+    start = time.perf_counter()
+    records = load_food_records(food_db_path)
+    if not records:
+        print(f"❌ {food_db_path} 에서 레코드를 읽지 못해 음식 카탈로그를 건너뜁니다.")
+        return False
+    store = FoodStore.from_records(records)
+    store.save(out_dir, source_path=food_db_path)
+    print(f"✅ 음식 카탈로그: {len(store)}개 항목 → {out_dir} ({time.perf_counter() - start:.2f}s)")
+    return True
+
+
+def build_meta_catalog(meta_path, out_dir):
+    start = time.perf_counter()
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta_list, index_info = split_faiss_meta(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ {meta_path} 를 읽지 못해 FAISS 메타 카탈로그를 건너뜁니다. {e}")
+        return False
+    table = FaissMetaTable.from_meta_list(meta_list, index_info)
+    table.save(out_dir, source_path=meta_path)
+    print(f"✅ FAISS 메타 카탈로그: {len(table)}개 항목 (인덱스: {index_info['type']}) → {out_dir} ({time.perf_counter() - start:.2f}s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 카탈로그 / FAISS 메타 바이너리 컴파일")
+    parser.add_argument("--food-db", default=FOOD_DB_JSON_PATH)
+    parser.add_argument("--out-dir", default=FOOD_CATALOG_DIR)
+    parser.add_argument("--faiss-meta", default=FAISS_META_PATH)
+    parser.add_argument("--meta-out-dir", default=FAISS_META_CATALOG_DIR)
+    args = parser.parse_args()
+
+    ok_food = build_food_catalog(args.food_db, args.out_dir)
+    ok_meta = build_meta_catalog(args.faiss_meta, args.meta_out_dir)
+    if not (ok_food or ok_meta):
+        print("경고: 컴파일된 카탈로그가 없습니다. 서버는 JSON 파일을 직접 로드합니다.")
+    # 원본이 없거나 LFS 포인터인 경우에도 빌드(예: Docker)를 실패시키지 않는다
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
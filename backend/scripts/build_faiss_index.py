@@ -0,0 +1,306 @@
+# scripts/build_faiss_index.py
+# food_db.json 으로 food_faiss.index / food_faiss.meta 를 만들거나 갱신
+#
+#   build    food_db.json 레코드를 스트리밍으로 읽어 식품명을 배치 임베딩하고 인덱스 + 메타를 새로 생성
+#   update   기존 인덱스와 비교해 새로 생기거나 바뀐 레코드(식품명 + 영양소 해시)만 임베딩해 추가하고,
+#            사라지거나 바뀌기 전의 레코드는 인덱스에서 삭제 (메타에는 "deleted" 로 남겨 ID 를 유지)
+#   convert  인덱스에 저장된 벡터를 그대로 사용해 다른 종류의 인덱스로 변환 (임베딩 없음)
+#
+# 인덱스의 ID 는 메타 항목의 위치와 같다. 메타 파일에는 인덱스 종류와 파라미터, 빌드 ID(메타 항목 내용 해시)가
+# 함께 기록되며, 서버는 빌드 ID 를 쿼리 캐시 네임스페이스에 넣어 이전 인덱스의 캐시 스냅샷을 버린다.
+#
+# 실행 (프로젝트 루트에서):
+#   python -m backend.scripts.build_faiss_index build --batch-size 128 --threads 4
+#   python -m backend.scripts.build_faiss_index build --type hnsw_flat
+#   python -m backend.scripts.build_faiss_index update
+#   python -m backend.scripts.build_faiss_index convert --type ivf_pq --nlist 1024 --nprobe 32 --pq-m 96
+#
+# 기본 경로로 저장하면 FAISS 메타 카탈로그(backend/data/food_faiss_meta)도 다시 컴파일한다.
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict, deque
+
+import faiss
+import numpy as np
+
+from backend.scripts.build_catalog import FAISS_META_CATALOG_DIR, build_meta_catalog
+from backend.services import encoders
+from backend.services.catalog_format import FAISS_META_NUMERIC_FIELDS, dump_faiss_meta, split_faiss_meta
+from backend.services.food_store import FOOD_DB_JSON_PATH, NUTRIENT_COLUMNS, iter_food_records, safe_float
+from backend.services.index_factory import (
+    DEFAULT_INDEX_TYPE, INDEX_TYPES, add_vectors, build_index, create_index, export_vectors, remove_ids,
+    wrap_id_map,
+)
+from backend.services.vector_search import (
+    PREBUILT_FAISS_INDEX_PATH, PREBUILT_FAISS_META_PATH, SENTENCE_TRANSFORMER_MODEL,
+)
+
+DEFAULT_BATCH_SIZE = 64
+# encode 한 번에 넘기는 이름 수 (진행 상황 출력 단위). 모델 내부에서는 batch_size 씩 나눠 처리
+CHUNK_BATCHES = 16
+
+
+def meta_item(record):
+    """food_db.json 레코드 → 메타 항목 {"name", "kcal", "protein", "fat", "carbs"}"""
+    item = {"name": str(record.get("식품명") or "")}
+    for field in FAISS_META_NUMERIC_FIELDS:
+        item[field] = safe_float(record.get(NUTRIENT_COLUMNS[field], 0))
+    return item
+
+
+def item_hash(item):
+    """식품명 + 영양소 값 해시 (증분 갱신 시 변경 감지용)"""
+    key = json.dumps([item["name"]] + [float(item.get(f) or 0.0) for f in FAISS_META_NUMERIC_FIELDS])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def build_id(items, index_info):
+    """메타 항목(삭제 표시 포함) + 인덱스 종류 / 파라미터 해시
+
+    update 는 바뀐 항목을 삭제 표시하고 새 ID 로 다시 추가하므로 벡터 수(ntotal)가 그대로일 수 있다.
+    항목 내용으로 ID 를 만들면 어떤 항목이 바뀌어도 값이 달라지고, 내용이 같으면 재빌드해도 같은 값이 된다.
+    """
+    digest = hashlib.sha1(json.dumps([index_info["type"], index_info["params"]], sort_keys=True).encode("utf-8"))
+    for item in items:
+        digest.update(item_hash(item).encode("ascii"))
+        digest.update(b"d" if item.get("deleted") else b"-")
+    return digest.hexdigest()[:16]
+
+
+def iter_meta_items(food_db_path):
+    for record in iter_food_records(food_db_path):
+        item = meta_item(record)
+        if item["name"].strip():
+            yield item
+
+
+def load_encoder(model_name, threads, backend="torch"):
+    if threads:
+        faiss.omp_set_num_threads(threads)
+    return encoders.load_encoder(model_name, backend=backend, threads=threads or None)
+
+
+def encode_names(model, names, batch_size):
+    embeddings = np.ascontiguousarray(model.encode(names, batch_size=batch_size), dtype="float32")
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
+
+def encode_chunks(model, items, batch_size):
+    """항목 이터러블을 청크 단위로 임베딩하여 (청크 항목 리스트, 벡터) 를 yield. 진행 상황 출력"""
+    chunk_size = batch_size * CHUNK_BATCHES
+    start = time.perf_counter()
+    done = 0
+    chunk = []
+
+    def flush():
+        nonlocal done
+        vectors = encode_names(model, [item["name"] for item in chunk], batch_size)
+        done += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"  임베딩 {done}개 ({done / elapsed:.0f}개/s)")
+        return vectors
+
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk, flush()
+            chunk = []
+    if chunk:
+        yield chunk, flush()
+
+
+def read_existing(index_path, meta_path):
+    index = faiss.read_index(index_path)
+    with open(meta_path, "r", encoding="utf-8") as f:
+        items, index_info = split_faiss_meta(json.load(f))
+    return index, items, index_info
+
+
+def write_outputs(index, items, index_info, index_path, meta_path, compile_catalog):
+    index_info["build_id"] = build_id(items, index_info)
+    # 인덱스를 먼저 쓰고 메타를 나중에 교체 (메타의 종류 정보가 항상 실제 인덱스를 가리키도록)
+    faiss.write_index(index, f"{index_path}.tmp")
+    os.replace(f"{index_path}.tmp", index_path)
+    dump_faiss_meta(items, index_info, meta_path)
+    print(f"✅ 인덱스 저장: {index_path} (벡터 {index.ntotal}개, {index_info['type']}, {index_info['params']}, "
+          f"빌드 ID {index_info['build_id']})")
+    print(f"✅ 메타 저장: {meta_path} (항목 {len(items)}개)")
+    if compile_catalog:
+        build_meta_catalog(meta_path, FAISS_META_CATALOG_DIR)
+
+
+def index_overrides(args):
+    return {
+        "nlist": args.nlist, "nprobe": args.nprobe, "hnsw_m": args.hnsw_m, "ef_construction": args.ef_construction,
+        "ef_search": args.ef_search, "pq_m": args.pq_m, "pq_nbits": args.pq_nbits,
+    }
+
+
+def cmd_build(args):
+    model = load_encoder(args.model, args.threads, args.backend)
+    dim = model.dimension
+    start = time.perf_counter()
+    items = []
+    print(f"{args.food_db} 전체 빌드 시작 (batch_size={args.batch_size}, threads={args.threads or '기본'})")
+    if args.type == "flat":
+        # 정확 검색 인덱스는 학습이 필요 없으므로 임베딩하는 대로 바로 추가 (벡터 전체를 따로 모으지 않음)
+        index = wrap_id_map(create_index("flat", dim, {}))
+        for chunk, vectors in encode_chunks(model, iter_meta_items(args.food_db), args.batch_size):
+            add_vectors(index, vectors, np.arange(len(items), len(items) + len(chunk)))
+            items.extend(chunk)
+        index_info = {"type": "flat", "params": {}, "id_map": True}
+    else:
+        # ANN 인덱스는 전체 벡터로 학습해야 하므로 모은 뒤 한 번에 빌드
+        parts = []
+        for chunk, vectors in encode_chunks(model, iter_meta_items(args.food_db), args.batch_size):
+            parts.append(vectors)
+            items.extend(chunk)
+        if not items:
+            print(f"❌ {args.food_db} 에서 레코드를 읽지 못했습니다.")
+            return 1
+        index, index_info = build_index(
+            np.concatenate(parts), args.type, ids=np.arange(len(items)), **index_overrides(args)
+        )
+    if not items:
+        print(f"❌ {args.food_db} 에서 레코드를 읽지 못했습니다.")
+        return 1
+    print(f"빌드 완료: {len(items)}개 ({time.perf_counter() - start:.1f}s)")
+    write_outputs(index, items, index_info, args.out_index, args.out_meta, args.compile_catalog)
+    return 0
+
+
+def cmd_update(args):
+    start = time.perf_counter()
+    index, items, index_info = read_existing(args.index, args.meta)
+    if not index_info.get("id_map"):
+        # 기존(위치 기반) 인덱스는 ID = 위치로 한 번 변환. IVF 는 이미 0..n-1 ID 를 저장하고 있음
+        print("기존 인덱스에 ID 매핑을 추가합니다 (최초 1회).")
+        if index_info["type"] not in ("ivf_flat", "ivf_pq", "ivf_sq8"):
+            ids, vectors = export_vectors(index)
+            index, built_info = build_index(vectors, index_info["type"], ids=ids, **index_info["params"])
+            index_info["params"] = built_info["params"]
+        index_info["id_map"] = True
+
+    # 기존 항목: 해시 → 살아 있는 ID 목록 (같은 이름/영양소가 여러 번 있어도 개수만큼 대응)
+    existing = defaultdict(deque)
+    for item_id, item in enumerate(items):
+        if not item.get("deleted"):
+            existing[item_hash(item)].append(item_id)
+
+    unchanged = 0
+    to_add = []
+    for item in iter_meta_items(args.food_db):
+        ids = existing.get(item_hash(item))
+        if ids:
+            ids.popleft()
+            unchanged += 1
+        else:
+            to_add.append(item)
+    to_remove = [item_id for ids in existing.values() for item_id in ids]
+    print(f"변경 없음 {unchanged}개, 추가(신규/변경) {len(to_add)}개, 삭제(제거/변경 전) {len(to_remove)}개")
+    if not to_add and not to_remove:
+        print("✅ 변경 사항이 없습니다.")
+        return 0
+
+    try:
+        remove_ids(index, to_remove)
+    except RuntimeError as e:
+        print(f"❌ {index_info['type']} 인덱스는 벡터 삭제를 지원하지 않습니다. build 로 전체 재빌드하세요. ({e})")
+        return 1
+    for item_id in to_remove:
+        items[item_id] = {**items[item_id], "deleted": True}
+
+    if to_add:
+        model = load_encoder(args.model, args.threads, args.backend)
+        for chunk, vectors in encode_chunks(model, to_add, args.batch_size):
+            add_vectors(index, vectors, np.arange(len(items), len(items) + len(chunk)))
+            items.extend(chunk)
+    print(f"갱신 완료 ({time.perf_counter() - start:.1f}s)")
+    write_outputs(index, items, index_info, args.out_index or args.index, args.out_meta or args.meta,
+                  args.compile_catalog)
+    return 0
+
+
+def cmd_convert(args):
+    index, items, source_info = read_existing(args.index, args.meta)
+    if source_info["type"] in ("ivf_pq", "ivf_sq8"):
+        print(f"경고: 원본 인덱스({source_info['type']})는 양자화되어 있어 복원된 벡터가 근사값입니다.")
+    ids, vectors = export_vectors(index)
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    print(f"원본 벡터 {vectors.shape[0]}개 (d={vectors.shape[1]}) → {args.type} 빌드 중...")
+    start = time.perf_counter()
+    index, index_info = build_index(
+        vectors, args.type, ids=ids if source_info.get("id_map") else None, **index_overrides(args)
+    )
+    print(f"변환 완료 ({time.perf_counter() - start:.1f}s)")
+    write_outputs(index, items, index_info, args.out_index or args.index, args.out_meta or args.meta,
+                  args.compile_catalog)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 빌드 / 증분 갱신 / 종류 변환")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("--out-index", help="저장할 인덱스 경로 (update/convert 는 기본값이 원본 경로)")
+        p.add_argument("--out-meta", help="저장할 메타 경로 (update/convert 는 기본값이 원본 경로)")
+        p.add_argument("--no-catalog", dest="compile_catalog", action="store_false",
+                       help="FAISS 메타 카탈로그를 다시 컴파일하지 않음")
+
+    def encoding(p):
+        p.add_argument("--food-db", default=FOOD_DB_JSON_PATH)
+        p.add_argument("--model", default=SENTENCE_TRANSFORMER_MODEL)
+        p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        p.add_argument("--threads", type=int, default=0, help="encoder / faiss 스레드 수 (0 이면 기본값)")
+        p.add_argument("--backend", choices=encoders.ENCODER_BACKENDS, default="torch",
+                       help="임베딩 encoder 백엔드 (검색 시 ENCODER_BACKEND 와 같은 백엔드 권장)")
+
+    def index_options(p):
+        p.add_argument("--type", choices=INDEX_TYPES, default=DEFAULT_INDEX_TYPE)
+        p.add_argument("--nlist", type=int)
+        p.add_argument("--nprobe", type=int)
+        p.add_argument("--hnsw-m", type=int)
+        p.add_argument("--ef-construction", type=int)
+        p.add_argument("--ef-search", type=int)
+        p.add_argument("--pq-m", type=int)
+        p.add_argument("--pq-nbits", type=int)
+
+    p_build = sub.add_parser("build", help="food_db.json 으로 인덱스 + 메타 전체 빌드")
+    encoding(p_build)
+    index_options(p_build)
+    common(p_build)
+    p_build.set_defaults(func=cmd_build)
+
+    p_update = sub.add_parser("update", help="신규/변경 레코드만 임베딩하여 기존 인덱스 갱신")
+    encoding(p_update)
+    p_update.add_argument("--index", default=PREBUILT_FAISS_INDEX_PATH)
+    p_update.add_argument("--meta", default=PREBUILT_FAISS_META_PATH)
+    common(p_update)
+    p_update.set_defaults(func=cmd_update)
+
+    p_convert = sub.add_parser("convert", help="저장된 벡터로 다른 종류의 인덱스 생성")
+    p_convert.add_argument("--index", default=PREBUILT_FAISS_INDEX_PATH)
+    p_convert.add_argument("--meta", default=PREBUILT_FAISS_META_PATH)
+    index_options(p_convert)
+    common(p_convert)
+    p_convert.set_defaults(func=cmd_convert)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        args.out_index = args.out_index or PREBUILT_FAISS_INDEX_PATH
+        args.out_meta = args.out_meta or PREBUILT_FAISS_META_PATH
+    # 기본 경로가 아닌 곳에 저장할 때는 서버가 쓰는 메타 카탈로그를 건드리지 않는다
+    out_meta = args.out_meta or getattr(args, "meta", None)
+    if os.path.abspath(out_meta) != os.path.abspath(PREBUILT_FAISS_META_PATH):
+        args.compile_catalog = False
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+# scripts/export_onnx_encoder.py
+# 임베딩 모델을 ONNX (+ 동적 int8 양자화) 로 내보내고, torch 결과와의 패리티를 검사
+#
+#   export   sentence_transformers 모델의 transformer 를 ONNX 로 내보내고 (풀링은 서버에서 NumPy 로 계산)
+#            동적 int8 양자화 버전과 tokenizer.json / encoder.json 을 함께 저장
+#   check    FAISS 메타의 식품명(표본)을 torch 와 ONNX 백엔드로 각각 임베딩해
+#            코사인 유사도(드리프트)와 FAISS 인덱스 top-1 일치율을 비교. 기준 미달이면 종료 코드 1
+#
+# 실행 (프로젝트 루트에서, export 에는 torch / sentence-transformers / onnx / onnxruntime 필요):
+#   python -m backend.scripts.export_onnx_encoder export
+#   python -m backend.scripts.export_onnx_encoder check --sample 5000
+#   ENCODER_BACKEND=onnx-int8 uvicorn backend.main:app
+
+import argparse
+import json
+import os
+import random
+import time
+
+import faiss
+import numpy as np
+
+from backend.services import encoders
+from backend.services.catalog_format import split_faiss_meta
+from backend.services.index_factory import configure_search, detect_index_type, search_params_from_env
+from backend.services.vector_search import (
+    PREBUILT_FAISS_INDEX_PATH, PREBUILT_FAISS_META_PATH, SENTENCE_TRANSFORMER_MODEL,
+)
+
+DEFAULT_OPSET = 17
+DEFAULT_SAMPLE = 2000
+# sentence_transformers 2.x/3.x 풀링 설정 키 → 모드 이름
+_LEGACY_POOLING_KEYS = {
+    "pooling_mode_mean_tokens": "mean",
+    "pooling_mode_cls_token": "cls",
+    "pooling_mode_max_tokens": "max",
+    "pooling_mode_mean_sqrt_len_tokens": "mean_sqrt_len",
+    "pooling_mode_weightedmean_tokens": "weightedmean",
+    "pooling_mode_lasttoken": "lasttoken",
+}
+
+
+def pooling_mode(pooling):
+    config = pooling.get_config_dict()
+    mode = config.get("pooling_mode")
+    if mode is None:
+        modes = [name for key, name in _LEGACY_POOLING_KEYS.items() if config.get(key)]
+    else:
+        modes = [mode] if isinstance(mode, str) else list(mode)
+    if modes not in (["mean"], ["cls"]):
+        raise ValueError(f"mean / cls 풀링 모델만 내보낼 수 있습니다. (풀링: {modes})")
+    return modes[0]
+
+
+def export(model_name, out_dir, opset=DEFAULT_OPSET, quantize=True):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    start = time.perf_counter()
+    model = SentenceTransformer(model_name, device="cpu")
+    modules = list(model)
+    kinds = [type(module).__name__ for module in modules]
+    if kinds[:2] != ["Transformer", "Pooling"] or any(kind != "Normalize" for kind in kinds[2:]):
+        raise ValueError(f"Transformer + Pooling (+ Normalize) 구성만 지원합니다. (모듈: {kinds})")
+    transformer, pooling = modules[0], modules[1]
+    tokenizer = transformer.tokenizer
+    if not getattr(tokenizer, "is_fast", False):
+        raise ValueError("fast tokenizer(tokenizer.json) 가 있는 모델만 내보낼 수 있습니다.")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids")
+                   if name in tokenizer.model_input_names]
+
+    class TransformerOnly(torch.nn.Module):
+        """입력 텐서 → last_hidden_state (풀링 제외)"""
+
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *tensors):
+            return self.auto_model(**dict(zip(input_names, tensors)), return_dict=False)[0]
+
+    os.makedirs(out_dir, exist_ok=True)
+    sample = tokenizer(["현미밥 한 공기", "닭가슴살 샐러드 200g"], padding=True, return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in [*input_names, "last_hidden_state"]}
+    model_path = os.path.join(out_dir, encoders.ONNX_MODEL_FILES["onnx"])
+    wrapper = TransformerOnly(transformer.auto_model).eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper, tuple(sample[name] for name in input_names), model_path,
+            input_names=input_names, output_names=["last_hidden_state"], dynamic_axes=dynamic_axes,
+            opset_version=opset, do_constant_folding=True, dynamo=False,
+        )
+    tokenizer.backend_tokenizer.save(os.path.join(out_dir, encoders.ONNX_TOKENIZER_FILE))
+    config = {
+        "model_name": model_name,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "max_seq_length": transformer.max_seq_length,
+        "pooling": pooling_mode(pooling),
+        "inputs": input_names,
+        "pad_id": tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0,
+        "opset": opset,
+    }
+    with open(os.path.join(out_dir, encoders.ONNX_CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    print(f"✅ ONNX 모델 저장: {model_path} ({os.path.getsize(model_path) / 2**20:.1f}MB, "
+          f"{time.perf_counter() - start:.1f}s)")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = os.path.join(out_dir, encoders.ONNX_MODEL_FILES["onnx-int8"])
+        # MatMul 가중치만 채널별로 양자화 (임베딩 테이블 / LayerNorm 은 fp32 유지).
+        # reduce_range: VNNI 가 없는 x86 CPU 의 u8×s8 누산 포화를 피함 (없으면 top-1 이 크게 흔들림)
+        quantize_dynamic(model_path, int8_path, weight_type=QuantType.QInt8, op_types_to_quantize=["MatMul"],
+                         per_channel=True, reduce_range=True)
+        print(f"✅ int8 양자화 모델 저장: {int8_path} ({os.path.getsize(int8_path) / 2**20:.1f}MB)")
+
+
+def sample_names(meta_path, sample, seed=0):
+    with open(meta_path, "r", encoding="utf-8") as f:
+        items, _ = split_faiss_meta(json.load(f))
+    names = list(dict.fromkeys(item["name"] for item in items if not item.get("deleted") and item.get("name")))
+    if sample and len(names) > sample:
+        names = random.Random(seed).sample(names, sample)
+    return names
+
+
+def normalized(vectors):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def parity(reference, candidate, index):
+    """torch 기준 벡터 대비 코사인 유사도 통계와 FAISS top-1 일치율"""
+    cosine = np.einsum("ij,ij->i", reference, candidate)
+    _, expected = index.search(reference, 1)
+    _, found = index.search(candidate, 1)
+    return {
+        "min_cosine": float(cosine.min()),
+        "p1_cosine": float(np.percentile(cosine, 1)),
+        "mean_cosine": float(cosine.mean()),
+        "top1": float(np.mean(expected[:, 0] == found[:, 0])),
+    }
+
+
+def check(args):
+    names = sample_names(args.meta, args.sample)
+    index = faiss.read_index(args.index)
+    configure_search(index, search_params_from_env({"type": detect_index_type(index), "params": {}}))
+    print(f"식품명 {len(names)}개, 인덱스 {detect_index_type(index)} ({index.ntotal}개 벡터)")
+
+    reference = normalized(encoders.load_encoder(args.model, backend="torch").encode(names, args.batch_size))
+    failed = False
+    for backend in args.backends:
+        encoder = encoders.load_encoder(args.model, backend=backend, onnx_dir=args.onnx_dir)
+        result = parity(reference, normalized(encoder.encode(names, args.batch_size)), index)
+        thresholds = encoders.PARITY_THRESHOLDS[backend]
+        min_cosine = args.min_cosine if args.min_cosine is not None else thresholds["min_cosine"]
+        min_top1 = args.min_top1 if args.min_top1 is not None else thresholds["min_top1"]
+        ok = result["min_cosine"] >= min_cosine and result["top1"] >= min_top1
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} {backend:<9} 코사인 min {result['min_cosine']:.5f} / p1 {result['p1_cosine']:.5f} / "
+              f"평균 {result['mean_cosine']:.5f} (기준 ≥ {min_cosine}), "
+              f"top-1 일치 {result['top1'] * 100:.2f}% (기준 ≥ {min_top1 * 100:.0f}%)")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 모델 ONNX 내보내기 / 패리티 검사")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="ONNX + int8 양자화 모델 생성")
+    p.add_argument("--model", default=SENTENCE_TRANSFORMER_MODEL)
+    p.add_argument("--out-dir", default=encoders.DEFAULT_ONNX_DIR)
+    p.add_argument("--opset", type=int, default=DEFAULT_OPSET)
+    p.add_argument("--no-quantize", dest="quantize", action="store_false", help="int8 양자화 모델을 만들지 않음")
+
+    p = sub.add_parser("check", help="torch 대비 코사인 드리프트 / top-1 일치율 검사")
+    p.add_argument("--model", default=SENTENCE_TRANSFORMER_MODEL)
+    p.add_argument("--onnx-dir", default=encoders.DEFAULT_ONNX_DIR)
+    p.add_argument("--backends", nargs="+", choices=encoders.ONNX_MODEL_FILES, default=list(encoders.ONNX_MODEL_FILES))
+    p.add_argument("--index", default=PREBUILT_FAISS_INDEX_PATH)
+    p.add_argument("--meta", default=PREBUILT_FAISS_META_PATH)
+    p.add_argument("--sample", type=int, default=DEFAULT_SAMPLE, help="검사할 식품명 수 (0 이면 전체)")
+    p.add_argument("--batch-size", type=int, default=encoders.DEFAULT_ENCODE_BATCH_SIZE)
+    p.add_argument("--min-cosine", type=float, help="최소 코사인 유사도 (기본: 백엔드별 PARITY_THRESHOLDS)")
+    p.add_argument("--min-top1", type=float, help="최소 top-1 일치율 0~1 (기본: 백엔드별 PARITY_THRESHOLDS)")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args.model, args.out_dir, args.opset, args.quantize)
+        return 0
+    return check(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+# scripts/migrate_multi_user.py
+# 단일 사용자 DB 를 다중 사용자 스키마(goals / meals 의 user_id, (user_id, date) 인덱스)로 이전
+# 서버 시작 시에도 자동으로 적용되지만, 큰 DB 는 배포 전에 이 스크립트로 미리 실행하고 집계까지 다시 채워 둔다.
+#
+# 실행 (프로젝트 루트에서, DATABASE_URL 환경 변수의 DB 대상):
+#   python -m backend.scripts.migrate_multi_user --dry-run          # 적용할 단계만 출력
+#   python -m backend.scripts.migrate_multi_user --user-id alice    # 기존 데이터를 alice 사용자 소유로 이전
+
+import argparse
+import time
+
+from backend.database.db import SessionLocal, engine
+from backend.database.migrations import migrate_multi_user, pending_steps
+from backend.models.models import DEFAULT_USER_ID
+from backend.services import daily_rollup, response_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 사용자 스키마 이전")
+    parser.add_argument("--user-id", default=DEFAULT_USER_ID,
+                        help=f"기존 목표 / 식사를 소유할 사용자 (기본 {DEFAULT_USER_ID}, X-User-Id 헤더가 없는 요청의 사용자)")
+    parser.add_argument("--dry-run", action="store_true", help="적용하지 않고 남은 단계만 출력")
+    args = parser.parse_args()
+
+    steps = pending_steps(engine)
+    if not steps:
+        print("✅ 이미 다중 사용자 스키마입니다.")
+        return 0
+    for step in steps:
+        print(f"  - {step}")
+    if args.dry_run:
+        return 0
+
+    start = time.perf_counter()
+    migrate_multi_user(engine, user_id=args.user_id)
+    print(f"✅ 스키마 이전 완료 ({time.perf_counter() - start:.2f}s)")
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = daily_rollup.ensure_backfilled(db)
+        response_cache.bump_all_versions(db)
+        db.commit()
+        print(f"✅ 사용자 / 날짜별 영양소 집계 {rows}행 생성 ({time.perf_counter() - start:.2f}s)")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
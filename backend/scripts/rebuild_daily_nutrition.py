@@ -0,0 +1,48 @@
+# scripts/rebuild_daily_nutrition.py
+# 사용자 / 날짜별 영양소 집계 테이블(daily_nutrition)을 meals 에서 다시 계산하거나 일관성만 검사
+#
+# 실행 (프로젝트 루트에서, DATABASE_URL 환경 변수의 DB 대상):
+#   python -m backend.scripts.rebuild_daily_nutrition           # 전체 재계산
+#   python -m backend.scripts.rebuild_daily_nutrition --check   # 검사만 (불일치가 있으면 종료 코드 1)
+
+import argparse
+import time
+
+from backend.database.db import Base, SessionLocal, engine
+from backend.database.migrations import migrate_multi_user
+from backend.services import daily_rollup, response_cache
+
+MAX_PRINTED_MISMATCHES = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜별 영양소 집계 재계산 / 일관성 검사")
+    parser.add_argument("--check", action="store_true", help="재계산하지 않고 meals 와 비교만 함")
+    args = parser.parse_args()
+
+    migrate_multi_user(engine)  # 이전 전의 DB 파일이면 user_id 컬럼부터 추가
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        if args.check:
+            mismatches = daily_rollup.check(db)
+            for mismatch in mismatches[:MAX_PRINTED_MISMATCHES]:
+                print(f"  {mismatch['user_id']} {mismatch['date']}: 기대 {mismatch['expected']} / 저장 {mismatch['actual']}")
+            if mismatches:
+                print(f"❌ 불일치 {len(mismatches)}건 ({time.perf_counter() - start:.2f}s). "
+                      f"--check 없이 실행하면 다시 계산합니다.")
+                return 1
+            print(f"✅ 집계가 meals 와 일치합니다. ({time.perf_counter() - start:.2f}s)")
+            return 0
+        rows = daily_rollup.rebuild(db)
+        response_cache.bump_all_versions(db)  # 실행 중인 서버의 /summary 캐시도 무효화
+        db.commit()
+        print(f"✅ 사용자 / 날짜별 영양소 집계 {rows}행 재계산 완료 ({time.perf_counter() - start:.2f}s)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
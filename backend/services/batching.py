@@ -0,0 +1,112 @@
+# services/batching.py
+# 동시 요청의 encode + index.search 를 짧은 시간 동안 모아 한 번에 처리하는 마이크로 배칭 스케줄러
+#
+# 호출 스레드(추론 풀 워커 등)는 submit() 에서 결과를 기다리고,
+# 전용 배치 스레드가 최대 max_wait_ms 동안 또는 max_batch 개가 찰 때까지 요청을 모아
+# process_batch(요청 목록) 를 한 번 호출한 뒤 결과를 각 호출자에게 돌려준다.
+#
+# 호출 스레드가 결과를 기다리며 막혀 있으므로 한 배치에 모일 수 있는 요청 수는 호출하는 풀의 워커 수를 넘지 못한다.
+# 그래서 배칭을 켜면 추론 풀 기본 크기를 max_batch 이상으로 잡고(inference.py),
+# 풀이 max_batch 보다 작으면 기본 대기 시간을 0 으로 두어 이미 대기 중인 요청만 합친다 (기다려도 더 모이지 않음).
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_MAX_BATCH = 32
+DEFAULT_MAX_WAIT_MS = 2.0
+
+
+def batching_enabled():
+    return os.environ.get("ENCODE_BATCHING", "1") != "0"
+
+
+def max_batch_from_env():
+    return int(os.environ.get("ENCODE_BATCH_MAX_SIZE", DEFAULT_MAX_BATCH))
+
+
+def default_max_wait_ms(workers, max_batch):
+    """호출 풀의 워커 수가 배치 크기보다 작으면 0, 아니면 DEFAULT_MAX_WAIT_MS"""
+    if workers is not None and workers < max_batch:
+        return 0.0
+    return DEFAULT_MAX_WAIT_MS
+
+
+class MicroBatcher:
+    def __init__(self, process_batch, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 size_of=len, name="micro-batcher"):
+        """process_batch(list[요청]) -> list[결과] (요청과 같은 순서)
+        size_of(요청) 으로 요청이 차지하는 배치 크기(쿼리 수)를 계산한다."""
+        self.process_batch = process_batch
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.size_of = size_of
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.items = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls, process_batch, workers=None, **kwargs):
+        """workers: submit 을 호출하는 풀의 워커 수 (ENCODE_BATCH_MAX_WAIT_MS 가 없을 때 기본 대기 시간 결정)"""
+        max_batch = max_batch_from_env()
+        return cls(
+            process_batch,
+            max_batch=max_batch,
+            max_wait_ms=float(os.environ.get("ENCODE_BATCH_MAX_WAIT_MS", default_max_wait_ms(workers, max_batch))),
+            **kwargs,
+        )
+
+    def submit(self, request):
+        """요청을 대기열에 넣고 배치 처리 결과를 기다려 반환 (예외도 그대로 전달)"""
+        future = Future()
+        self._queue.put((request, future))
+        return future.result()
+
+    def _collect(self):
+        first = self._queue.get()
+        pending = [first]
+        size = self.size_of(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += self.size_of(item[0])
+        return pending, size
+
+    def _run(self):
+        while True:
+            pending, size = self._collect()
+            requests = [request for request, _ in pending]
+            try:
+                results = self.process_batch(requests)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(pending, results):
+                    future.set_result(result)
+            with self._lock:
+                self.batches += 1
+                self.requests += len(pending)
+                self.items += size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self.batches,
+                "requests": self.requests,
+                "items": self.items,
+                "avg_batch_items": (self.items / self.batches) if self.batches else 0.0,
+            }
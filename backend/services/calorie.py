@@ -1,133 +1,166 @@
 # services/calorie.py
 
-import json
-import os
+import logging
 import re
+
+import numpy as np
+
+from backend.services import metrics
+from backend.services.food_matcher import TIER_LEXICAL, TIER_VECTOR, get_food_matcher
 from backend.services.vector_search import get_vector_db
 
-def safe_float(val):
-    try:
-        return float(val.strip()) if isinstance(val, str) else float(val)
-    except:
-        return 0.0
-    
-# --- food_db.json 경로 설정 ---
-# calorie.py 파일의 현재 위치를 기준으로 backend/data/food_db.json 경로 설정
-_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
-_BACKEND_DIR_FROM_SERVICE = os.path.dirname(_SERVICE_DIR)
-FOOD_DB_JSON_PATH = os.path.join(_BACKEND_DIR_FROM_SERVICE, "data", "food_db.json")
-
-# JSON 로딩
-food_items = [] # 오류 발생 시 빈 리스트로 사용하기 위해 초기화
-try:
-    with open(FOOD_DB_JSON_PATH, "r", encoding="utf-8") as f: # 수정된 경로 사용
-        food_data_loaded = json.load(f)
-    # food_db.json 파일이 최상위에 "records" 키를 가지고 그 값이 리스트인 경우를 처리
-    if isinstance(food_data_loaded, dict) and "records" in food_data_loaded:
-        food_items = food_data_loaded["records"]
-    # food_db.json 파일 자체가 음식 레코드 리스트인 경우도 처리
-    elif isinstance(food_data_loaded, list):
-        food_items = food_data_loaded
-    else:
-        print(f"경고: {FOOD_DB_JSON_PATH} 파일의 형식이 예상과 다릅니다. 'records' 키를 찾을 수 없거나 리스트 형식이 아닙니다.")
-        # food_items는 이미 빈 리스트로 초기화되어 있음
-except FileNotFoundError:
-    print(f"치명적 오류: 데이터 파일 '{FOOD_DB_JSON_PATH}'을(를) 찾을 수 없습니다. calorie.py가 정상 작동하지 않을 수 있습니다.")
-    # food_items는 이미 빈 리스트로 초기화되어 있음
-except json.JSONDecodeError:
-    print(f"치명적 오류: 데이터 파일 '{FOOD_DB_JSON_PATH}'이(가) 올바른 JSON 형식이 아닙니다.")
-    # food_items는 이미 빈 리스트로 초기화되어 있음
-
-# ✅ 필요한 값만 딕셔너리로 정리
-food_dict = {
-    item["식품명"]: {
-        "kcal": safe_float(item.get("에너지(kcal)", 0)),
-        "protein": safe_float(item.get("단백질(g)", 0)),
-        "fat": safe_float(item.get("지방(g)", 0)),
-        "carbs": safe_float(item.get("탄수화물(g)", 0)),
-        "sodium": safe_float(item.get("나트륨(mg)", 0)),
-        "potassium": safe_float(item.get("칼륨(mg)", 0)),
-        "phosphorus": safe_float(item.get("인(mg)", 0))
-    }
-    for item in food_items
+logger = logging.getLogger(__name__)
+
+# 음식 영양소 데이터는 backend.services.food_store.get_food_store() 에서 한 번만 로드하여 공유한다.
+
+# 음식 데이터의 영양소 값은 100g(ml) 당 함량으로 가정한다.
+BASE_GRAMS = 100.0
+
+# 단위 → 그램 환산표 (액체는 밀도 1 로 가정, 개수 단위는 일반적인 1회 분량 기준의 근사값)
+UNIT_GRAMS = {
+    "kg": 1000.0,
+    "mg": 0.001,
+    "g": 1.0,
+    "ml": 1.0,
+    "l": 1000.0,
+    "공기": 210.0,   # 밥 1공기
+    "그릇": 250.0,   # 국/찌개 1그릇
+    "접시": 150.0,
+    "인분": 200.0,
+    "컵": 200.0,
+    "큰술": 15.0,
+    "작은술": 5.0,
+    "조각": 50.0,
+    "장": 30.0,      # 식빵 1장
+    "알": 50.0,      # 달걀 1알
+    "모": 300.0,     # 두부 1모
+    "개": BASE_GRAMS,  # 음식마다 무게가 달라 기준량 1회분으로 간주
 }
 
+# 수량 토큰: (숫자 | 분수 | '반') + (선택) 공백 + 단위. 긴 단위부터 시도 (예: 작은술 / 큰술, kg / g)
+_UNIT_PATTERN = "|".join(re.escape(unit) for unit in sorted(UNIT_GRAMS, key=len, reverse=True))
+_QUANTITY_RE = re.compile(
+    rf"(?:(?P<number>\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?)|(?<!\S)(?P<half>반))\s*(?P<unit>{_UNIT_PATTERN})(?![A-Za-z])",
+    re.IGNORECASE,
+)
+
+
+def tokenize_food_item(item_text):
+    """음식 아이템 문자열을 한 번의 정규식 스캔으로 (음식명, 양, 단위) 로 분리
+
+    예: "닭가슴살 200g" -> ("닭가슴살", 200.0, "g"), "현미밥 1공기" -> ("현미밥", 1.0, "공기")
+    수량이 없으면 양과 단위는 None. 수량이 여러 개면 첫 번째를 사용하고 나머지는 이름에서만 제거한다.
+    """
+    amount, unit = None, None
+    parts = []
+    last = 0
+    for match in _QUANTITY_RE.finditer(item_text):
+        parts.append(item_text[last:match.start()])
+        last = match.end()
+        if unit is None:
+            number = match.group("number")
+            if number is None:
+                amount = 0.5
+            elif "/" in number:
+                numerator, denominator = number.split("/")
+                amount = float(numerator) / float(denominator) if float(denominator) else None
+            else:
+                amount = float(number)
+            unit = match.group("unit").lower() if amount is not None else None
+    parts.append(item_text[last:])
+    food_name = " ".join("".join(parts).split())
+    return food_name, amount, unit
+
+
 def parse_food_item(item_text):
-    """음식 아이템에서 음식명과 양을 파싱"""
-    # 예: "현미밥 1공기", "닭가슴살 100g" 등
-    # 숫자와 단위를 제거하여 순수 음식명만 추출
-    
-    # 일반적인 패턴들 제거
-    patterns = [
-        r'\d+\.?\d*\s*공기',
-        r'\d+\.?\d*\s*개',
-        r'\d+\.?\d*\s*g',
-        r'\d+\.?\d*\s*ml',
-        r'\d+\.?\d*\s*컵',
-        r'\d+\.?\d*\s*큰술',
-        r'\d+\.?\d*\s*작은술',
-        r'\d+\.?\d*\s*조각',
-        r'\d+\.?\d*\s*장',
-        r'\d+\.?\d*\s*알',
-        r'\s+$'  # 끝 공백
-    ]
-    
-    food_name = item_text.strip()
-    for pattern in patterns:
-        food_name = re.sub(pattern, '', food_name).strip()
-    
-    return food_name
+    """음식 아이템에서 음식명만 추출 (예: "현미밥 1공기" -> "현미밥")"""
+    return tokenize_food_item(item_text)[0]
+
+
+def portion_factor(amount, unit):
+    """기준량(100g) 대비 섭취량 배수. 수량이 없으면 기준량 1회분(1.0)"""
+    if amount is None or unit is None:
+        return 1.0
+    return amount * UNIT_GRAMS[unit] / BASE_GRAMS
+
+
+NUTRIENT_KEYS = ["kcal", "protein", "fat", "carbs", "sodium", "potassium", "phosphorus"]
+
+
+def match_items(items, vector_search=None):
+    """항목 문자열 목록을 매칭하여 (항목 x 영양소 행렬, 항목별 매칭 정보) 반환
+
+    행렬은 섭취량 배수를 곱한 값이며 매칭 실패 항목의 행은 0, 매칭 정보는 None 이다.
+    vector_search 를 주지 않으면 벡터 DB 의 find_best_matches 를 한 번 호출한다.
+    """
+    # 음식명 / 수량 파싱 후 카탈로그에서 바로 찾을 수 있는 항목은 모델 없이 매칭하고,
+    # 나머지만 배치 벡터 검색으로 처리
+    with metrics.stage_timer("parse"):
+        parsed = [tokenize_food_item(item) for item in items]
+    food_names = [food_name for food_name, _, _ in parsed]
+    matcher = get_food_matcher()
+    matches = matcher.match_many(
+        food_names, vector_search=vector_search or (lambda names: get_vector_db().find_best_matches(names))
+    )
+
+    # 항목 x 영양소 행렬: 카탈로그 행은 컬럼 배열에서 한 번에 가져오고, 벡터 검색 결과는 메타 값 사용
+    matrix = np.zeros((len(items), len(NUTRIENT_KEYS)), dtype=np.float64)
+    store_positions = [i for i, match in enumerate(matches) if match and "row" in match]
+    if store_positions:
+        store = matcher.store
+        rows = np.array([matches[i]["row"] for i in store_positions], dtype=np.int64)
+        for col, key in enumerate(NUTRIENT_KEYS):
+            if key in store.columns:
+                matrix[store_positions, col] = store.columns[key][rows]
+    for i, match in enumerate(matches):
+        if match and "row" not in match:
+            matrix[i] = [match["nutrition"].get(key, 0) for key in NUTRIENT_KEYS]
+    factors = np.array([portion_factor(amount, unit) for _, amount, unit in parsed], dtype=np.float64)
+    scaled = matrix * factors[:, None]
+
+    infos = []
+    for i, (item, (food_name, amount, unit), match) in enumerate(zip(items, parsed, matches)):
+        if not match:
+            infos.append(None)
+            continue
+        infos.append({
+            'original': item,
+            'parsed': food_name,
+            'amount': amount,
+            'unit': unit,
+            'grams': float(factors[i] * BASE_GRAMS),
+            'matched': match['name'],
+            'score': match['score'],
+            'tier': match['tier'],
+            'nutrition': {key: float(scaled[i, col]) for col, key in enumerate(NUTRIENT_KEYS)}
+        })
+    return scaled, infos
+
 
 def calculate_nutrition(items: list[str]) -> dict:
-    """벡터 검색을 사용한 영양소 계산"""
-    total = {
-        "kcal": 0,
-        "protein": 0,
-        "fat": 0,
-        "carbs": 0,
-        "sodium": 0,
-        "potassium": 0,
-        "phosphorus": 0
-    }
-    
-    vector_db = get_vector_db()
-    found_items = []
-    not_found_items = []
-
-    for item in items:
-        # 음식명 파싱
-        food_name = parse_food_item(item)
-        
-        # 벡터 검색으로 유사한 음식 찾기
-        match = vector_db.find_best_match(food_name)
-        
-        if match:
-            nutrition = match['nutrition']
-            for key in total:
-                total[key] += nutrition.get(key, 0)
-            
-            found_items.append({
-                'original': item,
-                'parsed': food_name,
-                'matched': match['name'],
-                'score': match['score'],
-                'nutrition': nutrition
-            })
-            
-            if match['score'] < 1.0:  # 유사도 매칭인 경우
-                print(f"[VECTOR MATCH] '{item}' → '{match['name']}' (유사도: {match['score']:.3f})")
-        else:
-            not_found_items.append(item)
-            print(f"[NOT FOUND VIA VECTOR] '{item}' - 벡터 DB에서 유사한 음식을 찾을 수 없습니다.")
-
-    # 결과 요약 출력
-    if found_items:
-        print(f"✅ (Vector Search) 매칭된 음식: {len(found_items)}개")
-    if not_found_items:
-        print(f"❌ (Vector Search) 매칭 실패: {len(not_found_items)}개 - {not_found_items}")
+    """단계별 매칭(정확 일치 → 정규화 일치 → 문자 n-gram → 벡터 검색)을 사용한 영양소 계산
+
+    항목별 영양소(100g 기준)에 섭취량 배수를 곱해 합산한다.
+    """
+    scaled, infos = match_items(items)
+    sums = scaled.sum(axis=0)
+    total = {key: float(sums[col]) for col, key in enumerate(NUTRIENT_KEYS)}
+
+    found_items = [info for info in infos if info]
+    not_found_items = [item for item, info in zip(items, infos) if info is None]
+    # 항목별 매칭 과정은 LOG_LEVEL=DEBUG 일 때만 출력 (건수는 /metrics 의 diet_food_match_total)
+    if logger.isEnabledFor(logging.DEBUG):
+        for info in found_items:
+            if info['tier'] == TIER_VECTOR:
+                logger.debug("[VECTOR MATCH] '%s' → '%s' (유사도: %.3f)", info['original'], info['matched'], info['score'])
+            elif info['tier'] == TIER_LEXICAL:
+                logger.debug("[LEXICAL MATCH] '%s' → '%s' (유사도: %.3f)", info['original'], info['matched'], info['score'])
+        for item in not_found_items:
+            logger.debug("[NOT FOUND VIA VECTOR] '%s' - 벡터 DB에서 유사한 음식을 찾을 수 없습니다.", item)
+        logger.debug("매칭된 음식: %d개, 매칭 실패: %d개 %s", len(found_items), len(not_found_items), not_found_items)
 
     # 매칭 정보도 함께 반환
     total["matched_info"] = found_items
     total["not_found_via_vector"] = not_found_items
-    
+
     return total
@@ -0,0 +1,250 @@
+# services/catalog_format.py
+# 음식 카탈로그 / FAISS 메타데이터의 바이너리 컬럼 포맷 (빌드 + 메모리 맵 로드)
+#
+# 디렉터리 구조:
+#   manifest.json            포맷 버전, 행 수, 컬럼 목록, 원본 파일 정보 등
+#   <column>.npy             숫자 컬럼 (np.load(mmap_mode="r") 로 로드)
+#   <table>.blob.npy         문자열 테이블: UTF-8 바이트를 이어 붙인 uint8 배열
+#   <table>.offsets.npy      문자열 테이블: 각 문자열 시작 위치 (int64, 길이 n+1)
+#   <table>.order.npy        문자열 테이블: (문자열, 행 번호) 정렬 순서 (int32), 이진 탐색용
+#
+# .npy 파일은 OS 페이지 캐시를 통해 여러 uvicorn 워커가 같은 물리 페이지를 공유한다.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+CATALOG_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class StringTable:
+    """오프셋 기반 UTF-8 문자열 테이블 (list 처럼 인덱싱/순회 가능)"""
+
+    def __init__(self, blob, offsets, order):
+        self.blob = blob
+        self.offsets = offsets
+        self.order = order
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        # 같은 문자열은 행 번호가 작은 쪽이 먼저 오도록 정렬 (find 가 첫 번째 행을 반환)
+        order = np.array(sorted(range(len(encoded)), key=lambda i: (encoded[i], i)), dtype=np.int32)
+        return cls(blob, offsets, order)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _bytes(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._bytes(i).decode("utf-8")
+
+    def __iter__(self):
+        # 버퍼 전체를 한 번만 bytes 로 꺼내 슬라이스 (행마다 배열 슬라이싱하지 않음)
+        data = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield data[start:end].decode("utf-8")
+
+    def find(self, value):
+        """value 와 정확히 일치하는 첫 번째 행 번호 (없으면 None), O(log n)"""
+        target = value.encode("utf-8")
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(self.order[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order) and self._bytes(self.order[lo]) == target:
+            return int(self.order[lo])
+        return None
+
+    def save(self, directory, name):
+        np.save(os.path.join(directory, f"{name}.blob.npy"), self.blob)
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), self.offsets)
+        np.save(os.path.join(directory, f"{name}.order.npy"), self.order)
+
+    @classmethod
+    def load(cls, directory, name, mmap_mode="r"):
+        return cls(
+            np.load(os.path.join(directory, f"{name}.blob.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, f"{name}.order.npy"), mmap_mode=mmap_mode),
+        )
+
+
+SOURCE_DIGEST_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """원본 파일 내용의 SHA-256 (1MB 씩 읽어 계산)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(SOURCE_DIGEST_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path):
+    """원본 파일 변경 감지용 (파일명, 크기, 수정 시각, 내용 해시)"""
+    stat = os.stat(path)
+    return {
+        "path": os.path.basename(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_digest(path),
+    }
+
+
+def is_stale(manifest, source_path):
+    """원본 파일이 있고 빌드 당시와 내용이 다르면 True
+
+    크기가 다르면 바로 True, 크기와 수정 시각이 모두 같으면 해시 계산 없이 False.
+    수정 시각만 다르면(git checkout 등) 내용 해시를 다시 계산해 비교한다.
+    해시가 없는 이전 카탈로그는 크기가 같은 수정을 구분할 수 없으므로 다시 빌드하도록 True.
+    """
+    if not os.path.exists(source_path):
+        return False
+    recorded = manifest.get("source") or {}
+    stat = os.stat(source_path)
+    if recorded.get("path") != os.path.basename(source_path) or recorded.get("size") != stat.st_size:
+        return True
+    if "sha256" not in recorded:
+        return True
+    if recorded.get("mtime_ns") == stat.st_mtime_ns:
+        return False
+    return file_digest(source_path) != recorded["sha256"]
+
+
+def write_catalog(directory, string_tables, columns, extra=None):
+    """문자열 테이블 + 숫자 컬럼을 directory 에 기록 (manifest 는 마지막에 써서 부분 빌드를 방지)"""
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)  # 재빌드 도중 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록
+    lengths = {len(t) for t in string_tables.values()} | {len(c) for c in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"컬럼 길이가 서로 다릅니다: {sorted(lengths)}")
+
+    for name, table in string_tables.items():
+        table.save(directory, name)
+    for name, values in columns.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(values))
+
+    manifest = {
+        "format_version": CATALOG_FORMAT_VERSION,
+        "rows": lengths.pop() if lengths else 0,
+        "string_tables": list(string_tables),
+        "columns": {name: str(values.dtype) for name, values in columns.items()},
+        **(extra or {}),
+    }
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != CATALOG_FORMAT_VERSION:
+        print(f"경고: {directory} 카탈로그 포맷 버전({manifest.get('format_version')})이 "
+              f"현재 버전({CATALOG_FORMAT_VERSION})과 다릅니다. 다시 빌드하세요.")
+        return None
+    return manifest
+
+
+def load_catalog(directory, mmap_mode="r"):
+    """(manifest, {이름: StringTable}, {이름: ndarray}) 반환. 카탈로그가 없으면 None"""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    string_tables = {name: StringTable.load(directory, name, mmap_mode) for name in manifest["string_tables"]}
+    columns = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in manifest["columns"]
+    }
+    return manifest, string_tables, columns
+
+
+FAISS_META_NUMERIC_FIELDS = ("kcal", "protein", "fat", "carbs")
+# 메타에 인덱스 종류가 없으면(기존 리스트 형식) 정확 검색 인덱스로 간주
+DEFAULT_FAISS_INDEX_INFO = {"type": "flat", "params": {}}
+
+
+def split_faiss_meta(meta):
+    """food_faiss.meta 내용을 (항목 리스트, 인덱스 정보) 로 분리
+
+    기존 형식: [{"name": ..., "kcal": ...}, ...]
+    새 형식:   {"index": {"type": "hnsw_flat", "params": {...}}, "items": [...]}
+    """
+    if isinstance(meta, dict):
+        return meta.get("items", []), meta.get("index") or dict(DEFAULT_FAISS_INDEX_INFO)
+    return meta, dict(DEFAULT_FAISS_INDEX_INFO)
+
+
+def dump_faiss_meta(items, index_info, path):
+    """인덱스 정보가 포함된 새 형식으로 food_faiss.meta 기록"""
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump({"index": index_info, "items": items}, f, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+class FaissMetaTable:
+    """food_faiss.meta 의 컬럼 버전. 인덱스 위치로 조회하면 기존 메타 딕셔너리와 같은 형태를 반환"""
+
+    def __init__(self, names, columns, index_info=None):
+        self.names = names
+        self.columns = columns
+        self.index_info = index_info or dict(DEFAULT_FAISS_INDEX_INFO)
+
+    @classmethod
+    def from_meta_list(cls, meta_list, index_info=None):
+        names = StringTable.from_strings([m["name"] for m in meta_list])
+        columns = {
+            field: np.array([float(m.get(field) or 0.0) for m in meta_list], dtype=np.float64)
+            for field in FAISS_META_NUMERIC_FIELDS
+        }
+        return cls(names, columns, index_info)
+
+    def save(self, directory, source_path=None):
+        extra = {"source": source_fingerprint(source_path)} if source_path else {}
+        extra["index"] = self.index_info
+        return write_catalog(directory, {"names": self.names}, self.columns, extra)
+
+    @classmethod
+    def load(cls, directory, source_path=None):
+        loaded = load_catalog(directory)
+        if loaded is None:
+            return None
+        manifest, string_tables, columns = loaded
+        if source_path and is_stale(manifest, source_path):
+            print(f"경고: {directory} 메타 카탈로그가 {source_path} 와 맞지 않아 JSON 메타를 사용합니다.")
+            return None
+        return cls(string_tables["names"], columns, manifest.get("index"))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, idx):
+        meta = {"name": self.names[idx]}
+        for field in FAISS_META_NUMERIC_FIELDS:
+            meta[field] = float(self.columns[field][idx])
+        return meta
@@ -0,0 +1,254 @@
+# services/daily_rollup.py
+# 사용자 / 날짜별 영양소 합계 집계 테이블(daily_nutrition) 유지 / 조회
+#
+# - meals 를 추가/삭제하는 같은 트랜잭션 안에서 (user_id, date) 별 증분(+/-)을 UPSERT 로 반영
+#   → 요약/간식 추천은 meals 를 SUM 하지 않고 사용자의 날짜당 행 1개(기본 키)만 읽는다.
+# - 주/월 단위 범위 조회는 한 사용자의 날짜별 행을 모아 계산 (1년 = 최대 366행)
+# - rebuild / check 로 meals 와의 일관성을 다시 맞추거나 검사 (scripts/rebuild_daily_nutrition.py)
+
+from datetime import date, timedelta
+
+from sqlalchemy import func, insert, select
+
+from backend.models.models import DEFAULT_USER_ID, DailyNutrition, Meal as DBMeal
+
+NUTRIENT_FIELDS = ["kcal", "protein", "fat", "carbs", "sodium", "potassium", "phosphorus"]
+# check() 에서 부동소수점 누적 오차로 보고 넘어갈 차이
+CHECK_TOLERANCE = 1e-6
+
+
+def _value(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def meal_deltas(meals, sign=1):
+    """식사 행(딕셔너리 또는 DB 객체) 목록 → {(user_id, date): {"meal_count", 영양소...}} 증분"""
+    deltas = {}
+    for meal in meals:
+        day = _value(meal, "date")
+        if day is None:
+            continue
+        # bulk_insert_mappings 용 딕셔너리에 user_id 가 없으면 컬럼 기본값과 같은 사용자로 집계
+        key = ((meal.get("user_id") if isinstance(meal, dict) else meal.user_id) or DEFAULT_USER_ID, day)
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = {"meal_count": 0, **{field: 0.0 for field in NUTRIENT_FIELDS}}
+        delta["meal_count"] += sign
+        for field in NUTRIENT_FIELDS:
+            delta[field] += sign * float(_value(meal, field) or 0)
+    return deltas
+
+
+_COLUMNS = ["meal_count", *NUTRIENT_FIELDS]
+# 방언별 UPSERT 문 (한 번 만들어 두면 SQLAlchemy 컴파일 캐시를 그대로 재사용)
+_upsert_statements = {}
+
+
+def _upsert_statement(dialect_name):
+    if dialect_name not in _upsert_statements:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            _upsert_statements[dialect_name] = None
+            return None
+        table = DailyNutrition.__table__
+        stmt = dialect_insert(table)
+        _upsert_statements[dialect_name] = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={column: table.c[column] + stmt.excluded[column] for column in _COLUMNS},
+        )
+    return _upsert_statements[dialect_name]
+
+
+def apply_deltas(db, deltas):
+    """(user_id, date) 별 증분을 daily_nutrition 에 반영 (commit 은 호출한 쪽에서 meals 변경과 함께)
+
+    SQLite / Postgres 는 INSERT ... ON CONFLICT(user_id, date) DO UPDATE SET col = col + excluded.col,
+    그 외 DB 는 UPDATE 후 없으면 INSERT. 식사 수가 0 이 된 날짜의 행은 지운다.
+    """
+    if not deltas:
+        return
+    values = [{"user_id": user_id, "date": day, **delta} for (user_id, day), delta in deltas.items()]
+    stmt = _upsert_statement(db.get_bind().dialect.name)
+    if stmt is not None:
+        db.execute(stmt, values)
+    else:
+        for value in values:
+            updated = (
+                db.query(DailyNutrition)
+                .filter(DailyNutrition.user_id == value["user_id"], DailyNutrition.date == value["date"])
+                .update({getattr(DailyNutrition, column): getattr(DailyNutrition, column) + value[column]
+                         for column in _COLUMNS}, synchronize_session=False)
+            )
+            if not updated:
+                db.execute(insert(DailyNutrition).values(**value))
+
+    emptied = {}
+    for (user_id, day), delta in deltas.items():
+        if delta["meal_count"] < 0:
+            emptied.setdefault(user_id, []).append(day)
+    for user_id, days in emptied.items():
+        (db.query(DailyNutrition)
+         .filter(DailyNutrition.user_id == user_id, DailyNutrition.date.in_(days), DailyNutrition.meal_count <= 0)
+         .delete(synchronize_session=False))
+
+
+def record_meals(db, meals):
+    """추가한 식사들을 집계에 더함"""
+    apply_deltas(db, meal_deltas(meals))
+
+
+def delete_meals(db, query):
+    """meals 쿼리에 해당하는 식사를 삭제하고 집계에서 뺌 → 삭제된 행 수
+
+    삭제 전에 같은 조건으로 (user_id, date) 별 합계를 GROUP BY 한 번으로 구해 음수 증분으로 반영한다.
+    """
+    grouped = (
+        query.with_entities(DBMeal.user_id, DBMeal.date, func.count(DBMeal.id),
+                            *[func.coalesce(func.sum(getattr(DBMeal, field)), 0) for field in NUTRIENT_FIELDS])
+        .order_by(None)
+        .group_by(DBMeal.user_id, DBMeal.date)
+        .all()
+    )
+    deleted = query.delete(synchronize_session=False)
+    deltas = {}
+    for user_id, day, count, *sums in grouped:
+        if day is None:
+            continue
+        deltas[(user_id, day)] = {"meal_count": -count, **{field: -float(value) for field, value in zip(NUTRIENT_FIELDS, sums)}}
+    apply_deltas(db, deltas)
+    return deleted
+
+
+def _row_dict(row):
+    return {
+        "date": str(row.date),
+        "meal_count": row.meal_count,
+        "nutrition": {field: float(getattr(row, field)) for field in NUTRIENT_FIELDS},
+    }
+
+
+def totals_for(db, user_id, day):
+    """사용자의 해당 날짜 영양소 합계 (기본 키 조회 1회)"""
+    row = db.get(DailyNutrition, (user_id, day))
+    if row is None:
+        return {field: 0 for field in NUTRIENT_FIELDS}
+    return {field: float(getattr(row, field)) for field in NUTRIENT_FIELDS}
+
+
+def daily_range(db, user_id, start, end):
+    """사용자의 start~end (포함) 날짜별 합계 목록. 기록이 없는 날짜는 포함하지 않음 (기본 키 범위 조회)"""
+    rows = (
+        db.query(DailyNutrition)
+        .filter(DailyNutrition.user_id == user_id, DailyNutrition.date >= start, DailyNutrition.date <= end)
+        .order_by(DailyNutrition.date)
+        .all()
+    )
+    return [_row_dict(row) for row in rows]
+
+
+def period_start(day, period):
+    if period == "week":
+        return day - timedelta(days=day.weekday())  # ISO 주 (월요일 시작)
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _period_end(start, period):
+    if period == "week":
+        return start + timedelta(days=6)
+    if period == "month":
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    return start
+
+
+def default_range(period, end=None):
+    """기간 단위별 기본 조회 범위: 일 30일 / 주 12주 / 월 12개월 (end 가 속한 기간까지)"""
+    end = end or date.today()
+    if period == "week":
+        return period_start(end, "week") - timedelta(weeks=11), end
+    if period == "month":
+        start = period_start(end, "month")
+        for _ in range(11):
+            start = period_start(start - timedelta(days=1), "month")
+        return start, end
+    return end - timedelta(days=29), end
+
+
+def period_totals(days, period):
+    """daily_range 결과 → 주/월 단위 합계와 기록한 날 기준 일평균"""
+    if period == "day":
+        return days
+    buckets = {}
+    for day in days:
+        key = period_start(date.fromisoformat(day["date"]), period)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                "start": str(key), "end": str(_period_end(key, period)),
+                "days_logged": 0, "meal_count": 0,
+                "nutrition": {field: 0.0 for field in NUTRIENT_FIELDS},
+            }
+        bucket["days_logged"] += 1
+        bucket["meal_count"] += day["meal_count"]
+        for field in NUTRIENT_FIELDS:
+            bucket["nutrition"][field] += day["nutrition"][field]
+    for bucket in buckets.values():
+        bucket["daily_average"] = {
+            field: value / bucket["days_logged"] for field, value in bucket["nutrition"].items()
+        }
+    return [buckets[key] for key in sorted(buckets)]
+
+
+def _expected_select():
+    return (
+        select(DBMeal.user_id, DBMeal.date, func.count(DBMeal.id),
+               *[func.coalesce(func.sum(getattr(DBMeal, field)), 0) for field in NUTRIENT_FIELDS])
+        .where(DBMeal.date.isnot(None))
+        .group_by(DBMeal.user_id, DBMeal.date)
+    )
+
+
+def rebuild(db):
+    """meals 에서 집계 테이블 전체를 다시 계산 (INSERT ... SELECT 한 문장) → (사용자, 날짜) 행 수. commit 은 호출한 쪽에서"""
+    db.query(DailyNutrition).delete(synchronize_session=False)
+    db.execute(insert(DailyNutrition).from_select(
+        ["user_id", "date", "meal_count", *NUTRIENT_FIELDS], _expected_select()
+    ))
+    return db.query(func.count(DailyNutrition.date)).scalar()
+
+
+def check(db, tolerance=CHECK_TOLERANCE):
+    """meals 에서 계산한 값과 집계 테이블 비교 → 불일치 목록 [{"user_id", "date", "expected", "actual"}]"""
+    expected = {
+        (row[0], row[1]): {"meal_count": row[2], **dict(zip(NUTRIENT_FIELDS, map(float, row[3:])))}
+        for row in db.execute(_expected_select())
+    }
+    actual = {
+        (row.user_id, row.date): {"meal_count": row.meal_count, **{field: float(getattr(row, field)) for field in NUTRIENT_FIELDS}}
+        for row in db.query(DailyNutrition).all()
+    }
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want, have = expected.get(key), actual.get(key)
+        if want is not None and have is not None and want["meal_count"] == have["meal_count"] and all(
+            abs(want[field] - have[field]) <= tolerance * max(1.0, abs(want[field])) for field in NUTRIENT_FIELDS
+        ):
+            continue
+        mismatches.append({"user_id": key[0], "date": str(key[1]), "expected": want, "actual": have})
+    return mismatches
+
+
+def ensure_backfilled(db):
+    """집계 테이블이 비어 있는데 meals 가 있으면 (기존 DB / 다중 사용자 이전 후 첫 실행) 한 번 채움 → 채운 행 수 또는 0"""
+    if db.query(DailyNutrition.date).first() is not None:
+        return 0
+    if db.query(DBMeal.id).first() is None:
+        return 0
+    days = rebuild(db)
+    db.commit()
+    return days
@@ -0,0 +1,175 @@
+# services/encoders.py
+# 문장 임베딩 encoder 백엔드 (ENCODER_BACKEND 환경 변수로 선택)
+#
+# - torch     : sentence_transformers (PyTorch) 로 원본 모델 로드 (기본값)
+# - onnx      : scripts/export_onnx_encoder.py 로 내보낸 ONNX 모델을 onnxruntime 으로 실행
+# - onnx-int8 : 같은 모델을 동적 int8 양자화한 버전 (가중치 1/4, CPU 에서 더 빠름)
+# - hash      : 모델 없이 문자 n-gram 해시로 만드는 결정적 벡터 (벤치마크 / CI 전용, 의미 유사도 없음)
+#
+# ONNX 백엔드는 torch / sentence_transformers 를 import 하지 않으므로 프로세스 메모리와 시작 시간이 크게 줄어든다.
+# (onnxruntime, tokenizers 패키지 필요. tokenizers 는 sentence-transformers 의존성으로 이미 설치됨)
+
+import json
+import os
+import zlib
+
+import numpy as np
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8", "hash")
+DEFAULT_ENCODER_BACKEND = "torch"
+DEFAULT_ENCODE_BATCH_SIZE = 32
+DEFAULT_HASH_DIMENSION = 256
+
+_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))  # backend/services/
+DEFAULT_ONNX_DIR = os.path.join(os.path.dirname(_SERVICE_DIR), "data", "encoder_onnx")
+
+# 내보낸 디렉토리 구성
+ONNX_CONFIG_FILE = "encoder.json"
+ONNX_MODEL_FILES = {"onnx": "model.onnx", "onnx-int8": "model_int8.onnx"}
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+
+# 패리티 검사 기준 (torch 대비): 최소 코사인 유사도, FAISS top-1 일치율
+PARITY_THRESHOLDS = {
+    "onnx": {"min_cosine": 0.999, "min_top1": 0.99},
+    "onnx-int8": {"min_cosine": 0.97, "min_top1": 0.95},
+}
+
+
+def encoder_backend_from_env():
+    backend = os.environ.get("ENCODER_BACKEND", DEFAULT_ENCODER_BACKEND).strip().lower()
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"ENCODER_BACKEND 는 {', '.join(ENCODER_BACKENDS)} 중 하나여야 합니다. ({backend})")
+    return backend
+
+
+def encoder_threads_from_env():
+    value = os.environ.get("ENCODER_THREADS")
+    return int(value) if value else None
+
+
+class TorchEncoder:
+    """sentence_transformers 모델 (원본 PyTorch 경로)"""
+
+    backend = "torch"
+
+    def __init__(self, model_name, threads=None):
+        # sentence_transformers(torch) import 는 수 초가 걸리므로 실제 로드 시점에 수행
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+        embeddings = self.model.encode(list(texts), batch_size=batch_size, show_progress_bar=False,
+                                       convert_to_numpy=True)
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+
+
+class OnnxEncoder:
+    """내보낸 transformer 를 onnxruntime 으로 실행하고 풀링은 NumPy 로 계산"""
+
+    def __init__(self, model_dir=DEFAULT_ONNX_DIR, quantized=False, threads=None):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError(f"ONNX encoder 에는 onnxruntime, tokenizers 패키지가 필요합니다. ({e})") from e
+        self.backend = "onnx-int8" if quantized else "onnx"
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILES[self.backend])
+        config_path = os.path.join(model_dir, ONNX_CONFIG_FILE)
+        if not os.path.exists(model_path) or not os.path.exists(config_path):
+            raise FileNotFoundError(
+                f"ONNX encoder 파일({model_path})이 없습니다. python -m backend.scripts.export_onnx_encoder export 로 생성하세요."
+            )
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        self.model_name = config["model_name"]
+        self.dimension = config["dimension"]
+        self.pooling = config["pooling"]
+        self.input_names = config["inputs"]
+        self.pad_id = config["pad_id"]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, ONNX_TOKENIZER_FILE))
+        self.tokenizer.no_padding()  # 배치마다 길이순으로 모아 직접 패딩
+        self.tokenizer.enable_truncation(max_length=config["max_seq_length"])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+
+    def _pool(self, hidden, mask):
+        if self.pooling == "cls":
+            return hidden[:, 0]
+        mask = mask[:, :, None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, texts, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+        encodings = self.tokenizer.encode_batch(list(texts))
+        output = np.empty((len(encodings), self.dimension), dtype=np.float32)
+        # 길이가 비슷한 문장끼리 배치를 만들어 패딩 토큰 계산을 줄임 (sentence_transformers 와 같은 방식)
+        order = np.argsort([len(encoding.ids) for encoding in encodings], kind="stable")
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            batch = [encodings[row] for row in rows]
+            length = max(len(encoding.ids) for encoding in batch)
+            feeds = {
+                "input_ids": np.full((len(batch), length), self.pad_id, dtype=np.int64),
+                "attention_mask": np.zeros((len(batch), length), dtype=np.int64),
+                "token_type_ids": np.zeros((len(batch), length), dtype=np.int64),
+            }
+            for i, encoding in enumerate(batch):
+                n = len(encoding.ids)
+                feeds["input_ids"][i, :n] = encoding.ids
+                feeds["attention_mask"][i, :n] = 1
+                feeds["token_type_ids"][i, :n] = encoding.type_ids
+            hidden = self.session.run(None, {name: feeds[name] for name in self.input_names})[0]
+            output[rows] = self._pool(hidden, feeds["attention_mask"])
+        return output
+
+
+class HashEncoder:
+    """문자 1~3-gram 을 crc32 로 해시해 차원에 더하는 결정적 encoder (모델 다운로드 없이 전체 경로를 측정할 때 사용)
+
+    철자가 비슷한 이름은 n-gram 을 공유하므로 가까운 벡터가 되어, 오타 / 변형 이름도 검색 결과가 나온다.
+    """
+
+    backend = "hash"
+
+    def __init__(self, model_name, dimension=None):
+        self.model_name = model_name
+        self.dimension = dimension or int(os.environ.get("ENCODER_HASH_DIM", DEFAULT_HASH_DIMENSION))
+
+    def _features(self, text):
+        chars = "".join(str(text).lower().split())
+        return [chars[i:i + n] for n in (1, 2, 3) for i in range(len(chars) - n + 1)]
+
+    def encode(self, texts, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+        output = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                code = zlib.crc32(feature.encode("utf-8"))
+                # 하위 비트로 차원, 최상위 비트로 부호를 정해 해시 충돌이 한쪽으로 쌓이지 않게 함
+                output[row, code % self.dimension] += 1.0 if code >> 31 else -1.0
+        return output
+
+
+def load_encoder(model_name, backend=None, threads=None, onnx_dir=None):
+    """backend(기본 ENCODER_BACKEND) 에 맞는 encoder 생성. encode(texts, batch_size) → float32 (n, dim)"""
+    backend = backend or encoder_backend_from_env()
+    threads = threads or encoder_threads_from_env()
+    if backend == "torch":
+        return TorchEncoder(model_name, threads=threads)
+    if backend == "hash":
+        return HashEncoder(model_name)
+    if backend not in ONNX_MODEL_FILES:
+        raise ValueError(f"지원하지 않는 encoder 백엔드입니다: {backend} (지원: {', '.join(ENCODER_BACKENDS)})")
+    encoder = OnnxEncoder(onnx_dir or os.environ.get("ENCODER_ONNX_DIR", DEFAULT_ONNX_DIR),
+                          quantized=backend == "onnx-int8", threads=threads)
+    if encoder.model_name != model_name:
+        raise ValueError(f"ONNX encoder 는 {encoder.model_name} 에서 내보낸 모델입니다. (요청: {model_name})")
+    return encoder
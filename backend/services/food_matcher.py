@@ -0,0 +1,125 @@
+# services/food_matcher.py
+# 음식명 → 음식 데이터 단계별 매칭
+#
+#   exact       식품명 정확 일치 (카탈로그 이진 탐색)
+#   normalized  공백 제거 + 소문자 기준 일치 (해시 조회)
+#   lexical     문자 bigram Dice 유사도가 LEXICAL_MATCH_MIN_SCORE 이상인 식품명
+#   vector      위 단계에서 찾지 못한 이름만 임베딩 검색 (모델 호출)
+#
+# 자주 먹는 음식은 앞 단계에서 끝나므로 임베딩 모델을 거치지 않는다.
+
+import os
+import threading
+
+from backend.services import metrics
+from backend.services.food_store import get_food_store
+from backend.services.name_index import get_substring_index, normalize
+
+TIER_EXACT = "exact"
+TIER_NORMALIZED = "normalized"
+TIER_LEXICAL = "lexical"
+TIER_VECTOR = "vector"
+NOT_FOUND = "not_found"
+TIERS = (TIER_EXACT, TIER_NORMALIZED, TIER_LEXICAL, TIER_VECTOR)
+
+DEFAULT_LEXICAL_MIN_SCORE = 0.8
+
+
+class FoodMatcher:
+    def __init__(self, store, lexical_min_score=DEFAULT_LEXICAL_MIN_SCORE):
+        self.store = store
+        self.lexical_min_score = lexical_min_score
+        self.name_index = get_substring_index(store, normalize)
+        # 정규화된 이름 → 첫 번째 행 (중복 이름은 카탈로그 앞쪽 행 우선)
+        self.normalized_rows = {}
+        for row, name in enumerate(self.name_index.norm_names):
+            self.normalized_rows.setdefault(name, row)
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(TIERS + (NOT_FOUND,), 0)
+
+    @classmethod
+    def from_env(cls, store):
+        return cls(store, float(os.environ.get("LEXICAL_MATCH_MIN_SCORE", DEFAULT_LEXICAL_MIN_SCORE)))
+
+    def _store_match(self, row, score, tier):
+        return {
+            "row": row,
+            "name": self.store.names[row],
+            "score": score,
+            "nutrition": self.store.nutrition(row),
+            "tier": tier,
+        }
+
+    def match_local(self, food_name):
+        """모델 없이 찾을 수 있는 단계(exact → normalized → lexical)의 매칭 결과 (없으면 None)"""
+        row = self.store.find_row(food_name)
+        if row is not None:
+            return self._store_match(row, 1.0, TIER_EXACT)
+        key = normalize(food_name)
+        row = self.normalized_rows.get(key)
+        if row is not None:
+            return self._store_match(row, 1.0, TIER_NORMALIZED)
+        similar = self.name_index.most_similar(key, normalized=True)
+        if similar is not None and similar[1] >= self.lexical_min_score:
+            return self._store_match(similar[0], similar[1], TIER_LEXICAL)
+        return None
+
+    def match_many(self, food_names, vector_search=None):
+        """이름 목록의 최상위 매칭 결과 (없으면 None) 를 입력 순서대로 반환
+
+        vector_search(이름 리스트) -> 매칭 리스트 는 앞 단계에서 찾지 못한 이름(중복 제거)에 대해서만 한 번 호출된다.
+        빈 이름("반 공기", "200g" 처럼 수량만 있는 항목)은 아무 음식과도 매칭하지 않고 벡터 검색에도 넘기지 않는다.
+        """
+        results = []
+        pending = {}  # 이름 -> 결과 위치 목록
+        with metrics.stage_timer("match_local"):
+            for i, food_name in enumerate(food_names):
+                if not food_name.strip():
+                    results.append(None)
+                    continue
+                match = self.match_local(food_name)
+                results.append(match)
+                if match is None:
+                    pending.setdefault(food_name, []).append(i)
+
+        if pending and vector_search is not None:
+            names = list(pending)
+            for food_name, match in zip(names, vector_search(names)):
+                if match is None:
+                    continue
+                for i in pending[food_name]:
+                    results[i] = {**match, "tier": TIER_VECTOR}
+
+        tiers = [match["tier"] if match else NOT_FOUND for match in results]
+        with self._lock:
+            for tier in tiers:
+                self.counts[tier] += 1
+        for tier in tiers:
+            metrics.FOOD_MATCH_TOTAL.inc(tier)
+        return results
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+        total = sum(counts.values())
+        return {
+            "total": total,
+            "counts": counts,
+            "hit_rates": {tier: (count / total if total else 0.0) for tier, count in counts.items()},
+            "lexical_min_score": self.lexical_min_score,
+        }
+
+
+# 전역 인스턴스: 현재 음식 저장소에 대해 한 번만 생성
+_food_matcher = None
+_food_matcher_lock = threading.Lock()
+
+
+def get_food_matcher():
+    global _food_matcher
+    store = get_food_store()
+    if _food_matcher is None or _food_matcher.store is not store:
+        with _food_matcher_lock:
+            if _food_matcher is None or _food_matcher.store is not store:
+                _food_matcher = FoodMatcher.from_env(store)
+    return _food_matcher
@@ -0,0 +1,205 @@
+# services/food_store.py
+# food_db.json 을 프로세스당 한 번만 로드하여 영양소 컬럼을 NumPy 배열로 보관하는 공용 저장소
+# calorie.py, recommender.py 가 모두 이 저장소를 통해 음식 데이터를 읽는다.
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from backend.services.catalog_format import StringTable, is_stale, load_catalog, source_fingerprint, write_catalog
+
+# --- 경로 설정 --- #
+_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))  # backend/services/
+_BACKEND_DIR = os.path.dirname(_SERVICE_DIR)  # backend/
+# 데이터 디렉토리 (FOOD_DATA_DIR 로 변경 가능: 벤치마크용 합성 카탈로그 / 인덱스 등)
+FOOD_DATA_DIR = os.environ.get("FOOD_DATA_DIR") or os.path.join(_BACKEND_DIR, "data")
+FOOD_DB_JSON_PATH = os.path.join(FOOD_DATA_DIR, "food_db.json")
+# backend.scripts.build_catalog 로 미리 컴파일한 바이너리 카탈로그 (있으면 메모리 맵으로 로드)
+FOOD_CATALOG_DIR = os.path.join(FOOD_DATA_DIR, "food_catalog")
+
+# 내부 컬럼명 -> food_db.json 원본 키
+NUTRIENT_COLUMNS = {
+    "kcal": "에너지(kcal)",
+    "protein": "단백질(g)",
+    "fat": "지방(g)",
+    "carbs": "탄수화물(g)",
+    "sodium": "나트륨(mg)",
+    "potassium": "칼륨(mg)",
+    "phosphorus": "인(mg)",
+}
+DATA_CODE_KEY = "데이터구분코드"
+_RECORDS_KEY = re.compile(r'"records"\s*:\s*\[')
+
+
+def safe_float(val):
+    try:
+        return float(val.strip()) if isinstance(val, str) else float(val)
+    except:
+        return 0.0
+
+
+def load_food_records(path=None):
+    """food_db.json 레코드 리스트 로드 (오류 시 빈 리스트)"""
+    path = path or FOOD_DB_JSON_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            food_data_loaded = json.load(f)
+    except FileNotFoundError:
+        print(f"치명적 오류: 데이터 파일 '{path}'을(를) 찾을 수 없습니다.")
+        return []
+    except json.JSONDecodeError:
+        print(f"치명적 오류: 데이터 파일 '{path}'이(가) 올바른 JSON 형식이 아닙니다.")
+        return []
+
+    # food_db.json 파일이 최상위에 "records" 키를 가지고 그 값이 리스트인 경우를 처리
+    if isinstance(food_data_loaded, dict) and "records" in food_data_loaded:
+        return food_data_loaded["records"]
+    # food_db.json 파일 자체가 음식 레코드 리스트인 경우도 처리
+    if isinstance(food_data_loaded, list):
+        return food_data_loaded
+    print(f"경고: {path} 파일의 형식이 예상과 다릅니다. 'records' 키를 찾을 수 없거나 리스트 형식이 아닙니다.")
+    return []
+
+
+def iter_food_records(path=None, chunk_size=1 << 20):
+    """food_db.json 레코드를 파일 전체를 올리지 않고 하나씩 읽어 yield
+
+    load_food_records 와 같은 두 형식({"records": [...]} 또는 최상위 리스트)을 지원한다.
+    """
+    path = path or FOOD_DB_JSON_PATH
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        # 레코드 배열의 시작 '[' 찾기
+        stripped = buffer.lstrip()
+        if stripped.startswith("["):
+            pos = buffer.index("[") + 1
+        else:
+            match = _RECORDS_KEY.search(buffer)
+            while match is None:
+                more = f.read(chunk_size)
+                if not more:
+                    raise ValueError(f"{path} 에서 'records' 배열을 찾을 수 없습니다.")
+                buffer += more
+                match = _RECORDS_KEY.search(buffer)
+            pos = match.end()
+
+        while True:
+            # 공백/쉼표를 건너뛰고 다음 객체를 디코딩, 버퍼가 모자라면 더 읽는다
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield record
+            pos = end
+            if pos > chunk_size:
+                buffer = buffer[pos:]
+                pos = 0
+
+
+class FoodStore:
+    """컬럼 기반 음식 영양소 저장소
+
+    - names: 식품명 StringTable (원본 파일 순서, 정렬 순서로 이름 -> 행 이진 탐색)
+    - columns: {"kcal": float64 배열, ...} (값이 없거나 숫자가 아니면 0.0)
+    - data_codes: 데이터구분코드의 카테고리 인덱스 (uint8), 라벨은 data_code_labels
+
+    JSON 에서 만들면 메모리 배열, 컴파일된 카탈로그에서 로드하면 읽기 전용 메모리 맵 배열이다.
+    """
+
+    def __init__(self, names, columns, data_codes, data_code_labels):
+        self.names = names
+        self.columns = columns
+        self.data_codes = data_codes
+        self.data_code_labels = data_code_labels
+
+    @classmethod
+    def from_records(cls, records):
+        n = len(records)
+        names = []
+        columns = {col: np.zeros(n, dtype=np.float64) for col in NUTRIENT_COLUMNS}
+        data_codes = np.zeros(n, dtype=np.uint8)
+        label_index = {}
+        data_code_labels = []
+
+        for row, record in enumerate(records):
+            names.append(record.get("식품명", ""))
+            for col, key in NUTRIENT_COLUMNS.items():
+                columns[col][row] = safe_float(record.get(key, 0))
+            code = record.get(DATA_CODE_KEY) or ""
+            if code not in label_index:
+                label_index[code] = len(data_code_labels)
+                data_code_labels.append(code)
+            data_codes[row] = label_index[code]
+
+        return cls(StringTable.from_strings(names), columns, data_codes, data_code_labels)
+
+    def save(self, directory, source_path=None):
+        """바이너리 카탈로그로 저장 (backend.scripts.build_catalog 에서 사용)"""
+        extra = {"data_code_labels": self.data_code_labels}
+        if source_path:
+            extra["source"] = source_fingerprint(source_path)
+        return write_catalog(directory, {"names": self.names}, {**self.columns, "data_codes": self.data_codes}, extra)
+
+    @classmethod
+    def load(cls, directory, source_path=None):
+        """바이너리 카탈로그를 메모리 맵으로 로드. 없거나 원본과 맞지 않으면 None"""
+        loaded = load_catalog(directory)
+        if loaded is None:
+            return None
+        manifest, string_tables, columns = loaded
+        if source_path and is_stale(manifest, source_path):
+            print(f"경고: {directory} 카탈로그가 {source_path} 와 맞지 않습니다. "
+                  "python -m backend.scripts.build_catalog 로 다시 빌드하세요.")
+            return None
+        data_codes = columns.pop("data_codes")
+        return cls(string_tables["names"], columns, data_codes, manifest["data_code_labels"])
+
+    def __len__(self):
+        return len(self.names)
+
+    def find_row(self, name):
+        """식품명 정확 일치 행 번호 (없으면 None)"""
+        return self.names.find(name)
+
+    def data_code_mask(self, code):
+        """데이터구분코드가 code 인 행의 bool 마스크"""
+        if code not in self.data_code_labels:
+            return np.zeros(len(self), dtype=bool)
+        return self.data_codes == self.data_code_labels.index(code)
+
+    def nutrition(self, row):
+        """행 번호의 영양소 딕셔너리 (calculate_nutrition 의 키 형식)"""
+        return {col: float(values[row]) for col, values in self.columns.items()}
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_food_store = None
+_food_store_lock = threading.Lock()
+
+
+def get_food_store():
+    global _food_store
+    if _food_store is None:
+        with _food_store_lock:
+            if _food_store is None:
+                store = FoodStore.load(FOOD_CATALOG_DIR, source_path=FOOD_DB_JSON_PATH)
+                if store is not None:
+                    print(f"음식 저장소 로드 완료 (바이너리 카탈로그, mmap). 총 {len(store)}개 항목.")
+                else:
+                    store = FoodStore.from_records(load_food_records())
+                    print(f"음식 저장소 로드 완료 (JSON). 총 {len(store)}개 항목.")
+                _food_store = store
+    return _food_store
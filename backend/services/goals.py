@@ -0,0 +1,51 @@
+# services/goals.py
+# 사용자별 목표 조회 / 저장
+#
+# - 사용자당 목표 행 1개 (ux_goals_user_id 고유 인덱스)
+# - 저장은 테이블을 비우지 않고 그 사용자의 행만 UPSERT → 다른 사용자의 목표 / 동시 요청에 영향 없음
+
+from sqlalchemy import insert, update
+
+from backend.models.models import Goal
+
+GOAL_FIELDS = ["current_weight", "target_weight", "period_days", "activity_level"]
+# 방언별 UPSERT 문 (daily_rollup 과 같은 방식으로 한 번만 만들어 재사용)
+_upsert_statements = {}
+
+
+def _upsert_statement(dialect_name):
+    if dialect_name not in _upsert_statements:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            _upsert_statements[dialect_name] = None
+            return None
+        table = Goal.__table__
+        stmt = dialect_insert(table)
+        _upsert_statements[dialect_name] = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={field: stmt.excluded[field] for field in GOAL_FIELDS},
+        )
+    return _upsert_statements[dialect_name]
+
+
+def get_goal(db, user_id):
+    """사용자의 목표 (없으면 None)"""
+    return db.query(Goal).filter(Goal.user_id == user_id).first()
+
+
+def upsert_goal(db, user_id, values):
+    """사용자의 목표를 새 값으로 저장 (commit 은 호출한 쪽에서)
+
+    SQLite / Postgres 는 INSERT ... ON CONFLICT(user_id) DO UPDATE, 그 외 DB 는 UPDATE 후 없으면 INSERT.
+    """
+    values = {field: values.get(field) for field in GOAL_FIELDS}
+    stmt = _upsert_statement(db.get_bind().dialect.name)
+    if stmt is not None:
+        db.execute(stmt, {"user_id": user_id, **values})
+        return
+    result = db.execute(update(Goal).where(Goal.user_id == user_id).values(**values))
+    if result.rowcount == 0:
+        db.execute(insert(Goal).values(user_id=user_id, **values))
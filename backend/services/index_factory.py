@@ -0,0 +1,183 @@
+# services/index_factory.py
+# FAISS 인덱스 종류별 생성 / 검색 파라미터 설정
+# 모든 인덱스는 L2 정규화된 벡터에 대한 내적(코사인 유사도)을 사용한다.
+#
+#   flat      IndexFlatIP        정확 검색 (기존 food_faiss.index 와 동일)
+#   ivf_flat  IndexIVFFlat       클러스터(nlist) 중 nprobe 개만 탐색
+#   hnsw_flat IndexHNSWFlat      그래프 탐색 (efSearch 로 정확도/속도 조절)
+#   ivf_pq    IndexIVFPQ         IVF + 곱 양자화 (메모리 대폭 절감)
+#   ivf_sq8   IndexIVFScalarQuantizer(QT_8bit)  IVF + 8비트 스칼라 양자화
+#
+# ids 를 지정하면 ID 가 부여된 인덱스를 만든다 (증분 추가/삭제용).
+# IVF 계열은 자체적으로 ID 를 저장하고, flat / hnsw_flat 은 IndexIDMap2 로 감싼다.
+
+import math
+import os
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw_flat", "ivf_pq", "ivf_sq8")
+DEFAULT_INDEX_TYPE = "flat"
+DEFAULT_NPROBE = 16
+DEFAULT_EF_SEARCH = 64
+DEFAULT_HNSW_M = 32
+DEFAULT_PQ_M = 64  # 768 차원 기준 서브 벡터당 12 차원
+
+
+def default_nlist(n):
+    # 일반적인 권장값 4*sqrt(n), 클러스터당 학습 벡터가 최소 39개 이상이 되도록 제한
+    return max(1, min(int(4 * math.sqrt(max(n, 1))), n // 39 or 1))
+
+
+def default_params(index_type, n, dim):
+    if index_type in ("ivf_flat", "ivf_pq", "ivf_sq8"):
+        params = {"nlist": default_nlist(n), "nprobe": DEFAULT_NPROBE}
+        if index_type == "ivf_pq":
+            m = DEFAULT_PQ_M
+            while dim % m:
+                m //= 2
+            # 코드북(2^nbits)당 학습 벡터 39개 이상이 필요하므로 작은 카탈로그에서는 nbits 를 줄임
+            nbits = max(1, min(8, int(math.log2(max(n // 39, 2)))))
+            params.update({"pq_m": max(m, 1), "pq_nbits": nbits})
+        return params
+    if index_type == "hnsw_flat":
+        return {"hnsw_m": DEFAULT_HNSW_M, "ef_construction": 80, "ef_search": DEFAULT_EF_SEARCH}
+    return {}
+
+
+def create_index(index_type, dim, params):
+    """학습 전의 빈 인덱스 생성"""
+    if index_type == "flat":
+        return faiss.IndexFlatIP(dim)
+    if index_type == "hnsw_flat":
+        index = faiss.IndexHNSWFlat(dim, params["hnsw_m"], faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params["ef_construction"]
+        return index
+    quantizer = faiss.IndexFlatIP(dim)
+    if index_type == "ivf_flat":
+        index = faiss.IndexIVFFlat(quantizer, dim, params["nlist"], faiss.METRIC_INNER_PRODUCT)
+    elif index_type == "ivf_pq":
+        index = faiss.IndexIVFPQ(quantizer, dim, params["nlist"], params["pq_m"], params["pq_nbits"],
+                                 faiss.METRIC_INNER_PRODUCT)
+    elif index_type == "ivf_sq8":
+        index = faiss.IndexIVFScalarQuantizer(quantizer, dim, params["nlist"], faiss.ScalarQuantizer.QT_8bit,
+                                              faiss.METRIC_INNER_PRODUCT)
+    else:
+        raise ValueError(f"지원하지 않는 인덱스 종류입니다: {index_type} (지원: {', '.join(INDEX_TYPES)})")
+    index.own_fields = True
+    quantizer.this.disown()  # 인덱스가 quantizer 를 소유 (파이썬 GC 로 먼저 해제되지 않도록)
+    return index
+
+
+def build_index(vectors, index_type=DEFAULT_INDEX_TYPE, ids=None, **overrides):
+    """정규화된 float32 벡터로 인덱스를 만들고 (index, index_info) 반환
+
+    index_info 는 메타 파일에 기록되는 {"type": ..., "params": {...}} 딕셔너리.
+    ids (int64 배열) 를 주면 ID 가 부여된 인덱스를 만들고 index_info["id_map"] = True.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    n, dim = vectors.shape
+    params = {**default_params(index_type, n, dim), **{k: v for k, v in overrides.items() if v is not None}}
+    index = create_index(index_type, dim, params)
+    if not index.is_trained:
+        index.train(vectors)
+    index_info = {"type": index_type, "params": params}
+    if ids is None:
+        index.add(vectors)
+    else:
+        index = wrap_id_map(index)
+        add_vectors(index, vectors, ids)
+        index_info["id_map"] = True
+    configure_search(index, params)
+    return index, index_info
+
+
+def wrap_id_map(index):
+    """ID 를 저장할 수 있도록 감싼 인덱스 반환 (IVF 계열은 그대로)"""
+    if _ivf_of(index) is not None or is_id_mapped(index):
+        return index
+    return faiss.IndexIDMap2(index)
+
+
+def is_id_mapped(index):
+    return isinstance(faiss.downcast_index(index), (faiss.IndexIDMap, faiss.IndexIDMap2))
+
+
+def add_vectors(index, vectors, ids):
+    index.add_with_ids(np.ascontiguousarray(vectors, dtype="float32"), np.ascontiguousarray(ids, dtype="int64"))
+
+
+def remove_ids(index, ids):
+    """ids 에 해당하는 벡터 삭제. HNSW 처럼 삭제를 지원하지 않으면 RuntimeError"""
+    if len(ids) == 0:
+        return 0
+    return index.remove_ids(np.ascontiguousarray(ids, dtype="int64"))
+
+
+def export_vectors(index):
+    """인덱스에 저장된 (ids, 벡터) 전체를 반환 (PQ/SQ 는 근사값). ID 가 없으면 0..ntotal-1"""
+    if is_id_mapped(index):
+        base = _unwrap(index)
+        ids = faiss.vector_to_array(faiss.downcast_index(index).id_map).astype("int64")
+        return ids, base.reconstruct_n(0, base.ntotal)
+    ivf = _ivf_of(index)
+    if ivf is not None:
+        invlists = ivf.invlists
+        ids = np.concatenate([np.zeros(0, dtype="int64")] + [
+            faiss.rev_swig_ptr(invlists.get_ids(l), invlists.list_size(l)).copy()
+            for l in range(invlists.nlist) if invlists.list_size(l)
+        ])
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return ids, index.reconstruct_batch(ids)
+    return np.arange(index.ntotal, dtype="int64"), index.reconstruct_n(0, index.ntotal)
+
+
+def _unwrap(index):
+    index = faiss.downcast_index(index)
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def _ivf_of(index):
+    try:
+        return faiss.extract_index_ivf(index)
+    except (RuntimeError, TypeError):
+        return None
+
+
+def configure_search(index, params):
+    """검색 시점 파라미터 적용 (IVF: nprobe, HNSW: efSearch). 해당 없는 인덱스는 무시"""
+    nprobe = params.get("nprobe")
+    ef_search = params.get("ef_search")
+    ivf = _ivf_of(index)
+    if ivf is not None and nprobe:
+        ivf.nprobe = int(nprobe)
+    hnsw_index = _unwrap(index)
+    if hasattr(hnsw_index, "hnsw") and ef_search:
+        hnsw_index.hnsw.efSearch = int(ef_search)
+
+
+def search_params_from_env(index_info):
+    """메타에 기록된 파라미터 위에 FAISS_NPROBE / FAISS_EF_SEARCH 환경 변수를 덮어씀"""
+    params = dict((index_info or {}).get("params", {}))
+    if os.environ.get("FAISS_NPROBE"):
+        params["nprobe"] = int(os.environ["FAISS_NPROBE"])
+    if os.environ.get("FAISS_EF_SEARCH"):
+        params["ef_search"] = int(os.environ["FAISS_EF_SEARCH"])
+    return params
+
+
+def detect_index_type(index):
+    """메타에 종류 정보가 없을 때 인덱스 객체로부터 추정"""
+    index = _unwrap(index)
+    if isinstance(index, faiss.IndexHNSWFlat):
+        return "hnsw_flat"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVFScalarQuantizer):
+        return "ivf_sq8"
+    if isinstance(index, faiss.IndexIVFFlat):
+        return "ivf_flat"
+    return "flat"
@@ -0,0 +1,104 @@
+# services/inference.py
+# 임베딩 모델 추론 전용 스레드 풀 + 대기열 상한 (백프레셔)
+# FastAPI 기본 스레드 풀과 분리하여, 느린 encode 가 /summary 같은 가벼운 엔드포인트를 막지 않도록 한다.
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.services.batching import batching_enabled, max_batch_from_env
+
+DEFAULT_INFERENCE_WORKERS = 2
+DEFAULT_INFERENCE_QUEUE_SIZE = 32
+
+
+class InferenceQueueFull(Exception):
+    """추론 대기열이 가득 차 요청을 받을 수 없음 (HTTP 429 로 변환)"""
+
+
+def default_workers():
+    """encode 마이크로 배칭이 켜져 있으면 배치 크기 이상 (워커는 배치 결과를 기다리므로 워커 수만큼만 한 배치에 모임)
+
+    배칭 중에는 encode 자체는 배치 스레드 1개에서만 실행되어, 워커를 늘려도 encode 가 동시에 돌지 않는다.
+    """
+    if batching_enabled():
+        return max(DEFAULT_INFERENCE_WORKERS, max_batch_from_env())
+    return DEFAULT_INFERENCE_WORKERS
+
+
+class InferenceExecutor:
+    def __init__(self, max_workers=DEFAULT_INFERENCE_WORKERS, max_queue=DEFAULT_INFERENCE_QUEUE_SIZE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        # 실행 중 + 대기 중인 작업 수 상한
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_workers=int(os.environ.get("INFERENCE_WORKERS", default_workers())),
+            max_queue=int(os.environ.get("INFERENCE_QUEUE_SIZE", DEFAULT_INFERENCE_QUEUE_SIZE)),
+        )
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        """작업을 추론 풀에 넣고 concurrent.futures.Future 반환. 대기열이 가득 차면 InferenceQueueFull"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise InferenceQueueFull(f"추론 대기열이 가득 찼습니다 (workers={self.max_workers}, queue={self.max_queue}).")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release(None)
+            raise
+        # 호출한 요청이 취소되더라도 실제 작업이 끝날 때 슬롯을 반환
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """이벤트 루프를 막지 않고 추론 풀에서 fn 을 실행한 결과를 기다림"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_size": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_inference_executor = None
+_inference_executor_lock = threading.Lock()
+
+
+def get_inference_executor():
+    global _inference_executor
+    if _inference_executor is None:
+        with _inference_executor_lock:
+            if _inference_executor is None:
+                _inference_executor = InferenceExecutor.from_env()
+                print(f"추론 실행기 생성: workers={_inference_executor.max_workers}, "
+                      f"queue={_inference_executor.max_queue}")
+    return _inference_executor
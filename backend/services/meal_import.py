@@ -0,0 +1,183 @@
+# services/meal_import.py
+# 식사 기록 일괄 가져오기 (POST /meals/import)
+#
+# 1) JSON / NDJSON / CSV 본문을 식사 목록으로 파싱 + 검증
+# 2) 전체 페이로드의 항목 문자열을 중복 제거해 한 번만 매칭 (벡터 검색은 큰 배치 단위)
+# 3) 식사별 영양소 합계를 NumPy 로 계산해 bulk_insert_mappings 용 행 목록 생성
+
+import csv
+import io
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from backend.services.calorie import NUTRIENT_KEYS, match_items
+from backend.services.vector_search import get_vector_db
+
+IMPORT_FORMATS = ("json", "ndjson", "csv")
+DEFAULT_IMPORT_MAX_MEALS = 50000
+DEFAULT_IMPORT_MATCH_BATCH = 512
+MAX_REPORTED_ERRORS = 20
+
+
+class MealImportError(ValueError):
+    """가져오기 본문을 해석할 수 없거나 검증에 실패함 (errors: [{"line": n, "error": ...}])"""
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def import_max_meals():
+    return int(os.environ.get("MEAL_IMPORT_MAX_MEALS", DEFAULT_IMPORT_MAX_MEALS))
+
+
+def detect_format(content_type, explicit=None):
+    if explicit:
+        return explicit
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    return "json"
+
+
+def _split_items(value):
+    """CSV items 칸: JSON 배열 문자열 또는 ';' 로 구분한 목록"""
+    value = (value or "").strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(";") if item.strip()]
+
+
+def _raw_meals(text, fmt):
+    """(행 번호, 원본 딕셔너리) 목록. 행 번호는 오류 보고용 (JSON 은 배열 위치, NDJSON/CSV 는 줄 번호)"""
+    if fmt == "json":
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise MealImportError(f"JSON 형식이 올바르지 않습니다: {e}")
+        if isinstance(data, dict):
+            data = data.get("meals")
+        if not isinstance(data, list):
+            raise MealImportError("JSON 본문은 식사 배열 또는 {\"meals\": [...]} 형식이어야 합니다.")
+        return list(enumerate(data, start=1))
+    if fmt == "ndjson":
+        rows = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append((line_no, json.loads(line)))
+            except json.JSONDecodeError as e:
+                rows.append((line_no, e))
+        return rows
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        missing = {"date", "type", "items"} - set(reader.fieldnames or [])
+        if missing:
+            raise MealImportError(f"CSV 헤더에 {sorted(missing)} 열이 없습니다. (date,type,items)")
+        rows = []
+        for row in reader:
+            try:
+                row = {**row, "items": _split_items(row.get("items"))}
+            except json.JSONDecodeError as e:
+                row = e
+            rows.append((reader.line_num, row))
+        return rows
+    raise MealImportError(f"지원하지 않는 형식입니다: {fmt} (지원: {', '.join(IMPORT_FORMATS)})")
+
+
+def _validate(raw):
+    if isinstance(raw, Exception):
+        raise ValueError(f"파싱 실패: {raw}")
+    if not isinstance(raw, dict):
+        raise ValueError("식사는 객체여야 합니다.")
+    meal_date = raw.get("date")
+    meal_date = meal_date if isinstance(meal_date, date) else date.fromisoformat(str(meal_date))
+    meal_type = raw.get("type")
+    if not isinstance(meal_type, str) or not meal_type.strip():
+        raise ValueError("type 이 비어 있습니다.")
+    items = raw.get("items")
+    if not isinstance(items, list) or not items or not all(isinstance(item, str) for item in items):
+        raise ValueError("items 는 비어 있지 않은 문자열 배열이어야 합니다.")
+    return {"date": meal_date, "type": meal_type.strip(), "items": items}
+
+
+def parse_meals(body, fmt):
+    """본문(bytes/str) → 검증된 식사 목록. 하나라도 잘못되면 MealImportError (아무것도 저장하지 않음)"""
+    text = body.decode("utf-8-sig") if isinstance(body, bytes) else body
+    meals, errors = [], []
+    for line_no, raw in _raw_meals(text, fmt):
+        try:
+            meals.append(_validate(raw))
+        except (TypeError, ValueError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+    if errors:
+        raise MealImportError(f"잘못된 식사 {len(errors)}개", errors[:MAX_REPORTED_ERRORS])
+    if not meals:
+        raise MealImportError("가져올 식사가 없습니다.")
+    if len(meals) > import_max_meals():
+        raise MealImportError(f"한 번에 최대 {import_max_meals()}개 식사까지 가져올 수 있습니다. ({len(meals)}개)")
+    return meals
+
+
+def build_meal_rows(meals, progress=None, match_batch=None):
+    """식사 목록 → (meals 테이블 행 딕셔너리 목록, 요약)
+
+    progress(stage, done, total) 는 매칭 진행 상황 보고용 (추론 스레드에서 호출됨).
+    """
+    match_batch = match_batch or int(os.environ.get("MEAL_IMPORT_MATCH_BATCH", DEFAULT_IMPORT_MATCH_BATCH))
+    report = progress or (lambda stage, done, total: None)
+
+    # 페이로드 전체에서 항목 문자열 중복 제거 (같은 "현미밥 1공기" 는 한 번만 파싱/매칭)
+    unique_items = list(dict.fromkeys(item for meal in meals for item in meal["items"]))
+    report("parsed", len(meals), len(meals))
+
+    def vector_search(names):
+        # 모델 단계에 남은 이름만 큰 배치로 나눠 encode (배치마다 진행 상황 보고)
+        vector_db = get_vector_db()
+        matches = []
+        for start in range(0, len(names), match_batch):
+            matches.extend(vector_db.find_best_matches(names[start:start + match_batch]))
+            report("vector_search", min(start + match_batch, len(names)), len(names))
+        return matches
+
+    scaled, infos = match_items(unique_items, vector_search=vector_search)
+    report("matched", len(unique_items), len(unique_items))
+
+    # 식사별 합계: 식사 번호로 항목 행을 모아 한 번에 더함
+    position = {item: i for i, item in enumerate(unique_items)}
+    item_rows = np.array([position[item] for meal in meals for item in meal["items"]], dtype=np.int64)
+    meal_ids = np.repeat(np.arange(len(meals)), [len(meal["items"]) for meal in meals])
+    totals = np.zeros((len(meals), len(NUTRIENT_KEYS)), dtype=np.float64)
+    np.add.at(totals, meal_ids, scaled[item_rows])
+
+    rows = []
+    for meal, meal_totals in zip(meals, totals):
+        matched_info = [infos[position[item]] for item in meal["items"] if infos[position[item]]]
+        rows.append({
+            "date": meal["date"],
+            "type": meal["type"],
+            "items": json.dumps(meal["items"], ensure_ascii=False),
+            **{key: float(value) for key, value in zip(NUTRIENT_KEYS, meal_totals)},
+            "matched_items": json.dumps(matched_info, ensure_ascii=False),
+        })
+
+    not_found = [item for item, info in zip(unique_items, infos) if info is None]
+    tiers = {}
+    for info in infos:
+        if info:
+            tiers[info["tier"]] = tiers.get(info["tier"], 0) + 1
+    summary = {
+        "meals": len(meals),
+        "items": int(len(item_rows)),
+        "unique_items": len(unique_items),
+        "tiers": tiers,
+        "not_found": not_found[:MAX_REPORTED_ERRORS],
+        "not_found_count": len(not_found),
+    }
+    return rows, summary
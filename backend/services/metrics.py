@@ -0,0 +1,252 @@
+# services/metrics.py
+# 가벼운 계측 레이어: 카운터 / 히스토그램 / 타이머 + Prometheus 텍스트 형식 출력 (GET /metrics)
+#
+# - 핫 패스 비용은 관측 1회당 잠금 + 사전 갱신 정도 (~1µs). METRICS_ENABLED=0 이면 모두 no-op
+# - 다른 모듈이 이미 세는 값(쿼리 캐시 적중, 추론 풀, 배칭)은 수집 시점에 stats() 를 읽는 collector 로 노출
+# - 단계별 지연 시간은 diet_stage_duration_seconds{stage=...} 하나의 히스토그램으로 모음
+#     parse / match_local / encode / faiss_search / db_query / serialize
+
+import bisect
+import logging
+import os
+import threading
+import time
+
+NAMESPACE = "diet"
+# 초 단위 (0.1ms ~ 10s). 로컬 매칭(수십 µs)부터 모델 encode(수십 ms)까지 구분되도록
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+_enabled = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(value):
+    """계측 켜기/끄기 (벤치마크 비교용)"""
+    global _enabled
+    _enabled = bool(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """collector() → [(이름, 종류, 설명, [(라벨 딕셔너리, 값), ...]), ...] (수집 시점에 호출)"""
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        """Prometheus 텍스트 노출 형식"""
+        with self._lock:
+            metrics, collectors = list(self._metrics), list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render_samples())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                # 구성 요소 하나의 stats() 오류로 /metrics 전체가 실패하지 않도록 건너뜀
+                logger.exception("지표 수집 실패: %s", getattr(collector, "__name__", collector))
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def inc(self, *labels, amount=1):
+        """라벨 값은 labelnames 순서대로 위치 인자로 전달"""
+        if not _enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render_samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # 라벨 값 → [버킷별 개수 (+Inf 포함), 합계]
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def observe(self, value, *labels):
+        if not _enabled:
+            return
+        position = bisect.bisect_left(self.buckets, value)  # value <= le 인 첫 버킷
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def time(self, *labels):
+        """with histogram.time("encode"): ... 블록 실행 시간을 초 단위로 기록"""
+        return _Timer(self, labels)
+
+    def snapshot(self, *labels):
+        """(버킷별 개수, 합계, 개수) — 벤치마크 / 디버깅용"""
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                return [0] * (len(self.buckets) + 1), 0.0, 0
+            return list(series[0]), series[1], sum(series[0])
+
+    def render_samples(self):
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = []
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+# === 공용 지표 === #
+STAGE_SECONDS = Histogram(
+    f"{NAMESPACE}_stage_duration_seconds", "처리 단계별 소요 시간 (parse, match_local, encode, faiss_search, db_query, serialize)",
+    ("stage",),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    f"{NAMESPACE}_http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 본문 전송 완료까지)",
+    ("method", "route", "status"),
+)
+FOOD_MATCH_TOTAL = Counter(
+    f"{NAMESPACE}_food_match_total", "식사 항목 음식명 매칭 단계별 건수 (not_found = 찾지 못한 항목)", ("tier",),
+)
+
+
+def stage_timer(stage):
+    return STAGE_SECONDS.time(stage)
+
+
+def instrument_engine(engine):
+    """SQLAlchemy engine 의 모든 SQL 실행 시간을 stage="db_query" 로 기록"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            STAGE_SECONDS.observe(time.perf_counter() - start, "db_query")
+
+    return engine
+
+
+class MetricsMiddleware:
+    """ASGI 미들웨어: 요청별 처리 시간을 라우트 경로 템플릿(/meals/{meal_id}) 기준으로 기록"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 경로 그대로 쓰면 ID 마다 시계열이 생기므로 매칭된 라우트 템플릿만 사용
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, scope["method"], route, str(status[0]))
@@ -0,0 +1,109 @@
+# services/name_index.py
+# 정규화된 식품명에 대한 문자 n-gram 역색인
+# "query in name" 부분 문자열 검색과 bigram 유사도(Dice) 검색을 전체 카탈로그 순회 없이 처리한다.
+
+import re
+import threading
+
+import numpy as np
+
+
+def normalize(text: str) -> str:
+    """식품명 정규화: 공백 제거 + 소문자 (food_matcher / recommender 공용)"""
+    return re.sub(r"\s+", "", text).lower()
+
+
+class SubstringIndex:
+    """정규화된 이름 목록에 대한 부분 문자열 검색 색인
+
+    - 1글자 쿼리: 문자(unigram) 포스팅 리스트의 첫 행
+    - 2글자 이상: 쿼리의 모든 bigram 포스팅을 (짧은 것부터) 교집합한 뒤,
+      후보를 행 번호 오름차순으로 실제 부분 문자열 여부를 확인
+    포스팅 리스트는 행 번호 오름차순이므로 선형 탐색과 같은 "첫 번째 일치 행" 을 돌려준다.
+    """
+
+    VERIFY_THRESHOLD = 64  # 교집합을 멈추고 후보를 직접 확인하는 크기
+
+    def __init__(self, names, normalize):
+        self.normalize = normalize
+        self.norm_names = [normalize(name) for name in names]
+        unigrams, bigrams = {}, {}
+        self.bigram_counts = np.zeros(len(self.norm_names), dtype=np.int32)  # 이름별 서로 다른 bigram 수
+        for row, name in enumerate(self.norm_names):
+            for ch in set(name):
+                unigrams.setdefault(ch, []).append(row)
+            grams = {name[i:i + 2] for i in range(len(name) - 1)}
+            self.bigram_counts[row] = len(grams)
+            for gram in grams:
+                bigrams.setdefault(gram, []).append(row)
+        self.unigrams = {k: np.array(v, dtype=np.int32) for k, v in unigrams.items()}
+        self.bigrams = {k: np.array(v, dtype=np.int32) for k, v in bigrams.items()}
+
+    def __len__(self):
+        return len(self.norm_names)
+
+    def find_first(self, query, normalized=False):
+        """query(정규화 후)를 부분 문자열로 포함하는 첫 번째 행 번호 (없으면 None)"""
+        q = query if normalized else self.normalize(query)
+        if not self.norm_names:
+            return None
+        if not q:
+            return 0  # 빈 문자열은 모든 이름에 포함됨
+        if len(q) == 1:
+            postings = self.unigrams.get(q)
+            return int(postings[0]) if postings is not None else None
+
+        grams = {q[i:i + 2] for i in range(len(q) - 1)}
+        postings = []
+        for gram in grams:
+            p = self.bigrams.get(gram)
+            if p is None:
+                return None
+            postings.append(p)
+        postings.sort(key=len)
+        candidates = postings[0]
+        # 후보가 충분히 줄어들면 나머지 교집합 대신 바로 문자열 확인
+        for p in postings[1:]:
+            if len(candidates) <= self.VERIFY_THRESHOLD:
+                break
+            candidates = np.intersect1d(candidates, p, assume_unique=True)
+            if len(candidates) == 0:
+                return None
+        if len(q) == 2:
+            return int(candidates[0])
+        for row in candidates.tolist():
+            if q in self.norm_names[row]:
+                return int(row)
+        return None
+
+    def most_similar(self, query, normalized=False):
+        """bigram 집합의 Dice 계수가 가장 큰 (행 번호, 점수). 동점이면 앞쪽 행, 공유 bigram 이 없으면 None
+
+        Dice = 2 * |공유 bigram| / (|쿼리 bigram| + |이름 bigram|), 완전히 같으면 1.0
+        """
+        q = query if normalized else self.normalize(query)
+        grams = {q[i:i + 2] for i in range(len(q) - 1)}
+        postings = [self.bigrams[gram] for gram in grams if gram in self.bigrams]
+        if not postings:
+            return None
+        rows, shared = np.unique(np.concatenate(postings), return_counts=True)
+        scores = 2.0 * shared / (len(grams) + self.bigram_counts[rows])
+        best = int(np.argmax(scores))  # rows 가 오름차순이므로 동점 중 첫 행
+        return int(rows[best]), float(scores[best])
+
+
+# 전역 인스턴스: 정규화 함수별로 현재 음식 저장소에 대해 한 번만 생성
+_index_lock = threading.Lock()
+_indexes = {}  # normalize -> (store, SubstringIndex)
+
+
+def get_substring_index(store, normalize):
+    """store.names 에 대한 SubstringIndex (저장소가 바뀌면 다시 생성)"""
+    cached = _indexes.get(normalize)
+    if cached is None or cached[0] is not store:
+        with _index_lock:
+            cached = _indexes.get(normalize)
+            if cached is None or cached[0] is not store:
+                cached = (store, SubstringIndex(store.names, normalize))
+                _indexes[normalize] = cached
+    return cached[1]
@@ -0,0 +1,135 @@
+# services/query_cache.py
+# 정규화된 음식명 쿼리 → (임베딩, top-k 검색 결과) LRU 캐시
+# 키는 calorie.parse_food_item 의 결과(수량/단위가 제거된 음식명)를 사용한다.
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # 32MB
+_ENTRY_OVERHEAD_BYTES = 200  # 딕셔너리 슬롯, 튜플, 배열 헤더 등 대략적인 고정 비용
+
+
+def normalize_query(text):
+    """캐시 키 정규화: 앞뒤 공백 제거 + 연속 공백을 하나로"""
+    return " ".join(str(text).split())
+
+
+class QueryCache:
+    """메모리 상한(bytes)을 가진 LRU 캐시
+
+    항목: key -> (embedding, ids, scores)
+      - embedding: L2 정규화된 쿼리 임베딩 (float32)
+      - ids / scores: 해당 쿼리의 top-k 검색 결과 (threshold 적용 전)
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, persist_path=None, namespace=""):
+        self.max_bytes = int(max_bytes)
+        self.persist_path = persist_path
+        # 모델/인덱스 식별자. 영속화된 캐시가 다른 인덱스에서 만들어졌다면 무시한다.
+        self.namespace = namespace
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if persist_path:
+            self.load(persist_path)
+
+    @classmethod
+    def from_env(cls, namespace=""):
+        max_bytes = int(os.environ.get("QUERY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        persist_path = os.environ.get("QUERY_CACHE_PATH") or None
+        return cls(max_bytes=max_bytes, persist_path=persist_path, namespace=namespace)
+
+    @staticmethod
+    def _entry_size(key, entry):
+        embedding, ids, scores = entry
+        return len(key.encode("utf-8")) + embedding.nbytes + ids.nbytes + scores.nbytes + _ENTRY_OVERHEAD_BYTES
+
+    def get(self, key):
+        key = normalize_query(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, embedding, ids, scores):
+        key = normalize_query(key)
+        entry = (
+            np.asarray(embedding, dtype="float32"),
+            np.asarray(ids, dtype="int64"),
+            np.asarray(scores, dtype="float32"),
+        )
+        size = self._entry_size(key, entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._sizes[key]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self.current_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    # --- 디스크 영속화 (선택) --- #
+    def save(self, path=None):
+        path = path or self.persist_path
+        if not path:
+            return
+        with self._lock:
+            snapshot = list(self._entries.items())  # LRU 순서 유지 (오래된 것 → 최근)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"namespace": self.namespace, "entries": snapshot}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        print(f"쿼리 캐시 저장 완료: {len(snapshot)}개 항목 → {path}")
+
+    def load(self, path=None):
+        path = path or self.persist_path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"경고: 쿼리 캐시 파일({path}) 로드 실패, 빈 캐시로 시작합니다. {e}")
+            return
+        if not isinstance(snapshot, dict) or snapshot.get("namespace") != self.namespace:
+            print(f"경고: 쿼리 캐시 파일({path})이 현재 모델/인덱스와 맞지 않아 무시합니다.")
+            return
+        for key, (embedding, ids, scores) in snapshot["entries"]:
+            self.put(key, embedding, ids, scores)
+        print(f"쿼리 캐시 로드 완료: {len(self._entries)}개 항목 ← {path}")
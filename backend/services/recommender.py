@@ -1,50 +1,28 @@
-import json
-import re
-from typing import List
-import os # os 모듈 임포트
+import logging
+import threading
+from typing import List, Optional
+import numpy as np
+from backend.services.food_store import get_food_store
+from backend.services.name_index import get_substring_index, normalize
+
+logger = logging.getLogger(__name__)
 
 # === 데이터 로드 ===
-# recommender.py 파일의 현재 위치를 기준으로 backend/data/food_db.json 경로 설정
-_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__)) # backend/services/
-_BACKEND_DIR = os.path.dirname(_SERVICE_DIR) # backend/
-FOOD_DB_JSON_PATH = os.path.join(_BACKEND_DIR, "data", "food_db.json")
-
-food_data = [] # 오류 발생 대비 초기화
-try:
-    with open(FOOD_DB_JSON_PATH, "r", encoding="utf-8") as f:
-        food_data_loaded = json.load(f)
-    if isinstance(food_data_loaded, dict) and "records" in food_data_loaded:
-        food_data = food_data_loaded["records"]
-    elif isinstance(food_data_loaded, list):
-        food_data = food_data_loaded # 파일 자체가 레코드 리스트인 경우
-    else:
-        print(f"경고: {FOOD_DB_JSON_PATH} (recommender.py) 파일의 형식이 예상과 다릅니다.")
-except FileNotFoundError:
-    print(f"치명적 오류: 데이터 파일 '{FOOD_DB_JSON_PATH}' (recommender.py)을(를) 찾을 수 없습니다.")
-except json.JSONDecodeError:
-    print(f"치명적 오류: 데이터 파일 '{FOOD_DB_JSON_PATH}' (recommender.py)이(가) 올바른 JSON 형식이 아닙니다.")
-
-# === 문자열 정규화 함수 ===
-def normalize(text: str) -> str:
-    return re.sub(r"\s+", "", text).lower()
+# 음식 데이터는 backend.services.food_store 의 공용 저장소(컬럼 기반 NumPy 배열)를 사용한다.
 
 # === 음식 이름 리스트 기반 칼로리 총합 추정 ===
 def estimate_kcal(item_list: List[str]) -> float:
+    store = get_food_store()
+    kcal_column = store.columns["kcal"]
+    # 정규화된 식품명 n-gram 색인으로 "첫 번째로 포함하는 음식" 을 찾는다 (전체 순회와 같은 결과)
+    name_index = get_substring_index(store, normalize)
     total_kcal = 0
     for item in item_list:
-        item_norm = normalize(item)
-        found = False
-
-        for food in food_data:
-            food_name = normalize(food.get("식품명", ""))
-            if item_norm in food_name:
-                kcal = float(food.get("에너지(kcal)", 0))
-                total_kcal += kcal
-                found = True
-                break
-
-        if not found:
-            print(f"[WARN] '{item}'에 대한 항목을 찾지 못했어요. 기본값 300kcal 사용.")
+        row = name_index.find_first(item)
+        if row is not None:
+            total_kcal += float(kcal_column[row])
+        else:
+            logger.warning("'%s'에 대한 항목을 찾지 못했어요. 기본값 300kcal 사용.", item)
             total_kcal += 300
 
     return total_kcal
@@ -58,44 +36,120 @@ def calculate_target_kcal(goal: dict) -> float:
     }
     return goal["target_weight"] * activity_factor.get(goal["activity_level"], 30)
 
+# === 간식 후보 인덱스 ===
+# 가공식품("P") 중 칼로리가 있는 음식만 kcal 오름차순으로 미리 정렬해 둔다.
+# 요청 시에는 남은 칼로리를 이진 탐색(searchsorted)한 뒤, 그 아래쪽으로 SNACK_POOL_SIZE 개부터 두 배씩 늘린 창을
+# 벡터 연산으로 점수화한다. 더 낮은 kcal 창의 점수 상한이 현재 top_k 의 최저 점수보다 낮아지면 멈추므로,
+# 남은 칼로리 이하 후보 전체를 점수화한 것과 같은 결과가 된다.
+SNACK_POOL_SIZE = 200  # 처음 점수화할 후보 창 크기
+SODIUM_LIMIT_MG = 400.0  # 간식 1회 나트륨 권장 상한
+PHOSPHORUS_LIMIT_MG = 250.0  # 간식 1회 인 권장 상한
+SCORE_WEIGHTS = {
+    "closeness": 1.0,  # 남은 칼로리를 얼마나 채우는지 (kcal / 남은 칼로리)
+    "protein": 0.5,  # 단백질 열량 비율 (단백질 4kcal/g ÷ 총 kcal)
+    "sodium": 0.5,  # 나트륨 상한 초과 비율 감점
+    "phosphorus": 0.3,  # 인 상한 초과 비율 감점
+}
+
+
+class SnackIndex:
+    def __init__(self, store):
+        kcal = store.columns["kcal"]
+        rows = np.flatnonzero(store.data_code_mask("P") & (kcal > 0))
+        rows = rows[np.argsort(kcal[rows], kind="stable")]
+        self.store = store
+        self.rows = rows
+        # 점수 계산에 쓰는 컬럼은 정렬 순서로 연속 배열에 복사해 둔다 (창 슬라이스가 연속 메모리 접근)
+        self.kcal = np.ascontiguousarray(kcal[rows])
+        self.protein = np.ascontiguousarray(store.columns["protein"][rows])
+        self.sodium = np.ascontiguousarray(store.columns["sodium"][rows])
+        self.phosphorus = np.ascontiguousarray(store.columns["phosphorus"][rows])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def score(self, lo, hi, remain_kcal):
+        kcal = self.kcal[lo:hi]
+        closeness = kcal / remain_kcal
+        protein_ratio = np.clip(self.protein[lo:hi] * 4.0 / kcal, 0.0, 1.0)
+        sodium_over = np.maximum(self.sodium[lo:hi] - SODIUM_LIMIT_MG, 0.0) / SODIUM_LIMIT_MG
+        phosphorus_over = np.maximum(self.phosphorus[lo:hi] - PHOSPHORUS_LIMIT_MG, 0.0) / PHOSPHORUS_LIMIT_MG
+        return (
+            SCORE_WEIGHTS["closeness"] * closeness
+            + SCORE_WEIGHTS["protein"] * protein_ratio
+            - SCORE_WEIGHTS["sodium"] * sodium_over
+            - SCORE_WEIGHTS["phosphorus"] * phosphorus_over
+        )
+
+    def top_snacks(self, remain_kcal, top_k=5, pool_size=SNACK_POOL_SIZE):
+        """남은 칼로리 이하 후보 중 점수 상위 top_k 의 (store 행 번호, 점수) 목록"""
+        if remain_kcal <= 0 or top_k <= 0:
+            return []
+        # 단백질 항(최대 가중치 1배)을 빼면 점수는 closeness 이하 → kcal 가 낮은 창의 점수 상한을 계산할 수 있다
+        max_bonus = SCORE_WEIGHTS["protein"]
+        positions = np.empty(0, dtype=np.int64)
+        scores = np.empty(0, dtype=np.float64)
+        hi = int(np.searchsorted(self.kcal, remain_kcal, side="right"))
+        window = max(pool_size, top_k)
+        while hi > 0:
+            lo = max(0, hi - window)
+            window *= 2
+            positions = np.concatenate([positions, np.arange(lo, hi)])
+            scores = np.concatenate([scores, self.score(lo, hi, remain_kcal)])
+            # 점수 내림차순, 같은 점수는 kcal 가 낮은(정렬 위치가 앞선) 후보 우선으로 상위 top_k 만 유지
+            keep = np.lexsort((positions, -scores))[:top_k]
+            positions, scores = positions[keep], scores[keep]
+            hi = lo
+            if len(scores) == top_k and hi > 0 and scores[-1] > self.kcal[hi - 1] / remain_kcal + max_bonus:
+                break
+        return [(int(self.rows[position]), float(score)) for position, score in zip(positions, scores)]
+
+
+_snack_index = None
+_snack_index_lock = threading.Lock()
+
+
+def get_snack_index():
+    global _snack_index
+    store = get_food_store()
+    if _snack_index is None or _snack_index.store is not store:
+        # 동시 첫 요청이 각자 전체 정렬 인덱스를 만들지 않도록 한 스레드만 생성
+        with _snack_index_lock:
+            if _snack_index is None or _snack_index.store is not store:
+                _snack_index = SnackIndex(store)
+    return _snack_index
+
 # === 추천 간식 목록 ===
-def recommend_snacks(user_goal: dict, meal_log: List[dict], top_k: int = 5) -> dict:
-    print(f"[DEBUG] recommend_snacks 호출됨")
-    print(f"[DEBUG] user_goal: {user_goal}")
-    print(f"[DEBUG] meal_log: {meal_log}")
+def recommend_snacks(user_goal: dict, meal_log: Optional[List[dict]] = None, top_k: int = 5,
+                     consumed_kcal: Optional[float] = None) -> dict:
+    """consumed_kcal 이 주어지면 그 값을 사용하고, 없으면 meal_log 의 음식명으로 칼로리를 추정"""
+    # 계산 과정 덤프는 LOG_LEVEL=DEBUG 일 때만 (인자는 로그를 실제로 출력할 때만 문자열로 변환됨)
+    logger.debug("recommend_snacks 호출됨: user_goal=%s, meal_log=%s", user_goal, meal_log)
 
     target_kcal = calculate_target_kcal(user_goal)
-    print(f"[DEBUG] 계산된 target_kcal: {target_kcal}")
-
-    consumed_kcal = sum([estimate_kcal(m.items) for m in meal_log]) # meal_log의 각 Meal 객체가 items 속성을 가지고 있다고 가정
-    print(f"[DEBUG] 계산된 consumed_kcal: {consumed_kcal}")
+    logger.debug("계산된 target_kcal: %s", target_kcal)
 
+    if consumed_kcal is None:
+        consumed_kcal = sum([estimate_kcal(m.items) for m in meal_log or []]) # meal_log의 각 Meal 객체가 items 속성을 가지고 있다고 가정
     remain_kcal = target_kcal - consumed_kcal
-    print(f"[DEBUG] 계산된 remain_kcal: {remain_kcal}")
+    logger.debug("계산된 consumed_kcal: %s, remain_kcal: %s", consumed_kcal, remain_kcal)
 
+    snack_index = get_snack_index()
+    store = snack_index.store
+    # 남은 칼로리 이하 후보를 kcal 가 높은 창부터 점수화하여 상위 top_k 선정 (보통 O(log n + pool))
     snack_candidates = [
         {
-            "식품명": food["식품명"],
-            "에너지(kcal)": float(food.get("에너지(kcal)", 0)),
-            "단백질(g)": float(food.get("단백질(g)", 0)),
-            "지방(g)": float(food.get("지방(g)", 0)),
-            "탄수화물(g)": float(food.get("탄수화물(g)", 0))
+            "식품명": store.names[row],
+            "에너지(kcal)": float(store.columns["kcal"][row]),
+            "단백질(g)": float(store.columns["protein"][row]),
+            "지방(g)": float(store.columns["fat"][row]),
+            "탄수화물(g)": float(store.columns["carbs"][row])
         }
-        for food in food_data
-        if food.get("데이터구분코드") == "P" and
-           food.get("에너지(kcal)", "").strip() and # 에너지(kcal) 값이 있는지 확인
-           float(food.get("에너지(kcal)", 0)) > 0 and # 칼로리가 0보다 큰 음식만
-           float(food.get("에너지(kcal)", 0)) <= remain_kcal
+        for row, _score in snack_index.top_snacks(remain_kcal, top_k)
     ]
-    print(f"[DEBUG] 필터링된 snack_candidates 수: {len(snack_candidates)}")
-    
-    # 만약 후보가 너무 많으면, 남은 칼로리에 가장 근접한 간식 위주로 정렬 (선택적)
-    # snack_candidates.sort(key=lambda x: abs(x[\"에너지(kcal)\"] - remain_kcal))
-
-    # 조건에 맞는 모든 간식을 일단 반환하고, 프론트에서 top_k를 처리하거나 여기서 잘라도 됨
-    # 여기서는 요청된 top_k 만큼만 반환
-    recommended_snacks_list = snack_candidates[:top_k]
-    print(f"[DEBUG] 최종 추천 간식 목록 (상위 {top_k}개): {recommended_snacks_list}")
+    recommended_snacks_list = snack_candidates
+    logger.debug("간식 후보 인덱스 크기: %d, 최종 추천 간식 목록 (상위 %d개): %s",
+                 len(snack_index), top_k, recommended_snacks_list)
 
     return {
         "남은 칼로리": remain_kcal,
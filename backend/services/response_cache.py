@@ -0,0 +1,152 @@
+# services/response_cache.py
+# 데이터 버전 기반 응답 캐시 + ETag (GET /summary, /recommend/snacks)
+#
+# - data_version 테이블의 사용자별 버전은 그 사용자의 목표 / 식사를 쓰거나 지우는 트랜잭션 안에서
+#   bump_version 으로 1 증가 (DB 에 있으므로 여러 워커 프로세스가 같은 버전을 보고, 다른 사용자의 캐시는 유지)
+# - ETag = epoch + 버전 + 요청 키(사용자 포함) 해시. 본문 없이 계산되므로 If-None-Match 가 맞으면 행 1개 조회 후 바로 304
+# - 본문은 프로세스별 LRU 에 (ETag, JSON bytes) 로 보관해 같은 버전의 반복 조회는 조회 / 직렬화 없이 응답
+
+import os
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+
+from sqlalchemy import insert, update
+
+from backend.models.models import DataVersion
+
+DEFAULT_MAX_ENTRIES = 256
+# 방언별 UPSERT 문 (daily_rollup 과 같은 방식으로 한 번만 만들어 재사용)
+_upsert_statements = {}
+
+
+def _new_epoch():
+    return uuid.uuid4().hex[:12]
+
+
+def _upsert_statement(dialect_name):
+    if dialect_name not in _upsert_statements:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            _upsert_statements[dialect_name] = None
+            return None
+        table = DataVersion.__table__
+        stmt = dialect_insert(table)
+        _upsert_statements[dialect_name] = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id], set_={"version": table.c.version + 1},
+        )
+    return _upsert_statements[dialect_name]
+
+
+def bump_version(db, user_id):
+    """사용자의 데이터 버전 1 증가, 처음이면 새 epoch 로 행 생성 (commit 은 호출한 쪽에서, 쓰기와 같은 트랜잭션으로)"""
+    stmt = _upsert_statement(db.get_bind().dialect.name)
+    if stmt is not None:
+        db.execute(stmt, {"user_id": user_id, "epoch": _new_epoch(), "version": 1})
+        return
+    result = db.execute(
+        update(DataVersion).where(DataVersion.user_id == user_id).values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(DataVersion).values(user_id=user_id, epoch=_new_epoch(), version=1))
+
+
+def bump_all_versions(db):
+    """모든 사용자의 버전 1 증가 (집계 전체 재계산 등 여러 사용자의 데이터를 한 번에 바꾼 경우)"""
+    db.execute(update(DataVersion).values(version=DataVersion.version + 1))
+
+
+def current_version(db, user_id):
+    """(epoch, version). 응답 본문을 읽기 전에 호출해야 새 데이터가 이전 버전 ETag 로 저장되지 않음"""
+    row = db.get(DataVersion, user_id, populate_existing=True)
+    if row is None:
+        return "", 0
+    return row.epoch, row.version
+
+
+def make_etag(epoch, version, key):
+    return f'"{epoch}.{version}.{zlib.crc32(key.encode("utf-8")):08x}"'
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더(쉼표 목록, W/ 약한 비교, *)에 etag 가 포함되는지"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """요청 키 → (ETag, 응답 본문 bytes) LRU. ETag 가 다르면(버전 변경) 미스로 처리하고 새 본문으로 교체"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = int(max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, etag, body):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache.from_env()
+    return _response_cache
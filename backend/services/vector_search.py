@@ -1,29 +1,62 @@
 import json
+import logging
 import os
+import time
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
+from backend.services import metrics
+from backend.services.catalog_format import FaissMetaTable, split_faiss_meta
+from backend.services.index_factory import configure_search, detect_index_type, search_params_from_env
+from backend.services.batching import MicroBatcher, batching_enabled
+from backend.services.encoders import load_encoder
+from backend.services.inference import get_inference_executor
+from backend.services.food_store import FOOD_DATA_DIR
+from backend.services.query_cache import QueryCache, normalize_query
 # import shutil # 더 이상 필요 없음
 
 SENTENCE_TRANSFORMER_MODEL = 'jhgan/ko-sroberta-multitask'
 
+logger = logging.getLogger(__name__)
+
 # --- 경로 설정 --- #
 _SERVICE_DIR = os.path.dirname(os.path.abspath(__file__)) # backend/services/
 _BACKEND_DIR_FROM_SERVICE = os.path.dirname(_SERVICE_DIR) # backend/
 
-PREBUILT_FAISS_INDEX_PATH = os.path.join(_BACKEND_DIR_FROM_SERVICE, "data", "food_faiss.index")
-PREBUILT_FAISS_META_PATH = os.path.join(_BACKEND_DIR_FROM_SERVICE, "data", "food_faiss.meta")
+PREBUILT_FAISS_INDEX_PATH = os.path.join(FOOD_DATA_DIR, "food_faiss.index")
+PREBUILT_FAISS_META_PATH = os.path.join(FOOD_DATA_DIR, "food_faiss.meta")
+# backend.scripts.build_catalog 로 food_faiss.meta 를 컴파일한 바이너리 메타 (있으면 우선 사용)
+PREBUILT_FAISS_META_CATALOG_DIR = os.path.join(FOOD_DATA_DIR, "food_faiss_meta")
 # BUNDLED_FOOD_DB_JSON_PATH = os.path.join(_BACKEND_DIR_FROM_SERVICE, "data", "food_db.json") # 필요시 주석 해제
 
+class FaissSearchError(RuntimeError):
+    """index.search 실패 (encode 오류와 구분하여 검색 실패만 빈 결과로 처리)"""
+
 class FaissFoodDB:
-    def __init__(self, model_name=SENTENCE_TRANSFORMER_MODEL):
-        print(f"FaissFoodDB 초기화 시작 (모델: {model_name}) - 미리 빌드된 인덱스 로드 시도")
-        self.model = SentenceTransformer(model_name)
-        self.dimension = self.model.get_sentence_embedding_dimension()
+    def __init__(self, model_name=SENTENCE_TRANSFORMER_MODEL, encoder_backend=None):
+        # encoder 백엔드는 ENCODER_BACKEND (torch / onnx / onnx-int8) 로 선택, 모델은 실제 로드 시점에 import
+        self.load_timings = {}
+        start = time.perf_counter()
+        self.model = load_encoder(model_name, backend=encoder_backend)
+        print(f"FaissFoodDB 초기화 시작 (모델: {model_name}, 백엔드: {self.model.backend}) - 미리 빌드된 인덱스 로드 시도")
+        self.dimension = self.model.dimension
+        self.load_timings["model"] = time.perf_counter() - start
         self.index = None
+        self.index_info = None
         self.food_items_meta = []
         print(f"모델 로드 완료. 임베딩 차원: {self.dimension}")
+        start = time.perf_counter()
         self._load_prebuilt_index()
+        self.load_timings["index"] = time.perf_counter() - start
+        # 빌드 ID(메타 내용 해시)가 바뀌면 저장된 캐시 스냅샷을 버림. 빌드 ID 가 없는 이전 메타는 벡터 수로 구분
+        build_id = self.index_info.get("build_id") or f"n{self.index.ntotal}"
+        self.query_cache = QueryCache.from_env(namespace=f"{model_name}:{self.model.backend}:{self.index_info['type']}:{self.index.d}:{build_id}")
+        # 동시 요청 encode 마이크로 배칭 (ENCODE_BATCHING=0 이면 요청마다 바로 encode)
+        self.batcher = None
+        if batching_enabled():
+            self.batcher = MicroBatcher.from_env(
+                self._process_encode_batch, workers=get_inference_executor().max_workers,
+                size_of=lambda request: len(request[0]), name="encode-batcher",
+            )
 
     def _load_prebuilt_index(self):
         print(f"미리 빌드된 FAISS 인덱스 로드 중...")
@@ -41,10 +74,25 @@ class FaissFoodDB:
             raise FileNotFoundError(error_msg + " Git LFS로 파일이 올바르게 트래킹되고 있는지 확인하세요.")
 
         try:
-            self.index = faiss.read_index(PREBUILT_FAISS_INDEX_PATH)
-            with open(PREBUILT_FAISS_META_PATH, "r", encoding="utf-8") as f_meta:
-                self.food_items_meta = json.load(f_meta)
-            
+            self.index = self._read_index(PREBUILT_FAISS_INDEX_PATH)
+            meta_table = FaissMetaTable.load(PREBUILT_FAISS_META_CATALOG_DIR, source_path=PREBUILT_FAISS_META_PATH)
+            if meta_table is not None:
+                print("  바이너리 메타 카탈로그(mmap) 사용")
+                self.food_items_meta = meta_table
+                index_info = meta_table.index_info
+            else:
+                with open(PREBUILT_FAISS_META_PATH, "r", encoding="utf-8") as f_meta:
+                    self.food_items_meta, index_info = split_faiss_meta(json.load(f_meta))
+
+            actual_type = detect_index_type(self.index)
+            if index_info.get("type") != actual_type:
+                print(f"경고: 메타의 인덱스 종류({index_info.get('type')})와 실제 인덱스({actual_type})가 다릅니다.")
+            # nprobe / efSearch: 메타에 기록된 값 → FAISS_NPROBE / FAISS_EF_SEARCH 환경 변수 순으로 적용
+            search_params = search_params_from_env(index_info)
+            configure_search(self.index, search_params)
+            self.index_info = {"type": actual_type, "params": search_params, "build_id": index_info.get("build_id")}
+            print(f"  인덱스 종류: {actual_type}, 파라미터: {search_params}")
+
             if self.index.d != self.dimension:
                 error_msg = (
                     f"로드된 인덱스 차원({self.index.d})과 모델 차원({self.dimension}) 불일치. "
@@ -53,7 +101,10 @@ class FaissFoodDB:
                 print(f"치명적 오류: {error_msg}")
                 raise ValueError(error_msg)
             
-            if self.index.ntotal != len(self.food_items_meta):
+            # ID 매핑 인덱스는 증분 갱신으로 삭제된 메타 항목이 남아 있어 벡터 수가 더 적을 수 있다
+            if self.index.ntotal > len(self.food_items_meta) or (
+                self.index.ntotal != len(self.food_items_meta) and not index_info.get("id_map")
+            ):
                 print(f"경고: 로드된 인덱스 벡터 수({self.index.ntotal})와 "
                       f"메타데이터 항목 수({len(self.food_items_meta)}) 불일치.")
 
@@ -64,46 +115,123 @@ class FaissFoodDB:
             print(f"치명적 오류: {error_msg}")
             raise RuntimeError(error_msg) from e
 
+    @staticmethod
+    def _read_index(path):
+        # 가능하면 메모리 맵으로 읽어 여러 워커가 페이지 캐시를 공유하도록 한다
+        try:
+            return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception as e:
+            print(f"  인덱스 mmap 로드 불가({e}), 일반 로드로 전환")
+            return faiss.read_index(path)
+
     def _safe_float(self, val):
         try: return float(val.strip()) if isinstance(val, str) else float(val)
         except: return 0.0
 
-    def search_similar_foods(self, query_text, top_k=5, threshold=0.3):
-        if self.index is None or self.index.ntotal == 0:
-            print("FAISS 인덱스가 초기화되지 않았거나 비어있습니다.")
+    def _format_result(self, idx, score):
+        meta = self.food_items_meta[idx]
+        return {
+            "name": meta["name"],
+            "score": score,
+            "nutrition": {
+                "kcal": meta["kcal"],
+                "protein": meta["protein"],
+                "fat": meta["fat"],
+                "carbs": meta["carbs"],
+            }
+        }
+
+    def _search_uncached(self, query_texts, top_k, embeddings=None):
+        """캐시를 거치지 않고 (필요 시) encode 후 한 번의 index.search 실행"""
+        if embeddings is None:
+            with metrics.stage_timer("encode"):
+                embeddings = np.asarray(self.model.encode(list(query_texts)), dtype='float32')
+                embeddings = np.ascontiguousarray(embeddings.reshape(len(query_texts), -1))
+                faiss.normalize_L2(embeddings)
+        with metrics.stage_timer("faiss_search"):
+            try:
+                D, I = self.index.search(embeddings, top_k)
+            except Exception as e:
+                raise FaissSearchError(str(e)) from e
+        return embeddings, D, I
+
+    def _encode_and_search(self, query_texts, top_k):
+        """캐시 미스 쿼리의 encode + search. 마이크로 배칭이 켜져 있으면 동시 요청과 합쳐서 처리"""
+        if self.batcher is None:
+            return self._search_uncached(query_texts, top_k)
+        return self.batcher.submit((list(query_texts), top_k))
+
+    def _process_encode_batch(self, requests):
+        """배치 스레드: 여러 요청의 쿼리를 모아 encode 1회 + index.search 1회 후 요청별로 분배"""
+        texts = list(dict.fromkeys(text for query_texts, _ in requests for text in query_texts))
+        max_k = max(top_k for _, top_k in requests)
+        embeddings, D, I = self._search_uncached(texts, max_k)
+        position = {text: i for i, text in enumerate(texts)}
+        results = []
+        for query_texts, top_k in requests:
+            rows = [position[text] for text in query_texts]
+            results.append((embeddings[rows], D[rows, :top_k], I[rows, :top_k]))
+        return results
+
+    def search_similar_foods_batch(self, query_texts, top_k=5, threshold=0.3):
+        """여러 쿼리를 한 번의 encode + 한 번의 index.search로 검색 (쿼리 캐시 우선 조회)"""
+        if not query_texts:
             return []
-        
-        query_embedding = self.model.encode(query_text)
-        query_embedding_np = np.array([query_embedding], dtype='float32')
-        faiss.normalize_L2(query_embedding_np)
-        
+        if self.index is None or self.index.ntotal == 0:
+            logger.warning("FAISS 인덱스가 초기화되지 않았거나 비어있습니다.")
+            return [[] for _ in query_texts]
+
+        keys = [normalize_query(q) for q in query_texts]
+        unique_keys = list(dict.fromkeys(keys))
+
+        # 1) 캐시 조회: 결과가 충분하면 그대로 사용, 임베딩만 있으면 검색만 다시 수행
+        raw_results = {}
+        need_encode, need_search, cached_embeddings = [], [], []
+        for key in unique_keys:
+            entry = self.query_cache.get(key)
+            if entry is None:
+                need_encode.append(key)
+            elif len(entry[1]) >= top_k or len(entry[1]) >= self.index.ntotal:
+                raw_results[key] = (entry[1][:top_k], entry[2][:top_k])
+            else:
+                need_search.append(key)
+                cached_embeddings.append(entry[0])
+
+        # 2) 캐시 미스 항목은 한 번의 encode / search 로 처리
+        #    검색 실패만 빈 결과로 처리하고, encode / 배처 오류는 호출한 쪽(5xx)으로 전달 → 잘못된 영양소 저장 방지
         try:
-            D, I = self.index.search(query_embedding_np, top_k)
-        except Exception as e:
-            print(f"Faiss 검색 중 오류 발생: {e}")
-            return []
-        
-        similar_foods = []
-        if I.size > 0 and len(I[0]) > 0:
-            for i in range(len(I[0])):
-                idx = I[0][i]
-                score = float(D[0][i])
+            batches = []
+            if need_encode:
+                batches.append((need_encode, self._encode_and_search(need_encode, top_k)))
+            if need_search:
+                stacked = np.ascontiguousarray(np.stack(cached_embeddings))
+                batches.append((need_search, self._search_uncached(need_search, top_k, embeddings=stacked)))
+        except FaissSearchError as e:
+            logger.exception("Faiss 검색 중 오류 발생: %s", e)
+            return [[] for _ in query_texts]
+
+        for batch_keys, (embeddings, D, I) in batches:
+            for key, embedding, row_ids, row_scores in zip(batch_keys, embeddings, I, D):
+                self.query_cache.put(key, embedding, row_ids, row_scores)
+                raw_results[key] = (row_ids, row_scores)
+
+        # 3) threshold 적용 및 메타데이터 결합
+        results = []
+        for key in keys:
+            row_ids, row_scores = raw_results[key]
+            similar_foods = []
+            for idx, score in zip(row_ids, row_scores):
+                score = float(score)
                 if idx < 0 or idx >= len(self.food_items_meta):
                     continue
                 if threshold is not None and score < threshold:
                     continue
-                meta = self.food_items_meta[idx]
-                similar_foods.append({
-                    "name": meta["name"],
-                    "score": score, 
-                    "nutrition": {
-                        "kcal": meta["kcal"],
-                        "protein": meta["protein"],
-                        "fat": meta["fat"],
-                        "carbs": meta["carbs"],
-                    }
-                })
-        return similar_foods
+                similar_foods.append(self._format_result(idx, score))
+            results.append(similar_foods)
+        return results
+
+    def search_similar_foods(self, query_text, top_k=5, threshold=0.3):
+        return self.search_similar_foods_batch([query_text], top_k=top_k, threshold=threshold)[0]
 
     def find_best_match(self, query_text):
         results = self.search_similar_foods(query_text, top_k=1, threshold=None) 
@@ -111,6 +239,13 @@ class FaissFoodDB:
             return results[0]
         return None
 
+    def find_best_matches(self, query_texts):
+        """쿼리 목록 각각의 최상위 매칭 결과 (없으면 None) 를 입력 순서대로 반환"""
+        return [
+            results[0] if results else None
+            for results in self.search_similar_foods_batch(query_texts, top_k=1, threshold=None)
+        ]
+
 # 전역 인스턴스 (싱글톤 패턴)
 faiss_db_instance = None
 
@@ -132,4 +267,8 @@ def get_vector_db():
             import traceback
             traceback.print_exc()
             raise 
-    return faiss_db_instance
\ No newline at end of file
+    return faiss_db_instance
+
+def faiss_db_instance_loaded():
+    """모델/인덱스를 새로 로드하지 않고 현재 로드 여부만 확인"""
+    return faiss_db_instance is not None
@@ -0,0 +1,96 @@
+# services/warmup.py
+# 서버 시작 후 백그라운드에서 무거운 구성 요소(음식 카탈로그, 임베딩 모델 + FAISS 인덱스)를 로드하고
+# 구성 요소별 준비 상태/소요 시간을 제공한다 (/readyz).
+
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ComponentState:
+    def __init__(self, name):
+        self.name = name
+        self.status = PENDING
+        self.seconds = None
+        self.details = {}
+        self.error = None
+
+    def as_dict(self):
+        state = {"status": self.status, "seconds": self.seconds}
+        if self.details:
+            state["details"] = self.details
+        if self.error:
+            state["error"] = self.error
+        return state
+
+
+class Warmup:
+    """등록된 로더를 순서대로 한 백그라운드 스레드에서 실행
+
+    로더는 (선택) 세부 소요 시간 딕셔너리를 반환할 수 있다. 예: {"model": 3.2, "index": 0.4}
+    """
+
+    def __init__(self):
+        self._loaders = OrderedDict()
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.started_at = None
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+        self._states[name] = ComponentState(name)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        for name, loader in self._loaders.items():
+            state = self._states[name]
+            state.status = LOADING
+            print(f"⏳ [warmup] {name} 로드 시작")
+            start = time.perf_counter()
+            try:
+                details = loader()
+            except Exception as e:
+                state.seconds = round(time.perf_counter() - start, 3)
+                state.error = str(e)
+                state.status = FAILED
+                print(f"❌ [warmup] {name} 로드 실패 ({state.seconds}s): {e}")
+                traceback.print_exc()
+                continue
+            state.seconds = round(time.perf_counter() - start, 3)
+            if isinstance(details, dict):
+                state.details = {k: round(v, 3) if isinstance(v, float) else v for k, v in details.items()}
+            state.status = READY
+            print(f"✅ [warmup] {name} 로드 완료 ({state.seconds}s)")
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def state(self, name):
+        return self._states[name]
+
+    def is_ready(self, name=None):
+        if name is not None:
+            return self._states[name].status == READY
+        return all(state.status == READY for state in self._states.values())
+
+    def report(self):
+        return {
+            "ready": self.is_ready(),
+            "started_at": self.started_at,
+            "components": {name: state.as_dict() for name, state in self._states.items()},
+        }